@@ -0,0 +1,60 @@
+from playwright.async_api import Page
+from core.logger import Logger
+from core.async_base import AsyncBasePage
+from core.base import PatientContext, PatientManager
+from typing import Optional
+import asyncio
+import os
+
+
+class AsyncRevSession(AsyncBasePage):
+    """asyncio-native Revolution EHR session.
+
+    Mirrors :class:`RevSession` on top of ``playwright.async_api``. The page
+    maps in ``config/rev_map`` are still sync; async page objects should
+    subclass ``AsyncBasePage`` and take this session's page or a tab from
+    :meth:`new_tab`.
+    """
+
+    def __init__(
+        self,
+        page: Page,
+        logger: Logger,
+        context: Optional[PatientContext] = None,
+        patient_manager: Optional[PatientManager] = None,
+    ):
+        """Initialize the async Revolution EHR session.
+
+        Args:
+            page: Playwright async page instance
+            logger: Logger instance for logging operations
+            context: Optional PatientContext for patient-specific operations
+            patient_manager: Optional PatientManager shared with other
+                sessions. A new one is created if not provided.
+        """
+        super().__init__(page, logger, context)
+        self.patient_manager = patient_manager or PatientManager()
+
+    async def login(self) -> None:
+        """Log in to Revolution EHR using credentials from environment variables.
+
+        Raises:
+            Exception: If login fails at any step
+        """
+        username = os.getenv('rev_username')
+        password = os.getenv('rev_password')
+
+        if not username or not password:
+            raise Exception("Missing Revolution EHR credentials in environment variables")
+
+        await self.page.goto("https://revolutionehr.com/static/")
+
+        await self.page.locator('[data-test-id="loginUsername"]').fill(username)
+        await self.page.locator('[data-test-id="loginPassword"]').fill(password)
+        await self.page.locator('[data-test-id="loginBtn"]').click()
+
+        # Wait for navigation to complete
+        await self.page.wait_for_load_state("networkidle")
+        await asyncio.sleep(2)  # Additional small delay to ensure page is fully loaded
+
+        self.logger.log("✅ Logged into RevolutionEHR (async)")
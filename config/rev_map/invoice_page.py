@@ -1,13 +1,14 @@
 #/invoice_page.py
 
 from playwright.sync_api import Page
-from typing import Optional, List, Dict, Any
+from typing import Optional, List, Dict, Any, Tuple
 from core.logger import Logger
 from core.base import BasePage, PatientContext, PatientManager, Patient
 import re
 from bs4 import BeautifulSoup
 from core.base import ClaimItem
 from core.utils import has_glasses_order, has_frame_claim
+from core.tracing import traced
 from time import sleep
 
 class InvoicePage(BasePage):
@@ -21,6 +22,7 @@ class InvoicePage(BasePage):
         super().__init__(page, logger, context)
         self.base_url = "https://revolutionehr.com/static/#/accounting/invoices/dashboard"
         self.patient_manager = patient_manager
+        self._on_new_results()
     
     def navigate_to_invoices_page(self):
         """Navigate to the invoices dashboard page"""
@@ -30,6 +32,7 @@ class InvoicePage(BasePage):
             self.page.goto(self.base_url)
             # Wait for the page to load completely
             self.page.wait_for_selector('[data-test-id="invoiceDashboardReceiveCollectionsPaymentButton"]', timeout=10000)
+            self._on_new_results()
             self.logger.log("Successfully navigated to invoices dashboard")
         except Exception as e:
             self.logger.log_error(f"Failed to navigate to invoices dashboard: {str(e)}")
@@ -230,6 +233,7 @@ class InvoicePage(BasePage):
                 self.set_approval_status(approval_status)
 
             self.click_search()
+            self._on_new_results()
             self.logger.log("Invoice search completed successfully")
         except Exception as e:
             self.logger.log_error(f"Failed to complete invoice search: {str(e)}")
@@ -613,6 +617,7 @@ class InvoicePage(BasePage):
             self.take_screenshot("Failed to click patient name link")
             raise
 
+    @traced()
     def create_patient_from_invoice(
         self,
         default_dob: str = "01/01/1900",
@@ -690,6 +695,7 @@ class InvoicePage(BasePage):
             self.take_screenshot("Failed to click invoice tab")
             raise
 
+    @traced()
     def scrape_invoice_details(self, patient, default_diagnosis='H52.223'):
         """Scrape invoice details from the current invoice page.
         
@@ -840,13 +846,59 @@ class InvoicePage(BasePage):
     # Result table utilities
     # ------------------------------------------------------------------
 
+    # Result record key -> AG Grid col-id
+    RESULT_COLUMNS = {
+        "approval": "invoice.approval",
+        "status": "status",
+        "age": "invoice.invoiceAge",
+        "invoice_id": "id",
+        "payer": "invoice.payerName",
+        "patient_name": "patientName",
+        "invoice_date": "invoice.invoiceDate",
+        "service_date": "invoice.serviceDate",
+        "statement_date": "invoice.statementDate",
+        "total": "invoice.total",
+        "balance": "invoice.balance",
+    }
+
+    _EXTRACT_ROWS_JS = """
+    ([rowSelector, columns]) => Array.from(document.querySelectorAll(rowSelector)).map(row => {
+        const record = {};
+        let found = false;
+        for (const [key, colId] of Object.entries(columns)) {
+            const cell = row.querySelector(`[col-id="${colId}"]`);
+            if (cell) found = true;
+            record[key] = cell ? (cell.innerText || cell.textContent || '').trim() : '';
+        }
+        return found ? record : null;
+    })
+    """
+
+    _ROW_SELECTOR = '.ag-center-cols-container .ag-row'
+
     def _get_rows_on_current_page(self):
         """Return all row locators for the current results page."""
         self.page.wait_for_selector('.ag-center-cols-container', timeout=10000)
-        return self.page.locator('.ag-center-cols-container .ag-row')
+        return self.page.locator(self._ROW_SELECTOR)
+
+    def _extract_rows_on_current_page(self) -> List[Optional[Dict[str, Any]]]:
+        """Read every row of the current results page in one ``page.evaluate``.
+
+        Returns:
+            List with one record per row locator, in the same order as
+            :meth:`_get_rows_on_current_page`, so ``rows.nth(i)`` is the row
+            for ``records[i]``. Rows with none of the known cells (e.g.
+            loading placeholders) are ``None``.
+        """
+        self.page.wait_for_selector('.ag-center-cols-container', timeout=10000)
+        return self.page.evaluate(self._EXTRACT_ROWS_JS, [self._ROW_SELECTOR, self.RESULT_COLUMNS])
 
     def _parse_row_data(self, row) -> Dict[str, Any]:
-        """Extract invoice data from a single AG Grid row."""
+        """Extract invoice data from a single AG Grid row.
+
+        Slow path: one round trip per cell. Only used when the bulk
+        extraction in :meth:`_extract_rows_on_current_page` fails.
+        """
         try:
             return {
                 "approval": row.locator('[col-id="invoice.approval"]').inner_text().strip(),
@@ -866,6 +918,41 @@ class InvoicePage(BasePage):
             self.take_screenshot("Failed to parse row data")
             return {}
 
+    def _read_current_page(self, bulk: bool = True) -> List[Optional[Dict[str, Any]]]:
+        """Read the current results page as records in row-locator order.
+
+        Uses the bulk extractor and falls back to reading row by row. Entries
+        are ``None`` (or empty) for rows that could not be read.
+        """
+        if bulk:
+            try:
+                return self._extract_rows_on_current_page()
+            except Exception as e:
+                self.logger.log_error(f"Bulk row extraction failed, reading rows individually: {str(e)}")
+        rows = self._get_rows_on_current_page()
+        return [self._parse_row_data(rows.nth(i)) for i in range(rows.count())]
+
+    def _reset_result_index(self) -> None:
+        """Forget the index of the previous search's results."""
+        self.invoice_index: Dict[str, Tuple[int, int]] = {}
+        self.patient_index: Dict[str, List[str]] = {}
+
+    def _on_new_results(self) -> None:
+        """Forget the old index after a load or search, which shows page 1."""
+        self._reset_result_index()
+        self._current_page = 1
+
+    def _index_page(self, page_num: int, records: List[Optional[Dict[str, Any]]]) -> None:
+        """Record where each invoice on ``page_num`` lives in the results."""
+        for i, record in enumerate(records):
+            if not record or not record.get("invoice_id"):
+                continue
+            invoice_id = record["invoice_id"]
+            self.invoice_index[invoice_id] = (page_num, i)
+            ids = self.patient_index.setdefault(record.get("patient_name", "").lower(), [])
+            if invoice_id not in ids:
+                ids.append(invoice_id)
+
     def _go_to_next_page(self) -> bool:
         """Click the next page button if available.
 
@@ -881,33 +968,104 @@ class InvoicePage(BasePage):
                 return False
             next_button.click()
             self.page.wait_for_selector('.ag-center-cols-container', timeout=10000)
+            self._current_page += 1
             return True
         except Exception:
             return False
 
-    def scrape_current_page_results(self) -> List[Dict[str, Any]]:
-        """Scrape all results from the currently visible table page."""
-        rows = self._get_rows_on_current_page()
-        results = []
-        for i in range(rows.count()):
-            row = rows.nth(i)
-            data = self._parse_row_data(row)
-            if data:
-                results.append(data)
-        return results
+    def _go_to_first_page(self) -> None:
+        """Click the pager's first page button, unless already on the first page."""
+        first = self.page.get_by_role('navigation').get_by_title('Go to first page', exact=True)
+        btn_class = first.get_attribute('class')
+        if not btn_class or 'e-disable' not in btn_class:
+            first.click()
+            self.page.wait_for_selector('.ag-center-cols-container', timeout=10000)
+        self._current_page = 1
 
+    def _go_to_page(self, page_num: int) -> bool:
+        """Jump to ``page_num`` of the results.
+
+        Clicks the pager's page number link when it is shown, otherwise goes
+        back to the first page if needed and clicks "next" the rest of the way.
+
+        Returns:
+            bool: True if the results table is now on ``page_num``
+        """
+        if page_num == self._current_page:
+            return True
+        try:
+            link = self.page.locator('.e-pager .e-numericitem', has_text=re.compile(rf'^\s*{page_num}\s*$'))
+            if link.count() > 0 and link.first.is_visible():
+                link.first.click()
+                self.page.wait_for_selector('.ag-center-cols-container', timeout=10000)
+                self.settle(1, network_idle=True, dom_stable=True)
+                self._current_page = page_num
+                return True
+
+            if page_num < self._current_page:
+                self._go_to_first_page()
+            while self._current_page < page_num:
+                if not self._go_to_next_page():
+                    return False
+            self.settle(1, network_idle=True, dom_stable=True)
+            return True
+        except Exception as e:
+            self.logger.log_error(f"Failed to go to results page {page_num}: {str(e)}")
+            return False
+
+    def _click_result_row(self, row_index: int) -> None:
+        """Open the invoice in row ``row_index`` of the current page."""
+        self._get_rows_on_current_page().nth(row_index).locator('[col-id="id"]').click()
+        # Wait for the invoice details tab to be visible, indicating the invoice is loaded
+        self.page.wait_for_selector('[data-test-id="invoiceDetailsDetailTab"]', timeout=10000)
+
+    def scrape_current_page_results(self, bulk: bool = True) -> List[Dict[str, Any]]:
+        """Scrape all results from the currently visible table page.
+
+        Args:
+            bulk: Read the whole page in a single ``page.evaluate``. Falls
+                back to reading row by row if that fails.
+        """
+        return [r for r in self._read_current_page(bulk) if r]
+
+    @traced()
     def scrape_all_search_results(self) -> List[Dict[str, Any]]:
-        """Scrape results across all pages of the search table."""
+        """Scrape results across all pages of the search table.
+
+        Also builds ``invoice_index`` (invoice ID -> (page, row)) and
+        ``patient_index`` (lower-cased patient name -> invoice IDs), which
+        :meth:`open_invoice` uses to jump straight to an invoice.
+        """
+        self._go_to_page(1)
         page_num = 1
         all_results: List[Dict[str, Any]] = []
         while True:
             self.logger.log(f"Scraping results page {page_num}")
-            all_results.extend(self.scrape_current_page_results())
+            records = self._read_current_page()
+            self._index_page(page_num, records)
+            all_results.extend(r for r in records if r)
             if not self._go_to_next_page():
                 break
             page_num += 1
         return all_results
 
+    def _lookup_indexed(
+        self,
+        invoice_number: Optional[str],
+        patient_name: Optional[str],
+    ) -> Optional[Tuple[str, int, int]]:
+        """Return ``(invoice_id, page, row)`` from the result index, if known."""
+        invoice_id = None
+        if invoice_number and str(invoice_number) in self.invoice_index:
+            invoice_id = str(invoice_number)
+        elif patient_name and self.patient_index.get(patient_name.lower()):
+            invoice_id = self.patient_index[patient_name.lower()][0]
+        if invoice_id is None:
+            return None
+        page_num, row_index = self.invoice_index[invoice_id]
+        return invoice_id, page_num, row_index
+
+    @traced()
     def open_invoice(
         self,
         invoice_number: Optional[str] = None,
@@ -916,6 +1074,16 @@ class InvoicePage(BasePage):
         """Open an invoice from the results table by invoice number or patient name.
 
         At least one of ``invoice_number`` or ``patient_name`` must be provided.
+        If the invoice was seen by :meth:`scrape_all_search_results` for the
+        current search this jumps straight to its page and row. Otherwise, or
+        if the index turns out to be stale, it scans the results from the
+        first page.
+
+        The index only helps callers that open several invoices from one
+        result set. ``search_invoice`` clears it, so the batch runners, which
+        search for each invoice number (see
+        ``core.workflow.open_invoice_by_id``), always take the scan path over
+        their one-row grid.
 
         Args:
             invoice_number: The invoice ID to match.
@@ -928,27 +1096,45 @@ class InvoicePage(BasePage):
         if not invoice_number and not patient_name:
             raise ValueError("invoice_number or patient_name must be specified")
 
+        indexed = self._lookup_indexed(invoice_number, patient_name)
+        if indexed:
+            invoice_id, page_num, row_index = indexed
+            if self._go_to_page(page_num):
+                records = self._read_current_page()
+                if row_index < len(records) and (records[row_index] or {}).get("invoice_id") == invoice_id:
+                    self.logger.log(f"Opening invoice {invoice_id} from results page {page_num}, row {row_index}")
+                    self._click_result_row(row_index)
+                    return True
+            self.logger.log(f"Result index is stale for invoice {invoice_id}, scanning results")
+            self._reset_result_index()
+            # The failed jump may have left the grid on any page, or partway
+            # there, so don't trust _current_page for the scan.
+            try:
+                self._go_to_first_page()
+            except Exception as e:
+                self.logger.log_error(f"Failed to go back to the first results page: {str(e)}")
+                return False
+        elif not self._go_to_page(1):
+            return False
         page_num = 1
         while True:
-            rows = self._get_rows_on_current_page()
-            for i in range(rows.count()):
-                row = rows.nth(i)
+            records = self._read_current_page()
+            self._index_page(page_num, records)
+
+            for i, record in enumerate(records):
+                if not record:
+                    continue
                 match = False
 
-                if invoice_number:
-                    inv_id = row.locator('[col-id="id"]').inner_text().strip()
-                    if inv_id == str(invoice_number):
-                        match = True
+                if invoice_number and record.get("invoice_id") == str(invoice_number):
+                    match = True
 
                 if patient_name and not match:
-                    name = row.locator('[col-id="patientName"]').inner_text().strip()
-                    if name.lower() == patient_name.lower():
+                    if record.get("patient_name", "").lower() == patient_name.lower():
                         match = True
 
                 if match:
-                    row.locator('[col-id="id"]').click()
-                    # Wait for the invoice details tab to be visible, indicating the invoice is loaded
-                    self.page.wait_for_selector('[data-test-id="invoiceDetailsDetailTab"]', timeout=10000)
+                    self._click_result_row(i)
                     return True
 
             if not self._go_to_next_page():
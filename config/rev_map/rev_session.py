@@ -8,6 +8,7 @@ from .optical_order import OpticalOrder
 from .products import Products
 from .insurance_tab import InsuranceTab
 from .claims_page import ClaimsPage
+from core.session_cache import get_session_cache
 import os
 import time
 
@@ -38,26 +39,54 @@ class RevSession:
             self.insurance_tab = InsuranceTab(page, logger, context)
             self.claims_page = ClaimsPage(page, logger, context)
     
-    def __init__(self, page: Page, logger: Logger, context: Optional[PatientContext] = None):
+    def __init__(
+        self,
+        page: Page,
+        logger: Logger,
+        context: Optional[PatientContext] = None,
+        patient_manager: Optional[PatientManager] = None,
+    ):
         """Initialize the Revolution EHR session.
         
         Args:
             page: Playwright page instance
             logger: Logger instance for logging operations
             context: Optional PatientContext for patient-specific operations
+            patient_manager: Optional PatientManager shared with other
+                sessions. A new one is created if not provided.
         """
         self.page = page
         self.logger = logger
         self.context = context
-        self.patient_manager = PatientManager()
+        self.patient_manager = patient_manager or PatientManager()
         self.pages = self._Pages(page, logger, self.patient_manager, context)
     
-    def login(self) -> None:
+    def login(self, use_cache: bool = True) -> None:
         """Log in to Revolution EHR using credentials from environment variables.
         
+        A saved session from ``SessionCache`` is reused when it is still
+        valid, skipping the login form.
+        
+        Args:
+            use_cache: Try the saved session first and save the new one after
+                logging in
+        
         Raises:
             Exception: If login fails at any step
         """
+        cache = get_session_cache()
+        if use_cache and cache.restore(self.page.context, "rev", logger=self.logger):
+            if cache.validate(
+                self.page,
+                self.invoice_page.base_url,
+                '[data-test-id="invoiceDashboardReceiveCollectionsPaymentButton"]',
+                '[data-test-id="loginUsername"]',
+            ):
+                self.logger.log("✅ Reused saved RevolutionEHR session")
+                return
+            self.logger.log("Saved RevolutionEHR session expired, logging in")
+            cache.invalidate("rev")
+
         # Get credentials from environment variables
         username = os.getenv('rev_username')
         password = os.getenv('rev_password')
@@ -80,6 +109,8 @@ class RevSession:
         time.sleep(2)  # Additional small delay to ensure page is fully loaded
         
         self.logger.log("✅ Logged into RevolutionEHR")
+        if use_cache:
+            cache.save(self.page.context, "rev", logger=self.logger)
     
     def __getattr__(self, name):
         """Delegate attribute access to self.pages.
@@ -0,0 +1,73 @@
+import os
+from playwright.async_api import Page
+from core.logger import Logger
+from core.base import PatientContext
+from core.async_base import AsyncBasePage
+from typing import Optional
+from dotenv import load_dotenv
+
+
+class AsyncVspSession(AsyncBasePage):
+    """asyncio-native VSP session.
+
+    Mirrors :class:`VspSession` on top of ``playwright.async_api`` so VSP
+    work can share an event loop with ``AsyncRevSession``.
+    """
+
+    def __init__(self, page: Page, logger: Logger, context: Optional[PatientContext] = None):
+        """Initialize the async VSP session.
+
+        Args:
+            page: Playwright async page instance
+            logger: Logger instance for logging operations
+            context: Optional PatientContext for patient-specific operations
+        """
+        super().__init__(page, logger, context)
+        self.base_url = "https://eyefinity.com"
+
+    async def login(self, location: str = "ama") -> bool:
+        """Login to VSP portal.
+
+        Args:
+            location: Location to login to ('ama' for Amarillo or 'bgr' for Borger)
+
+        Returns:
+            bool: True if login was successful
+        """
+        try:
+            self.logger.log("Starting VSP login process (async)...")
+            load_dotenv("/home/jake/Code/.env")
+            ama_username = os.getenv("vsp_username")
+            bgr_username = os.getenv("vsp_borger_username")
+            vsp_password = os.getenv("vsp_password")
+
+            if not all([ama_username, bgr_username, vsp_password]):
+                raise ValueError("Missing VSP credentials")
+
+            self.logger.log("Navigating to eyefinity...")
+            await self.page.goto("https://www.eyefinity.com")
+            await self.page.evaluate("document.querySelector('#eyefinity-lgn').click();")
+            await self.page.wait_for_timeout(3000)
+
+            # Stop page loading
+            await self.page.evaluate("window.stop();")
+            await self.page.wait_for_timeout(2000)
+
+            username = ama_username if location.lower() == "ama" else bgr_username
+            self.logger.log(f"Logging in as {username}...")
+            await self.page.locator("#username").fill(username)
+            await self.page.locator("#password").fill(vsp_password)
+            await self.page.locator("#btnLogin").click()
+
+            await self.page.wait_for_timeout(2000)
+
+            self.logger.log("Navigating to member search...")
+            await self.page.goto("https://eclaim.eyefinity.com/secure/eInsurance/member-search")
+
+            self.logger.log("Login successful")
+            return True
+
+        except Exception as e:
+            self.logger.log(f"Login failed: {str(e)}")
+            await self.take_screenshot("VSP login error")
+            return False
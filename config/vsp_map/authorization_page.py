@@ -127,7 +127,7 @@ class AuthorizationPage(BasePage):
                 name_cell = row.locator('#auth-search-result-name-data')
                 auth_number_cell = row.locator('[id^="auth-search-result-auth-number-data"]')
                 current_name = name_cell.inner_text().strip().upper()
-                self.logger.log(f"Checking row {i+1}: {current_name}")
+                self.logger.debug("Checking row %s: %s", i + 1, current_name)
 
                 if current_name == target_name:
                     self.logger.log(f"Found matching authorization for {target_name}")
@@ -159,7 +159,7 @@ class AuthorizationPage(BasePage):
                 row = rows.nth(i)
                 name_cell = row.locator('#auth-search-result-name-data')
                 current_name = name_cell.inner_text().strip().upper()
-                self.logger.log(f"Checking row {i+1}: {current_name}")
+                self.logger.debug("Checking row %s: %s", i + 1, current_name)
                 
                 if current_name == target_name:
                     self.logger.log(f"Found matching authorization to delete: {target_name}")
@@ -240,7 +240,7 @@ class AuthorizationPage(BasePage):
 
                 current_name = name_cell.inner_text().strip().upper()
                 current_dob = dob_cell.inner_text().strip()
-                self.logger.log(f"Checking row {i+1}: Name={current_name}, DOB={current_dob}")
+                self.logger.debug("Checking row %s: Name=%s, DOB=%s", i + 1, current_name, current_dob)
 
                 if current_name == target_name and current_dob == target_dob:
                     self.logger.log(f"Found matching patient: {target_name}")
@@ -257,7 +257,7 @@ class AuthorizationPage(BasePage):
                 dob_cell = row.locator('[id^="patient-selection-result-city-dob-data"]')
 
                 current_dob = dob_cell.inner_text().strip()
-                self.logger.log(f"Checking row {i+1} for DOB only: DOB={current_dob}")
+                self.logger.debug("Checking row %s for DOB only: DOB=%s", i + 1, current_dob)
 
                 if current_dob == target_dob:
                     self.logger.log(f"Found patient by DOB: {current_dob}")
@@ -349,21 +349,21 @@ class AuthorizationPage(BasePage):
     def _parse_service_status(self, text: str) -> str:
         """Return standardized service status based on availability cell text."""
         value = text.strip()
-        self.logger.log(f"[_parse_service_status] Parsing text: '{value}'")
+        self.logger.debug("[_parse_service_status] Parsing text: '%s'", value)
         if not value:
-            self.logger.log("[_parse_service_status] Empty text, returning 'unavailable'")
+            self.logger.debug("[_parse_service_status] Empty text, returning 'unavailable'")
             return "unavailable"
         lower = value.lower()
         if lower in {"yes", "available"}:
-            self.logger.log("[_parse_service_status] Found 'available' status")
+            self.logger.debug("[_parse_service_status] Found 'available' status")
             return "available"
         if lower in {"no", "unavailable"}:
-            self.logger.log("[_parse_service_status] Found 'unavailable' status")
+            self.logger.debug("[_parse_service_status] Found 'unavailable' status")
             return "unavailable"
         if lower in {"authorized", "auth"}:
-            self.logger.log("[_parse_service_status] Found 'authorized' status")
+            self.logger.debug("[_parse_service_status] Found 'authorized' status")
             return "authorized"
-        self.logger.log(f"[_parse_service_status] Unknown status '{value}', returning as is")
+        self.logger.debug("[_parse_service_status] Unknown status '%s', returning as is", value)
         return value
 
     def get_service_statuses(self, package_index: int = 0, max_services: Optional[int] = None) -> Dict[int, str]:
@@ -374,16 +374,16 @@ class AuthorizationPage(BasePage):
             headers = self.page.locator(f'[id="{package_index}-service-header"] label')
             max_services = headers.count()
         for idx in range(max_services):
-            self.logger.log(f"[get_service_statuses] Checking service index {idx}")
+            self.logger.debug("[get_service_statuses] Checking service index %s", idx)
             locator = self._service_availability(package_index, idx)
             if locator.count() == 0:
                 self.logger.log(f"[get_service_statuses] No element found for service {idx}")
                 continue
             try:
                 text = locator.inner_text().strip()
-                self.logger.log(f"[get_service_statuses] Raw text for service {idx}: '{text}'")
+                self.logger.debug("[get_service_statuses] Raw text for service %s: '%s'", idx, text)
                 status = self._parse_service_status(text)
-                self.logger.log(f"[get_service_statuses] Parsed status for service {idx}: {status}")
+                self.logger.debug("[get_service_statuses] Parsed status for service %s: %s", idx, status)
                 statuses[idx] = status
             except Exception as e:
                 self.logger.log_error(f"[get_service_statuses] Error getting status for service {idx}: {str(e)}")
@@ -397,24 +397,24 @@ class AuthorizationPage(BasePage):
         services = set()
         self.logger.log(f"[_services_from_claims] Processing {len(claims)} claims")
         for claim in claims:
-            self.logger.log(f"[_services_from_claims] Checking claim: {claim.vcode} - {claim.description}")
+            self.logger.debug("[_services_from_claims] Checking claim: %s - %s", claim.vcode, claim.description)
             if claim.vcode in self._exam_codes:
-                self.logger.log(f"[_services_from_claims] Found exam code {claim.vcode}, adding service 'exam'")
+                self.logger.debug("[_services_from_claims] Found exam code %s, adding service 'exam'", claim.vcode)
                 services.add("exam")
             elif any(claim.vcode.startswith(code) for code in self._lens_codes):
-                self.logger.log(f"[_services_from_claims] Found lens code {claim.vcode}, adding service 'lens'")
+                self.logger.debug("[_services_from_claims] Found lens code %s, adding service 'lens'", claim.vcode)
                 services.add("lens")
             elif claim.vcode in self._frame_codes:
-                self.logger.log(f"[_services_from_claims] Found frame code {claim.vcode}, adding service 'frame'")
+                self.logger.debug("[_services_from_claims] Found frame code %s, adding service 'frame'", claim.vcode)
                 services.add("frame")
             elif any(claim.vcode.startswith(code) for code in self._contacts_codes):
-                self.logger.log(f"[_services_from_claims] Found contact lens code {claim.vcode}, adding service 'contacts'")
+                self.logger.debug("[_services_from_claims] Found contact lens code %s, adding service 'contacts'", claim.vcode)
                 services.add("contacts")
             elif any(claim.vcode.startswith(code) for code in self._contact_services):
-                self.logger.log(f"[_services_from_claims] Found contact service code {claim.vcode}, adding service 'contact_service'")
+                self.logger.debug("[_services_from_claims] Found contact service code %s, adding service 'contact_service'", claim.vcode)
                 services.add("contact_service")
             else:
-                self.logger.log(f"[_services_from_claims] Code {claim.vcode} not mapped to any service")
+                self.logger.debug("[_services_from_claims] Code %s not mapped to any service", claim.vcode)
         self.logger.log(f"[_services_from_claims] Final services: {services}")
         return services
 
@@ -3,8 +3,9 @@ import re
 from playwright.sync_api import Page
 from core.logger import Logger
 from core.base import PatientContext, BasePage, Patient
-from time import sleep
 from config.debug.vsp_error_tracker import save_vsp_error_message
+from core.session_cache import get_session_cache
+from core.tracing import traced, note_retry
 import time
 
 
@@ -14,6 +15,8 @@ class ClaimPage(BasePage):
     def __init__(self, page: Page, logger: Logger, context: Optional[PatientContext] = None):
         super().__init__(page, logger, context)
         self.base_url = "https://eclaim.eyefinity.com/secure/eInsurance/claim-form"
+        # Location the VSP session logged in as; set by VspSession.login
+        self.vsp_location = "ama"
 
     # ------------------------------------------------------------------
     # Utilities
@@ -53,9 +56,10 @@ class ClaimPage(BasePage):
 
 
     # ------------------------------------------------------------------
+    @traced()
     def set_dos(self, patient: Patient) -> bool:
         """Set the date of service on the claim form."""
-        sleep(1)
+        self.settle(1, network_idle=True)
         try:
             dos = patient.insurance_data.get('dos')
             if not dos:
@@ -67,7 +71,7 @@ class ClaimPage(BasePage):
             try:
                 if cob_link.wait_for(state='visible', timeout=500):
                     cob_link.click()
-                    self.page.wait_for_timeout(500)  # Optional: short wait for UI update
+                    self.settle(.5, selector='#date-of-service')
             except Exception:
                 pass  # COB link not present or not visible, continue as normal
 
@@ -108,6 +112,7 @@ class ClaimPage(BasePage):
                 return code
         return None
 
+    @traced()
     def submit_exam(self, patient: Patient) -> None:
         """Select the exam type for the claim based on patient data."""
         try:
@@ -142,6 +147,7 @@ class ClaimPage(BasePage):
             self.take_screenshot("exam_type_select_error")
             raise
 
+    @traced()
     def set_doctor(self, patient: Patient) -> None:
         """Set the rendering provider with validation and retry logic."""
         max_attempts = 3
@@ -161,8 +167,8 @@ class ClaimPage(BasePage):
             try:
                 self.logger.log(f"Set doctor attempt {attempt}/{max_attempts}")
                 
-                # Wait a moment for the dropdown to be ready
-                self.page.wait_for_timeout(1000)
+                # Wait for the dropdown to be ready
+                self.settle(1, selector=f'#exam-rendering-provider-group option[value="{provider_id}"]', state='attached')
                 
                 # Use select_option to select the provider
                 provider_dropdown = self.page.locator('#exam-rendering-provider-group')
@@ -170,7 +176,10 @@ class ClaimPage(BasePage):
                 self.logger.log(f"Selected provider {provider_id} for doctor {doctor_name}")
                 
                 # Validate the selection was successful
-                self.page.wait_for_timeout(500)  # Wait for selection to register
+                self.settle(.5, predicate=(
+                    "([sel, value]) => document.querySelector(sel)?.value === value",
+                    ['#exam-rendering-provider-group', provider_id],
+                ))
                 
                 # Check if the dropdown now shows the selected value
                 selected_value = provider_dropdown.evaluate("el => el.value")
@@ -181,6 +190,7 @@ class ClaimPage(BasePage):
                     self.logger.log_error(f"Validation failed - expected {provider_id}, got {selected_value}")
                     if attempt < max_attempts:
                         self.logger.log(f"Retrying doctor selection...")
+                        note_retry()
                         continue
                     else:
                         raise Exception(f"Failed to validate doctor selection after {max_attempts} attempts")
@@ -189,7 +199,8 @@ class ClaimPage(BasePage):
                 self.logger.log_error(f"Set doctor attempt {attempt} failed: {str(e)}")
                 if attempt < max_attempts:
                     self.logger.log(f"Retrying doctor selection...")
-                    self.page.wait_for_timeout(1000)  # Wait before retry
+                    note_retry()
+                    self.settle(1)  # Let the form settle before retrying
                 else:
                     self.logger.log_error(f"All {max_attempts} attempts to set doctor failed")
                     self.take_screenshot("claim_set_doctor_error")
@@ -198,6 +209,7 @@ class ClaimPage(BasePage):
         # This should never be reached due to the raise above, but just in case
         raise Exception(f"Failed to set doctor after {max_attempts} attempts")
 
+    @traced()
     def submit_cl(self, patient: Patient) -> None:
         """Fill contact lens information if present."""
         contact_codes = {'V2500', 'V2501', 'V2502', 'V2503', 'V2520', 'V2521', 'V2522', 'V2523'}
@@ -216,9 +228,10 @@ class ClaimPage(BasePage):
             self.logger.log_error(f"Failed to submit CL info: {str(e)}")
             self.take_screenshot("claim_cl_error")
 
+    @traced()
     def disease_reporting(self, patient: Patient) -> None:
         """Enter diagnosis codes for services."""
-        sleep(1)
+        self.settle(1, selector='#services-diagnosis-code-A-textbox')
         diagnosis = patient.medical_data.get('dx')
         if not diagnosis:
             diagnosis = 'H52.223'
@@ -235,12 +248,13 @@ class ClaimPage(BasePage):
             self.logger.log_error(f"Failed disease reporting: {str(e)}")
             self.take_screenshot("claim_disease_report_error")
 
+    @traced()
     def calculate(self, patient: Patient) -> None:
         """Click the Calculate button and handle alerts."""
         try:
             # First click of calculate button
             self.page.locator('#claim-tracker-calculate').click()
-            sleep(2)
+            self.settle(2, network_idle=True, dom_stable=True)
             
             # Check for acknowledge button and handle it
             try:
@@ -248,12 +262,12 @@ class ClaimPage(BasePage):
                 if acknowledge_button.is_visible(timeout=3000):
                     self.logger.log("Acknowledge button found, clicking it...")
                     acknowledge_button.click()
-                    sleep(1)
+                    self.settle(1, selector='button.acknowledge-button', state='hidden')
                     
                     # Click calculate button again after acknowledging
                     self.logger.log("Clicking calculate button again after acknowledge...")
                     self.page.locator('#claim-tracker-calculate').click()
-                    sleep(2)
+                    self.settle(2, network_idle=True, dom_stable=True)
                 else:
                     self.logger.log("No acknowledge button found, proceeding...")
             except Exception as e:
@@ -265,6 +279,7 @@ class ClaimPage(BasePage):
             self.logger.log_error(f"Calculation failed: {str(e)}")
             self.take_screenshot("claim_calculate_error")
 
+    @traced()
     def fill_pricing(self, patient: Patient) -> None:
         """Fill billed amounts and patient payment information."""
         try:
@@ -274,17 +289,17 @@ class ClaimPage(BasePage):
             # Scroll to pricing section
             self.logger.log("Scrolling to pricing section...")
             self.page.evaluate("window.scrollTo(0, 4000)")
-            self.page.wait_for_timeout(2000)
+            self.settle(2, selector="//input[@formcontrolname='cptHcpcsCode']", state='attached', dom_stable=True)
 
             inputs = self.page.locator("//input[@formcontrolname='cptHcpcsCode']")
             input_count = inputs.count()
             self.logger.log(f"Found {input_count} CPT/HCPCS code inputs on page")
 
             def calculate_units(desc: str, qty: int) -> int:
-                self.logger.log(f"Calculating units for description: {desc}, quantity: {qty}")
+                self.logger.debug("Calculating units for description: %s, quantity: %s", desc, qty)
                 pack_sizes = re.findall(r"\b(6|90|30|60|12|24)\b", desc or "")
                 result = int(pack_sizes[0]) * int(qty) if pack_sizes else 0
-                self.logger.log(f"Calculated units: {result}")
+                self.logger.debug("Calculated units: %s", result)
                 return result
 
             for item in patient.claims:
@@ -309,19 +324,19 @@ class ClaimPage(BasePage):
                         # Method 1: Try input.value
                         current_value = inp.input_value()
                     except Exception as e1:
-                        self.logger.log(f"Method 1 failed: {str(e1)}")
+                        self.logger.debug("Method 1 failed: %s", e1)
                         try:
                             # Method 2: Try evaluating the element's value property
                             current_value = inp.evaluate("el => el.value")
                         except Exception as e2:
-                            self.logger.log(f"Method 2 failed: {str(e2)}")
+                            self.logger.debug("Method 2 failed: %s", e2)
                             try:
                                 # Method 3: Try getting the text content
                                 current_value = inp.text_content()
                             except Exception as e3:
-                                self.logger.log(f"Method 3 failed: {str(e3)}")
+                                self.logger.debug("Method 3 failed: %s", e3)
                     
-                    self.logger.log(f"Checking input {i+1}: value={current_value}")
+                    self.logger.debug("Checking input %s: value=%s", i + 1, current_value)
                     
                     if current_value == code:
                         line_num = inp.get_attribute("id").split("-")[2]
@@ -352,7 +367,7 @@ class ClaimPage(BasePage):
 
             self.logger.log("Scrolling to FSA section...")
             self.page.evaluate("window.scrollTo(0, 4400)")
-            self.page.wait_for_timeout(1000)
+            self.settle(1, selector='#services-fsa-paid-input')
             
             try:
                 if copay:
@@ -366,7 +381,7 @@ class ClaimPage(BasePage):
 
             self.logger.log("Scrolling to patient paid section...")
             self.page.evaluate("window.scrollTo(0, 4400)")
-            self.page.wait_for_timeout(3000)
+            self.settle(3, selector='#services-patient-paid-amount-input', dom_stable=True)
             
             try:
                 paid = self.page.locator("#services-patient-paid-amount-input")
@@ -386,6 +401,7 @@ class ClaimPage(BasePage):
             self.take_screenshot("claim_price_error")
             raise
 
+    @traced()
     def set_gender(self, patient: Patient) -> None:
         """Set patient gender switch."""
         try:
@@ -395,6 +411,7 @@ class ClaimPage(BasePage):
             self.take_screenshot("claim_gender_error")
             
 
+    @traced()
     def fill_address(self, patient: Patient) -> None:
         """Fill patient address if not already present."""
         try:
@@ -433,6 +450,7 @@ class ClaimPage(BasePage):
             self.logger.log_error(f"Failed to send add/seg: {str(e)}")
             self.take_screenshot("claim_add_seg_error")
 
+    @traced()
     def send_rx(self, patient: Patient) -> None:
         if not patient.has_optical_order:
             return
@@ -460,6 +478,7 @@ class ClaimPage(BasePage):
             self.logger.log_error(f"Failed to send Rx: {str(e)}")
             self.take_screenshot("claim_send_rx_error")
 
+    @traced()
     def submit_frame(self, patient: Patient) -> None:
         """Submit frame information to the claim form.
         
@@ -476,7 +495,7 @@ class ClaimPage(BasePage):
             # Trigger manual frame entry popup
             self.page.locator('#frame-search-textbox').fill('1234')
             self.page.locator('#frame-search-button').click()
-            sleep(1)
+            self.settle(1, selector='#search-manual-frames')
             manual = self.page.locator('#search-manual-frames')
             if manual.is_visible(timeout=3000):
                 manual.click()
@@ -527,6 +546,7 @@ class ClaimPage(BasePage):
             self.logger.log_error(f"Failed to submit frame: {str(e)}")
             self.take_screenshot("claim_frame_error")
 
+    @traced()
     def submit_lens(self, patient: Patient) -> None:
         """Fill out the lens information based on ``patient.lenses`` data.
 
@@ -574,30 +594,30 @@ class ClaimPage(BasePage):
         try:
             # Scroll to the start of the lens section
             self.page.evaluate("window.scrollTo(0, 500)")
-            self.page.wait_for_timeout(500)
+            self.settle(.5, selector='#lens-vision-dropdown', state='attached')
 
             # --- Finishing type dropdown ---
             finishing = self.page.locator('#lens-finishing-dropdown')
             if finishing.count() > 0:
                 # Use select_option instead of click to avoid visibility issues
                 finishing.select_option(value="IN_OFFICE_STOCK_LENS")
-                self.page.wait_for_timeout(500)
+                self.settle(.5, network_idle=True, dom_stable=True)
 
             # --- Vision type dropdown ---
             self.page.locator('#lens-vision-dropdown').select_option(label=lens_type)
-            self.page.wait_for_timeout(500)
+            self.settle(.5, network_idle=True, dom_stable=True)
 
             # --- Material dropdown ---
             if material:
                 self.page.locator('#lens-material-dropdown').select_option(label=material)
-                self.page.wait_for_timeout(500)
+                self.settle(.5, network_idle=True, dom_stable=True)
 
             # --- Lens design dropdown ---
             if design:
                 lens_dd = self.page.locator('#lens-lens-dropdown')
                 lens_dd.click()
                 # Wait for the dropdown to open
-                self.page.wait_for_timeout(500)
+                self.settle(.5, selector='.ng-dropdown-panel')
                 
                 # For ng-select, we need to type into the search input that appears
                 try:
@@ -605,12 +625,12 @@ class ClaimPage(BasePage):
                     search_input = self.page.locator('.ng-dropdown-panel input[type="text"]')
                     if search_input.is_visible(timeout=2000):
                         search_input.fill(design)
-                        self.page.wait_for_timeout(500)
+                        self.settle(.5, selector='.ng-dropdown-panel .ng-option')
                         search_input.press('Enter')
                     else:
                         # Fallback: try typing directly into the ng-select
                         lens_dd.type(design)
-                        self.page.wait_for_timeout(500)
+                        self.settle(.5, selector='.ng-dropdown-panel .ng-option')
                         lens_dd.press('Enter')
                 except Exception as e:
                     self.logger.log(f"Failed to fill ng-select with {design}: {str(e)}")
@@ -626,7 +646,7 @@ class ClaimPage(BasePage):
                         self.logger.log(f"Failed alternative approach: {str(e2)}")
                         lens_dd.press('Tab')  # Close dropdown
                 
-                self.page.wait_for_timeout(500)
+                self.settle(.5, selector='.ng-dropdown-panel', state='hidden')
 
             # --- Lab ID ---
             self.page.evaluate("window.scrollTo(0, 1900)")
@@ -649,7 +669,7 @@ class ClaimPage(BasePage):
 
             # Scroll to the patient paid section
             self.page.evaluate("window.scrollTo(0, 4400)")
-            self.page.wait_for_timeout(1000)
+            self.settle(1, selector='#services-patient-paid-amount-input')
 
             # Fill copay amount
             copay_field = self.page.locator("#services-patient-paid-amount-input")
@@ -830,6 +850,7 @@ class ClaimPage(BasePage):
             self.logger.log_error(f"Error checking existing popups: {str(e)}")
             return False
 
+    @traced()
     def handle_popup_with_expect_popup(self) -> bool:
         """Handle the VSP report popup using Playwright's expect_popup().
 
@@ -912,6 +933,7 @@ class ClaimPage(BasePage):
             self.logger.log_error(f"Expect popup handling failed: {str(e)}")
             return False
 
+    @traced()
     def _process_vsp_reports_page(self, reports_page) -> bool:
         """Process the VSP reports page directly.
         
@@ -966,14 +988,15 @@ class ClaimPage(BasePage):
                             self.logger.log_error("Missing VSP credentials in environment")
                             return False
                         
-                        # Use AMA username as default (you might want to make this configurable)
-                        username = ama_username
+                        username = ama_username if self.vsp_location == "ama" else bgr_username
                         
                         username_input.fill(username)
                         reports_page.locator("#password").fill(vsp_password)
                         reports_page.locator("button[type='submit']").click()
                         reports_page.wait_for_load_state()
                         self.logger.log("🔓 Logged in successfully to VSP reports page")
+                        # Keep the reports login so later popups and runs skip it
+                        get_session_cache().save(reports_page.context, "vsp", self.vsp_location, self.logger)
                         
                     except Exception as login_error:
                         self.logger.log_error(f"Failed to login to VSP reports page: {str(login_error)}")
@@ -1248,6 +1271,7 @@ class ClaimPage(BasePage):
             self.logger.log_error(f"Failed to download/print report: {str(e)}")
             return False
 
+    @traced()
     def click_submit_claim(self) -> bool:
         """Submit the claim and handle all post-submission flows.
         
@@ -1271,7 +1295,7 @@ class ClaimPage(BasePage):
             self.logger.log("Clicked submit claim button")
             
             # Step 2: Handle the confirmation popup
-            self.page.wait_for_timeout(1000)
+            self.settle(1, selector='#submit-claim-modal-ok-button')
             confirm_button = self.page.locator('#submit-claim-modal-ok-button')
             if confirm_button.is_visible(timeout=5000):
                 confirm_button.click()
@@ -1290,7 +1314,7 @@ class ClaimPage(BasePage):
                 success_button = self.page.locator('#successfully-submitted-claim-modal-yes-button')
                 if success_button.is_visible(timeout=3000):
                     success_button.click()
-                    time.sleep(5)
+                    self.settle(5, network_idle=True, dom_stable=True)
                     self.logger.log("Clicked yes button in success modal")
                     self.wait_for_network_idle(timeout=5000)
                     
@@ -1328,7 +1352,7 @@ class ClaimPage(BasePage):
                     for i in range(buttons.count()):
                         btn = buttons.nth(i)
                         btn.click()
-                        self.page.wait_for_timeout(500)
+                        self.settle(.5)
                     self.logger.log("Attempted to resolve warnings")
                 except Exception as e:
                     self.logger.log_error(f"Failed to handle warning buttons: {str(e)}")
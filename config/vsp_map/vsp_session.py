@@ -7,6 +7,7 @@ from .member_search_page import MemberSearch
 from .authorization_page import AuthorizationPage
 from .claim_page import ClaimPage
 from dotenv import load_dotenv
+from core.session_cache import get_session_cache
 
 class VspSession(BasePage):
     """Class for managing VSP session and page interactions."""
@@ -42,15 +43,31 @@ class VspSession(BasePage):
         """
         return getattr(self.pages, name)
 
-    def login(self, location: str = "ama") -> bool:
+    MEMBER_SEARCH_URL = "https://eclaim.eyefinity.com/secure/eInsurance/member-search"
+
+    def login(self, location: str = "ama", use_cache: bool = True) -> bool:
         """Login to VSP portal.
         
+        A saved session for ``location`` from ``SessionCache`` is reused when
+        it is still valid, skipping the eyefinity login.
+        
         Args:
             location: Location to login to ('ama' for Amarillo or 'bgr' for Borger)
+            use_cache: Try the saved session first and save the new one after
+                logging in
             
         Returns:
             bool: True if login was successful
         """
+        self.claim_page.vsp_location = location.lower()
+        cache = get_session_cache()
+        if use_cache and cache.restore(self.page.context, "vsp", location, self.logger):
+            if cache.validate(self.page, self.MEMBER_SEARCH_URL, "#member-search-search-button", "#username, #eyefinity-lgn"):
+                self.logger.log(f"Reused saved VSP session for {location}")
+                return True
+            self.logger.log("Saved VSP session expired, logging in")
+            cache.invalidate("vsp", location)
+
         try:
             self.logger.log("Starting VSP login process...")
             # Load credentials
@@ -84,9 +101,11 @@ class VspSession(BasePage):
             
             # Navigate to member search
             self.logger.log("Navigating to member search...")
-            self.page.goto("https://eclaim.eyefinity.com/secure/eInsurance/member-search")
+            self.page.goto(self.MEMBER_SEARCH_URL)
             
             self.logger.log("Login successful")
+            if use_cache:
+                cache.save(self.page.context, "vsp", location, self.logger)
             return True
             
         except Exception as e:
@@ -0,0 +1,259 @@
+#!/usr/bin/env python3
+"""Benchmark parse_claim_to_json against the old line-by-line parser.
+
+Extracts era.pdf once, then times both parsers over every claim and checks
+that the new parser agrees with the old one on every field the old one
+found (it may find more, since it reads every label on a line). Exits with
+status 1 if any claim parses differently.
+
+    python core/ai_tools/benchmark_era_parser.py --pdf path/to/era.pdf --repeat 20
+"""
+
+import argparse
+import os
+import re
+import sys
+import time
+
+from gateway_eob_scraper import (
+    extract_all_data,
+    separate_claims,
+    parse_claim_to_json,
+    parse_service_line,
+    parse_totals_line,
+)
+
+
+def parse_claim_to_json_legacy(claim_text):
+    """
+    The line-by-line parser ``parse_claim_to_json`` replaced, kept here as the
+    timing and correctness reference.
+    
+    Args:
+        claim_text: Raw text of a single claim
+        
+    Returns:
+        Dictionary containing structured claim data
+    """
+    claim_data = {
+        "patient_info": {},
+        "claim_info": {},
+        "service_lines": [],
+        "totals": {}
+    }
+    
+    lines = claim_text.split('\n')
+    
+    # Skip if this is just header information (no patient name)
+    has_patient_info = any("Patient Name:" in line for line in lines)
+    if not has_patient_info:
+        return None
+    
+    # Parse patient and claim header information
+    for line in lines:
+        line = line.strip()
+        if not line:
+            continue
+            
+        # Patient information - more flexible matching
+        if "Patient Name:" in line:
+            parts = line.split("Patient Name:")
+            if len(parts) > 1:
+                patient_part = parts[1]
+                # Extract patient name before any other field
+                if "Member Identification" in patient_part:
+                    claim_data["patient_info"]["patient_name"] = patient_part.split("Member Identification")[0].strip()
+                else:
+                    claim_data["patient_info"]["patient_name"] = patient_part.strip()
+                    
+        elif "Member Identification #:" in line:
+            parts = line.split("Member Identification #:")
+            if len(parts) > 1:
+                member_part = parts[1]
+                if "Insured Name" in member_part:
+                    claim_data["patient_info"]["member_id"] = member_part.split("Insured Name")[0].strip()
+                else:
+                    claim_data["patient_info"]["member_id"] = member_part.strip()
+                    
+        elif "Insured Name:" in line:
+            parts = line.split("Insured Name:")
+            if len(parts) > 1:
+                insured_part = parts[1]
+                if "Insured Member Identification" in insured_part:
+                    claim_data["patient_info"]["insured_name"] = insured_part.split("Insured Member Identification")[0].strip()
+                else:
+                    claim_data["patient_info"]["insured_name"] = insured_part.strip()
+                    
+        elif "Insured Member Identification:" in line:
+            parts = line.split("Insured Member Identification:")
+            if len(parts) > 1:
+                member_part = parts[1]
+                if "Claim ID" in member_part:
+                    claim_data["patient_info"]["insured_member_id"] = member_part.split("Claim ID")[0].strip()
+                else:
+                    claim_data["patient_info"]["insured_member_id"] = member_part.strip()
+            
+        # Claim information - more flexible matching
+        elif "Claim ID:" in line:
+            parts = line.split("Claim ID:")
+            if len(parts) > 1:
+                claim_part = parts[1]
+                if "Patient Account Number" in claim_part:
+                    claim_data["claim_info"]["claim_id"] = claim_part.split("Patient Account Number")[0].strip()
+                else:
+                    claim_data["claim_info"]["claim_id"] = claim_part.strip()
+                    
+        elif "Patient Account Number:" in line:
+            parts = line.split("Patient Account Number:")
+            if len(parts) > 1:
+                account_part = parts[1]
+                if "Claim Status" in account_part:
+                    claim_data["claim_info"]["patient_account_number"] = account_part.split("Claim Status")[0].strip()
+                else:
+                    claim_data["claim_info"]["patient_account_number"] = account_part.strip()
+                    
+        elif "Claim Status:" in line:
+            parts = line.split("Claim Status:")
+            if len(parts) > 1:
+                status_part = parts[1]
+                if "Rendering Provider" in status_part:
+                    claim_data["claim_info"]["claim_status"] = status_part.split("Rendering Provider")[0].strip()
+                else:
+                    claim_data["claim_info"]["claim_status"] = status_part.strip()
+                    
+        elif "Rendering Provider:" in line:
+            parts = line.split("Rendering Provider:")
+            if len(parts) > 1:
+                provider_part = parts[1]
+                if "Rendering NPI" in provider_part:
+                    claim_data["claim_info"]["rendering_provider"] = provider_part.split("Rendering NPI")[0].strip()
+                else:
+                    claim_data["claim_info"]["rendering_provider"] = provider_part.strip()
+                    
+        elif "Rendering NPI:" in line:
+            parts = line.split("Rendering NPI:")
+            if len(parts) > 1:
+                npi_part = parts[1]
+                if "Claim Payment Amount" in npi_part:
+                    claim_data["claim_info"]["rendering_npi"] = npi_part.split("Claim Payment Amount")[0].strip()
+                else:
+                    claim_data["claim_info"]["rendering_npi"] = npi_part.strip()
+                    
+        elif "Claim Payment Amount:" in line:
+            parts = line.split("Claim Payment Amount:")
+            if len(parts) > 1:
+                payment_part = parts[1]
+                if "Claim Adj Amt" in payment_part:
+                    claim_data["claim_info"]["claim_payment_amount"] = payment_part.split("Claim Adj Amt")[0].strip()
+                else:
+                    claim_data["claim_info"]["claim_payment_amount"] = payment_part.strip()
+                    
+        elif "Payer Claim Control # / ICN#:" in line:
+            parts = line.split("Payer Claim Control # / ICN#:")
+            if len(parts) > 1:
+                control_part = parts[1]
+                if "Patient Responsibility" in control_part:
+                    claim_data["claim_info"]["payer_claim_control"] = control_part.split("Patient Responsibility")[0].strip()
+                else:
+                    claim_data["claim_info"]["payer_claim_control"] = control_part.strip()
+                    
+        elif "Patient Responsibility:" in line:
+            parts = line.split("Patient Responsibility:")
+            if len(parts) > 1:
+                resp_part = parts[1]
+                if "Patient Responsibility Reason Code" in resp_part:
+                    claim_data["claim_info"]["patient_responsibility"] = resp_part.split("Patient Responsibility Reason Code")[0].strip()
+                else:
+                    claim_data["claim_info"]["patient_responsibility"] = resp_part.strip()
+    
+    # Parse service line items - look for date patterns
+    service_lines_started = False
+    for line in lines:
+        line = line.strip()
+        if not line:
+            continue
+            
+        # Look for service line header
+        if "Service Line Information" in line:
+            service_lines_started = True
+            continue
+            
+        # Parse service line items - look for date pattern MM/DD/YYYY
+        if service_lines_started and re.match(r'\d{1,2}/\d{1,2}/\d{4}', line):
+            # This is a service line item
+            service_line = parse_service_line(line)
+            if service_line:
+                claim_data["service_lines"].append(service_line)
+                
+        # Look for totals
+        elif "SERVICE LINE TOTALS:" in line:
+            totals = parse_totals_line(line)
+            if totals:
+                claim_data["totals"] = totals
+                break
+    
+    return claim_data
+
+
+
+def _time(parsers, claims, repeat, passes):
+    """Best seconds per pass over ``claims`` for each parser.
+
+    The parsers take turns within each of the ``repeat`` runs, so load on
+    the machine affects them alike.
+    """
+    best = [None] * len(parsers)
+    for _ in range(repeat):
+        for i, parser in enumerate(parsers):
+            start = time.perf_counter()
+            for _ in range(passes):
+                for claim_text in claims:
+                    parser(claim_text)
+            elapsed = (time.perf_counter() - start) / passes
+            best[i] = elapsed if best[i] is None else min(best[i], elapsed)
+    return best
+
+
+def compare_parsers(claims):
+    """Count claims parsed identically, as a superset, or differently."""
+    identical = superset = different = 0
+    for claim_text in claims:
+        old = parse_claim_to_json_legacy(claim_text)
+        new = parse_claim_to_json(claim_text)
+        if old == new:
+            identical += 1
+            continue
+        if old is not None and new is not None and old["service_lines"] == new["service_lines"] \
+                and old["totals"] == new["totals"] \
+                and all(new[section].get(key) == value
+                        for section in ("patient_info", "claim_info")
+                        for key, value in old[section].items()):
+            superset += 1
+        else:
+            different += 1
+    return identical, superset, different
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark the ERA claim parsers")
+    parser.add_argument("--pdf", default=os.path.join(os.path.dirname(__file__), "era.pdf"))
+    parser.add_argument("--repeat", type=int, default=10, help="Timing runs; the best is reported")
+    parser.add_argument("--passes", type=int, default=50, help="Passes over the claims per timing run")
+    args = parser.parse_args()
+
+    claims = [c for c in separate_claims(extract_all_data(args.pdf)) if c.strip()]
+    print(f"📄 {len(claims)} claim blocks, {sum(len(c) for c in claims):,} characters")
+
+    old_s, new_s = _time((parse_claim_to_json_legacy, parse_claim_to_json), claims, args.repeat, args.passes)
+    per_claim = lambda seconds: seconds / max(len(claims), 1) * 1e6
+    print(f"⏱️ legacy: {old_s * 1000:.1f} ms ({per_claim(old_s):.1f} µs/claim)")
+    print(f"⏱️ parse_claim_to_json: {new_s * 1000:.1f} ms ({per_claim(new_s):.1f} µs/claim)")
+    print(f"🚀 speedup: {old_s / new_s:.2f}x" if new_s else "🚀 speedup: n/a")
+
+    identical, superset, different = compare_parsers(claims)
+    print(f"✅ identical: {identical}, ➕ extra fields only: {superset}, ❌ different: {different}")
+    return 1 if different else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,241 @@
+#!/usr/bin/env python3
+"""Batch ingestion of gateway ERA PDFs into one SQLite store.
+
+Takes any mix of PDF paths, directories and glob patterns, parses the files
+across a process pool with ``gateway_eob_scraper.iter_claims`` and writes the
+claims to ``logs/era/era.db``:
+
+- claims are deduplicated on (claim_id, payer_claim_control), so the same
+  claim showing up in two weekly files is stored once. Claims without a
+  claim ID cannot be deduplicated; they are skipped and counted;
+- every ingested file is checkpointed by its SHA-256, so a rerun over the same
+  backlog only parses files it has not seen. A file's claims and its
+  checkpoint are committed in one transaction, so an interrupted run never
+  leaves a file half loaded.
+
+    python core/ai_tools/era_ingest.py "eras/2024/*.pdf" eras/payer_x --workers 8
+"""
+
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from datetime import datetime
+from pathlib import Path
+from threading import Lock
+import argparse
+import glob
+import hashlib
+import json
+import os
+import sqlite3
+
+try:
+    from .gateway_eob_scraper import iter_claims
+except ImportError:
+    from gateway_eob_scraper import iter_claims
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS claims (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    claim_id TEXT NOT NULL,
+    payer_claim_control TEXT NOT NULL,
+    patient_name TEXT,
+    member_id TEXT,
+    claim_status TEXT,
+    claim_payment_amount TEXT,
+    patient_responsibility TEXT,
+    service_lines INTEGER NOT NULL,
+    data TEXT NOT NULL,
+    source_sha256 TEXT NOT NULL,
+    ingested TEXT NOT NULL
+);
+CREATE UNIQUE INDEX IF NOT EXISTS idx_claims_key ON claims (claim_id, payer_claim_control);
+CREATE INDEX IF NOT EXISTS idx_claims_member ON claims (member_id);
+CREATE INDEX IF NOT EXISTS idx_claims_source ON claims (source_sha256);
+CREATE TABLE IF NOT EXISTS ingested_files (
+    sha256 TEXT PRIMARY KEY,
+    path TEXT NOT NULL,
+    claims INTEGER NOT NULL,
+    inserted INTEGER NOT NULL,
+    ingested TEXT NOT NULL
+);
+"""
+
+
+def file_sha256(path, chunk_size: int = 1024 * 1024) -> str:
+    """Return the SHA-256 hex digest of a file's contents."""
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(chunk_size), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def expand_inputs(inputs: Iterable[str]) -> List[Path]:
+    """Resolve PDF paths, directories (searched recursively) and glob patterns.
+
+    Returns the matching ``.pdf`` files, sorted and without duplicates.
+    """
+    found = set()
+    for item in inputs:
+        path = Path(item)
+        if path.is_dir():
+            found.update(p for p in path.rglob("*") if p.suffix.lower() == ".pdf")
+        elif path.is_file():
+            found.add(path)
+        else:
+            matches = glob.glob(item, recursive=True)
+            if not matches:
+                print(f"⚠️ No files match {item}")
+            found.update(Path(m) for m in matches if Path(m).is_file() and m.lower().endswith(".pdf"))
+    return sorted(p.resolve() for p in found)
+
+
+def _parse_file(path: str) -> List[Dict[str, Any]]:
+    """Parse one ERA PDF in a worker process; returns each claim's data."""
+    return [claim["data"] for claim in iter_claims(path)]
+
+
+class ERAStore:
+    """Claims table deduplicated on (claim_id, payer_claim_control), with file checkpoints."""
+
+    def __init__(self, db_path: str = "logs/era/era.db"):
+        self.db_path = Path(db_path)
+        self.db_path.parent.mkdir(exist_ok=True, parents=True)
+        self._lock = Lock()
+        self.conn = sqlite3.connect(str(self.db_path), check_same_thread=False)
+        self.conn.executescript(_SCHEMA)
+
+    def ingested_hashes(self) -> set:
+        """Return the SHA-256 of every file already ingested."""
+        with self._lock:
+            return {row[0] for row in self.conn.execute("SELECT sha256 FROM ingested_files")}
+
+    @staticmethod
+    def _row(claim: Dict[str, Any], sha256: str, now: str) -> Tuple:
+        patient = claim.get("patient_info", {})
+        info = claim.get("claim_info", {})
+        return (
+            info["claim_id"],
+            info.get("payer_claim_control") or "",
+            patient.get("patient_name"),
+            patient.get("member_id"),
+            info.get("claim_status"),
+            info.get("claim_payment_amount"),
+            info.get("patient_responsibility"),
+            len(claim.get("service_lines", [])),
+            json.dumps(claim),
+            sha256,
+            now,
+        )
+
+    def add_file(self, sha256: str, path: str, claims: List[Dict[str, Any]]) -> Tuple[int, int]:
+        """Store a file's claims and checkpoint the file in one transaction.
+
+        Claims already in the store are skipped, as are claims without a
+        claim ID, which would otherwise all collapse into one row.
+
+        Returns:
+            tuple: ``(inserted, unkeyed)``, the number of new claims stored and
+            of claims skipped for having no claim ID
+        """
+        keyed = [claim for claim in claims if claim.get("claim_info", {}).get("claim_id")]
+        now = datetime.now().isoformat()
+        with self._lock, self.conn:
+            before = self.conn.total_changes
+            self.conn.executemany(
+                "INSERT OR IGNORE INTO claims (claim_id, payer_claim_control, patient_name, member_id, "
+                "claim_status, claim_payment_amount, patient_responsibility, service_lines, data, "
+                "source_sha256, ingested) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                [self._row(claim, sha256, now) for claim in keyed],
+            )
+            inserted = self.conn.total_changes - before
+            self.conn.execute(
+                "INSERT OR REPLACE INTO ingested_files (sha256, path, claims, inserted, ingested) "
+                "VALUES (?, ?, ?, ?, ?)",
+                (sha256, path, len(claims), inserted, now),
+            )
+        return inserted, len(claims) - len(keyed)
+
+    def query(self, sql, params=()):
+        """Run a read query and return the rows"""
+        with self._lock:
+            return self.conn.execute(sql, params).fetchall()
+
+    def close(self):
+        with self._lock:
+            self.conn.close()
+
+
+def ingest(inputs: Iterable[str], store: Optional[ERAStore] = None,
+           max_workers: Optional[int] = None) -> Dict[str, int]:
+    """Parse every new ERA PDF in ``inputs`` in parallel and load it into the store.
+
+    Args:
+        inputs: PDF paths, directories or glob patterns
+        store: Target store (defaults to ``logs/era/era.db``)
+        max_workers: Parser processes (defaults to the CPU count)
+
+    Returns:
+        dict with counts of ``files`` found, ``skipped`` (already ingested or duplicate contents),
+        ``ingested``, ``failed``, ``claims`` parsed, ``inserted`` and
+        ``unkeyed`` (claims skipped for having no claim ID)
+    """
+    store = store or ERAStore()
+    files = expand_inputs(inputs)
+    seen = store.ingested_hashes()
+    summary = {"files": len(files), "skipped": 0, "ingested": 0, "failed": 0, "claims": 0, "inserted": 0,
+               "unkeyed": 0}
+
+    pending = {}
+    for path in files:
+        sha256 = file_sha256(path)
+        if sha256 in seen or sha256 in pending:
+            summary["skipped"] += 1
+            continue
+        pending[sha256] = str(path)
+    print(f"📂 {len(files)} ERA files, {summary['skipped']} already ingested or duplicates, {len(pending)} to parse")
+    if not pending:
+        return summary
+
+    workers = max_workers or min(os.cpu_count() or 1, len(pending))
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        futures = {pool.submit(_parse_file, path): sha256 for sha256, path in pending.items()}
+        for future in as_completed(futures):
+            sha256 = futures[future]
+            path = pending[sha256]
+            try:
+                claims = future.result()
+            except Exception as e:
+                summary["failed"] += 1
+                print(f"❌ Failed to parse {path}: {str(e)}")
+                continue
+            inserted, unkeyed = store.add_file(sha256, path, claims)
+            summary["ingested"] += 1
+            summary["claims"] += len(claims)
+            summary["inserted"] += inserted
+            summary["unkeyed"] += unkeyed
+            print(f"✅ {os.path.basename(path)}: {len(claims)} claims, {inserted} new")
+            if unkeyed:
+                print(f"⚠️ {os.path.basename(path)}: skipped {unkeyed} claims without a claim ID")
+    return summary
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Load a batch of gateway ERA PDFs into one claims store")
+    parser.add_argument("inputs", nargs="+", help="ERA PDFs, directories or glob patterns")
+    parser.add_argument("--db", default="logs/era/era.db", help="SQLite store (default: logs/era/era.db)")
+    parser.add_argument("--workers", type=int, help="Parser processes (default: CPU count)")
+    args = parser.parse_args()
+
+    store = ERAStore(args.db)
+    try:
+        summary = ingest(args.inputs, store, args.workers)
+    finally:
+        store.close()
+    print(f"📊 {summary['ingested']} files ingested ({summary['skipped']} skipped, {summary['failed']} failed), "
+          f"{summary['claims']} claims parsed, {summary['inserted']} new, "
+          f"{summary['unkeyed']} skipped without a claim ID")
+
+
+if __name__ == "__main__":
+    main()
@@ -33,7 +33,7 @@ def debug_failed_selector(page: Page, failed_selector: str, context_name: str =
         return None
     
     # Step 2: Analyze with AI if we have HTML context
-    if context_data.get('element_html') or context_data.get('full_page_html'):
+    if context_data.get('element_html') or context_data.get('nearby_html') or context_data.get('full_page_html'):
         print("🤖 Analyzing with AI...")
         
         # Initialize AI client
@@ -48,8 +48,8 @@ def debug_failed_selector(page: Page, failed_selector: str, context_name: str =
 {context_data.get('sibling_context', '')}
 """
         else:
-            # Use full page HTML if element not found
-            html_snippet = context_data.get('full_page_html', '')
+            # Element not found: use the HTML around the closest matching ancestor
+            html_snippet = context_data.get('nearby_html') or context_data.get('full_page_html', '')
         
         # Run AI analysis
         ai_results = ai_client.analyze_playwright_selector(failed_selector, html_snippet)
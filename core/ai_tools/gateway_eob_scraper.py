@@ -1,4 +1,5 @@
 #!/usr/bin/env python3
+import argparse
 import pdfplumber
 import os
 import json
@@ -24,6 +25,81 @@ def extract_all_data(pdf_path):
             full_text += page_text + "\n"  # add a newline to separate pages
     return full_text
 
+CLAIM_MARKER = "Claim Information"
+
+def iter_page_texts(pdf_path):
+    """
+    Yield the text of each page, one page at a time.
+
+    Each page's cached layout objects are released once its text is read, so
+    memory stays flat however long the PDF is.
+    """
+    with pdfplumber.open(pdf_path) as pdf:
+        print(f"Number of pages in {pdf_path}: {len(pdf.pages)}")
+        for page in pdf.pages:
+            page_text = page.extract_text() or ""
+            close = getattr(page, "close", None) or getattr(page, "flush_cache", None)
+            if close:
+                close()
+            yield page_text + "\n"  # add a newline to separate pages
+
+def iter_claim_texts(page_texts):
+    """
+    Split a stream of page texts into claim texts.
+
+    Yields the same pieces as ``separate_claims`` on the joined text, but each
+    claim is yielded as soon as the next "Claim Information" marker shows up.
+    The unfinished claim at the end of a page is carried to the next page.
+    """
+    carry = ""
+    for page_text in page_texts:
+        parts = (carry + page_text).split(CLAIM_MARKER)
+        carry = parts.pop()
+        for part in parts:
+            yield part
+    yield carry
+
+def iter_claims(pdf_path, debug_claims=0):
+    """
+    Parse an ERA PDF lazily, yielding each structured claim as it completes.
+
+    Args:
+        pdf_path: Path to the ERA PDF
+        debug_claims: Print the structure of this many leading claims
+
+    Yields:
+        Dicts shaped like the entries of ``parse_all_claims_to_json``
+    """
+    for i, claim_text in enumerate(iter_claim_texts(iter_page_texts(pdf_path))):
+        if not claim_text.strip():
+            continue
+        if i < debug_claims:
+            debug_claim_structure(claim_text)
+        claim_json = parse_claim_to_json(claim_text)
+        if claim_json:
+            yield {
+                "claim_number": i+1,
+                "data": claim_json
+            }
+
+def write_claims_jsonl(claims, output_file):
+    """
+    Write claims to a JSON Lines file as they arrive.
+
+    Every line is flushed, so the file can be read while the PDF is still
+    being parsed.
+
+    Returns:
+        Number of claims written
+    """
+    count = 0
+    with open(output_file, 'w') as f:
+        for claim in claims:
+            f.write(json.dumps(claim) + "\n")
+            f.flush()
+            count += 1
+    return count
+
 def debug_claim_structure(claim_text):
     """
     Debug function to see the actual structure of claim data.
@@ -46,9 +122,79 @@ def debug_claim_structure(claim_text):
         if any(keyword in line for keyword in ["Patient Name:", "Claim ID:", "Service Line", "Begin", "End", "SERVICE LINE TOTALS", "Patient:", "Member:", "Insured:", "Claim:", "Provider:", "Date:", "Amount:", "Code:", "NPI:"]):
             print(f"Line {i}: {line}")
 
+# Header fields: label -> (section, key). A value runs from its label to the
+# next label or terminator on the same line, or to the end of the line.
+CLAIM_FIELDS = {
+    "Patient Name:": ("patient_info", "patient_name"),
+    "Member Identification #:": ("patient_info", "member_id"),
+    "Insured Name:": ("patient_info", "insured_name"),
+    "Insured Member Identification:": ("patient_info", "insured_member_id"),
+    "Claim ID:": ("claim_info", "claim_id"),
+    "Patient Account Number:": ("claim_info", "patient_account_number"),
+    "Claim Status:": ("claim_info", "claim_status"),
+    "Rendering Provider:": ("claim_info", "rendering_provider"),
+    "Rendering NPI:": ("claim_info", "rendering_npi"),
+    "Claim Payment Amount:": ("claim_info", "claim_payment_amount"),
+    "Payer Claim Control # / ICN#:": ("claim_info", "payer_claim_control"),
+    "Patient Responsibility:": ("claim_info", "patient_responsibility"),
+}
+
+# Labels that end a value but are not extracted
+CLAIM_TERMINATORS = (
+    "Member Identification",
+    "Insured Name",
+    "Insured Member Identification",
+    "Claim ID",
+    "Patient Account Number",
+    "Claim Status",
+    "Rendering Provider",
+    "Rendering NPI",
+    "Claim Adj Amt",
+    "Patient Responsibility",
+)
+
+def _alternation(labels):
+    """Regex matching any of ``labels``, longest first, factored as a trie.
+
+    Sharing prefixes ("Patient ", "Claim ", ...) means the engine tests a
+    handful of branches at each position instead of every label.
+    """
+    trie = {}
+    for label in labels:
+        node = trie
+        for char in label:
+            node = node.setdefault(char, {})
+        node[""] = {}
+
+    def build(node):
+        branches = [re.escape(char) + build(child) for char, child in node.items() if char]
+        if not branches:
+            return ""
+        body = branches[0] if len(branches) == 1 else "(?:" + "|".join(branches) + ")"
+        # A label ending here is tried after its longer continuations
+        return "(?:" + body + ")?" if "" in node else body
+
+    return build(trie)
+
+SERVICE_START = "Service Line Information"
+TOTALS_LABEL = "SERVICE LINE TOTALS:"
+
+# Every label and terminator in one compiled alternation. Splitting a claim on
+# it yields [preamble, token, text, token, text, ...], so each header value is
+# the first line of the text after its label.
+_CLAIM_SPLIT_RE = re.compile("(" + _alternation(list(CLAIM_FIELDS) + list(CLAIM_TERMINATORS)) + ")")
+
+_SERVICE_LINE_RE = re.compile(r"^[ \t]*(\d{1,2}/\d{1,2}/\d{4}.*)$", re.MULTILINE)
+
 def parse_claim_to_json(claim_text):
     """
     Parse a single claim text into structured JSON format.
+
+    Header fields are read off one split of the claim on ``_CLAIM_SPLIT_RE``
+    with a ``CLAIM_FIELDS`` lookup. Service lines are the dated lines between
+    "Service Line Information" and the totals line. Unlike the old
+    line-by-line parser, every label on a line is extracted, not just the
+    first.
     
     Args:
         claim_text: Raw text of a single claim
@@ -62,157 +208,43 @@ def parse_claim_to_json(claim_text):
         "service_lines": [],
         "totals": {}
     }
-    
-    lines = claim_text.split('\n')
-    
+
+    # The service block runs from the "Service Line Information" marker to the
+    # totals line; header labels are looked for everywhere else. Without a
+    # totals line the block has no known end, so labels are looked for in
+    # the whole text.
+    service_start = claim_text.find(SERVICE_START)
+    totals_start = claim_text.find(TOTALS_LABEL, max(service_start, 0))
+    totals_end = claim_text.find("\n", totals_start) if totals_start >= 0 else -1
+    if totals_end < 0:
+        totals_end = len(claim_text)
+    block_end = totals_start if totals_start >= 0 else len(claim_text)
+    if service_start >= 0 and totals_start >= 0:
+        header_text = claim_text[:service_start] + "\n" + claim_text[totals_end:]
+    else:
+        header_text = claim_text
+
+    parts = _CLAIM_SPLIT_RE.split(header_text)
+    for i in range(1, len(parts), 2):
+        field = CLAIM_FIELDS.get(parts[i])
+        if field is not None:
+            claim_data[field[0]][field[1]] = parts[i + 1].partition("\n")[0].strip()
+
     # Skip if this is just header information (no patient name)
-    has_patient_info = any("Patient Name:" in line for line in lines)
-    if not has_patient_info:
+    if "patient_name" not in claim_data["patient_info"]:
         return None
-    
-    # Parse patient and claim header information
-    for line in lines:
-        line = line.strip()
-        if not line:
-            continue
-            
-        # Patient information - more flexible matching
-        if "Patient Name:" in line:
-            parts = line.split("Patient Name:")
-            if len(parts) > 1:
-                patient_part = parts[1]
-                # Extract patient name before any other field
-                if "Member Identification" in patient_part:
-                    claim_data["patient_info"]["patient_name"] = patient_part.split("Member Identification")[0].strip()
-                else:
-                    claim_data["patient_info"]["patient_name"] = patient_part.strip()
-                    
-        elif "Member Identification #:" in line:
-            parts = line.split("Member Identification #:")
-            if len(parts) > 1:
-                member_part = parts[1]
-                if "Insured Name" in member_part:
-                    claim_data["patient_info"]["member_id"] = member_part.split("Insured Name")[0].strip()
-                else:
-                    claim_data["patient_info"]["member_id"] = member_part.strip()
-                    
-        elif "Insured Name:" in line:
-            parts = line.split("Insured Name:")
-            if len(parts) > 1:
-                insured_part = parts[1]
-                if "Insured Member Identification" in insured_part:
-                    claim_data["patient_info"]["insured_name"] = insured_part.split("Insured Member Identification")[0].strip()
-                else:
-                    claim_data["patient_info"]["insured_name"] = insured_part.strip()
-                    
-        elif "Insured Member Identification:" in line:
-            parts = line.split("Insured Member Identification:")
-            if len(parts) > 1:
-                member_part = parts[1]
-                if "Claim ID" in member_part:
-                    claim_data["patient_info"]["insured_member_id"] = member_part.split("Claim ID")[0].strip()
-                else:
-                    claim_data["patient_info"]["insured_member_id"] = member_part.strip()
-            
-        # Claim information - more flexible matching
-        elif "Claim ID:" in line:
-            parts = line.split("Claim ID:")
-            if len(parts) > 1:
-                claim_part = parts[1]
-                if "Patient Account Number" in claim_part:
-                    claim_data["claim_info"]["claim_id"] = claim_part.split("Patient Account Number")[0].strip()
-                else:
-                    claim_data["claim_info"]["claim_id"] = claim_part.strip()
-                    
-        elif "Patient Account Number:" in line:
-            parts = line.split("Patient Account Number:")
-            if len(parts) > 1:
-                account_part = parts[1]
-                if "Claim Status" in account_part:
-                    claim_data["claim_info"]["patient_account_number"] = account_part.split("Claim Status")[0].strip()
-                else:
-                    claim_data["claim_info"]["patient_account_number"] = account_part.strip()
-                    
-        elif "Claim Status:" in line:
-            parts = line.split("Claim Status:")
-            if len(parts) > 1:
-                status_part = parts[1]
-                if "Rendering Provider" in status_part:
-                    claim_data["claim_info"]["claim_status"] = status_part.split("Rendering Provider")[0].strip()
-                else:
-                    claim_data["claim_info"]["claim_status"] = status_part.strip()
-                    
-        elif "Rendering Provider:" in line:
-            parts = line.split("Rendering Provider:")
-            if len(parts) > 1:
-                provider_part = parts[1]
-                if "Rendering NPI" in provider_part:
-                    claim_data["claim_info"]["rendering_provider"] = provider_part.split("Rendering NPI")[0].strip()
-                else:
-                    claim_data["claim_info"]["rendering_provider"] = provider_part.strip()
-                    
-        elif "Rendering NPI:" in line:
-            parts = line.split("Rendering NPI:")
-            if len(parts) > 1:
-                npi_part = parts[1]
-                if "Claim Payment Amount" in npi_part:
-                    claim_data["claim_info"]["rendering_npi"] = npi_part.split("Claim Payment Amount")[0].strip()
-                else:
-                    claim_data["claim_info"]["rendering_npi"] = npi_part.strip()
-                    
-        elif "Claim Payment Amount:" in line:
-            parts = line.split("Claim Payment Amount:")
-            if len(parts) > 1:
-                payment_part = parts[1]
-                if "Claim Adj Amt" in payment_part:
-                    claim_data["claim_info"]["claim_payment_amount"] = payment_part.split("Claim Adj Amt")[0].strip()
-                else:
-                    claim_data["claim_info"]["claim_payment_amount"] = payment_part.strip()
-                    
-        elif "Payer Claim Control # / ICN#:" in line:
-            parts = line.split("Payer Claim Control # / ICN#:")
-            if len(parts) > 1:
-                control_part = parts[1]
-                if "Patient Responsibility" in control_part:
-                    claim_data["claim_info"]["payer_claim_control"] = control_part.split("Patient Responsibility")[0].strip()
-                else:
-                    claim_data["claim_info"]["payer_claim_control"] = control_part.strip()
-                    
-        elif "Patient Responsibility:" in line:
-            parts = line.split("Patient Responsibility:")
-            if len(parts) > 1:
-                resp_part = parts[1]
-                if "Patient Responsibility Reason Code" in resp_part:
-                    claim_data["claim_info"]["patient_responsibility"] = resp_part.split("Patient Responsibility Reason Code")[0].strip()
-                else:
-                    claim_data["claim_info"]["patient_responsibility"] = resp_part.strip()
-    
-    # Parse service line items - look for date patterns
-    service_lines_started = False
-    for line in lines:
-        line = line.strip()
-        if not line:
-            continue
-            
-        # Look for service line header
-        if "Service Line Information" in line:
-            service_lines_started = True
-            continue
-            
-        # Parse service line items - look for date pattern MM/DD/YYYY
-        if service_lines_started and re.match(r'\d{1,2}/\d{1,2}/\d{4}', line):
-            # This is a service line item
-            service_line = parse_service_line(line)
+
+    if service_start >= 0:
+        for service in _SERVICE_LINE_RE.finditer(claim_text, service_start + len(SERVICE_START), block_end):
+            service_line = parse_service_line(service.group(1).strip())
             if service_line:
                 claim_data["service_lines"].append(service_line)
-                
-        # Look for totals
-        elif "SERVICE LINE TOTALS:" in line:
-            totals = parse_totals_line(line)
-            if totals:
-                claim_data["totals"] = totals
-                break
-    
+
+    if totals_start >= 0:
+        totals = parse_totals_line(claim_text[totals_start:totals_end])
+        if totals:
+            claim_data["totals"] = totals
+
     return claim_data
 
 def parse_service_line(line):
@@ -282,6 +314,8 @@ def parse_totals_line(line):
     
     return None
 
+_AMOUNT_JUNK_RE = re.compile(r'[^\d.$]')
+
 def extract_amount(amount_str):
     """
     Extract and clean amount values.
@@ -296,7 +330,7 @@ def extract_amount(amount_str):
         return "$0.00"
     
     # Remove any non-numeric characters except decimal point and dollar sign
-    cleaned = re.sub(r'[^\d.$]', '', amount_str)
+    cleaned = _AMOUNT_JUNK_RE.sub('', amount_str)
     
     # Ensure it starts with $
     if not cleaned.startswith('$'):
@@ -336,8 +370,22 @@ def parse_all_claims_to_json(claims):
     return structured_claims
 
 def main():
+    parser = argparse.ArgumentParser(description="Parse a gateway ERA PDF into structured claims")
+    parser.add_argument("--pdf", default=os.path.join(os.path.dirname(__file__), "era.pdf"),
+                        help="ERA PDF to parse (defaults to era.pdf in this directory)")
+    parser.add_argument("--stream", action="store_true",
+                        help="Parse page by page and write claims to JSON Lines as they complete")
+    parser.add_argument("--output", help="Output file (defaults to structured_claims.json or .jsonl)")
+    args = parser.parse_args()
+
     # Set pdf file path to era.pdf inside this directory
-    pdf_file = os.path.join(os.path.dirname(__file__), "era.pdf")
+    pdf_file = args.pdf
+
+    if args.stream:
+        output_file = args.output or os.path.join(os.path.dirname(__file__), "structured_claims.jsonl")
+        count = write_claims_jsonl(iter_claims(pdf_file), output_file)
+        print(f"✅ Streamed {count} claims to: {output_file}")
+        return
     
     # Extract all data into one variable
     all_data = extract_all_data(pdf_file)
@@ -351,7 +399,7 @@ def main():
     structured_claims = parse_all_claims_to_json(claims)
     
     # Save structured data to JSON file
-    output_file = os.path.join(os.path.dirname(__file__), "structured_claims.json")
+    output_file = args.output or os.path.join(os.path.dirname(__file__), "structured_claims.json")
     with open(output_file, 'w') as f:
         json.dump(structured_claims, f, indent=2)
     
@@ -0,0 +1,152 @@
+"""On-disk cache of LLM responses.
+
+Entries are keyed by the SHA-256 of the model, prompt and generation options,
+so the same deterministic request is only paid for once. The cache is a
+SQLite file (``logs/llm_cache/cache.db``) with a TTL per entry and a total
+size bound; when the bound is exceeded the least recently used entries are
+evicted. Responses can contain patient data extracted from PDFs, so the
+directory and database are only accessible to the current user.
+
+Environment overrides: ``AGENT_LLM_CACHE=0`` disables the cache,
+``AGENT_LLM_CACHE_TTL`` sets the TTL in seconds (default 7 days) and
+``AGENT_LLM_CACHE_MAX_BYTES`` the size bound (default 200 MB).
+"""
+
+from typing import Any, Dict, Optional
+from pathlib import Path
+from threading import Lock
+import hashlib
+import json
+import os
+import sqlite3
+import time
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS responses (
+    key TEXT PRIMARY KEY,
+    model TEXT NOT NULL,
+    response TEXT NOT NULL,
+    size INTEGER NOT NULL,
+    created REAL NOT NULL,
+    accessed REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_responses_accessed ON responses (accessed);
+"""
+
+
+def cache_key(model: str, prompt: str, options: Optional[Dict[str, Any]] = None,
+              base_url: str = "") -> str:
+    """Return the SHA-256 hex digest identifying a request.
+
+    ``base_url`` keeps two servers that serve a model under the same name apart.
+    """
+    payload = json.dumps({"base_url": base_url, "model": model, "prompt": prompt, "options": options or {}},
+                         sort_keys=True, default=str)
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+class LLMCache:
+    """SQLite-backed response cache with TTL and LRU size eviction."""
+
+    def __init__(self, cache_dir: str = "logs/llm_cache", ttl_seconds: Optional[float] = None,
+                 max_bytes: Optional[int] = None):
+        """Initialize the cache.
+
+        Args:
+            cache_dir: Directory holding ``cache.db``
+            ttl_seconds: Entry lifetime (``AGENT_LLM_CACHE_TTL``, default 7 days)
+            max_bytes: Total response size kept (``AGENT_LLM_CACHE_MAX_BYTES``)
+        """
+        self.cache_dir = Path(cache_dir)
+        self.cache_dir.mkdir(parents=True, exist_ok=True, mode=0o700)
+        os.chmod(self.cache_dir, 0o700)
+        self.ttl_seconds = ttl_seconds if ttl_seconds is not None else float(
+            os.getenv("AGENT_LLM_CACHE_TTL", 7 * 24 * 3600)
+        )
+        self.max_bytes = max_bytes if max_bytes is not None else int(
+            os.getenv("AGENT_LLM_CACHE_MAX_BYTES", 200 * 1024 * 1024)
+        )
+        self._lock = Lock()
+        db_path = self.cache_dir / "cache.db"
+        # Responses include patient data; keep the file private to the user.
+        # SQLite gives its journal files the database file's permissions.
+        os.close(os.open(db_path, os.O_WRONLY | os.O_CREAT, 0o600))
+        os.chmod(db_path, 0o600)
+        self.conn = sqlite3.connect(str(db_path), check_same_thread=False)
+        self.conn.executescript(_SCHEMA)
+        self.hits = 0
+        self.misses = 0
+
+    @staticmethod
+    def enabled() -> bool:
+        return os.getenv("AGENT_LLM_CACHE", "1").lower() not in ("0", "false", "no")
+
+    def get(self, key: str) -> Optional[str]:
+        """Return the cached response, or None if missing or expired."""
+        now = time.time()
+        with self._lock:
+            row = self.conn.execute("SELECT response, created FROM responses WHERE key = ?", (key,)).fetchone()
+            if row is None or now - row[1] > self.ttl_seconds:
+                if row is not None:
+                    with self.conn:
+                        self.conn.execute("DELETE FROM responses WHERE key = ?", (key,))
+                self.misses += 1
+                return None
+            with self.conn:
+                self.conn.execute("UPDATE responses SET accessed = ? WHERE key = ?", (now, key))
+            self.hits += 1
+            return row[0]
+
+    def put(self, key: str, model: str, response: str) -> None:
+        """Store a response and evict least recently used entries over the bound."""
+        now = time.time()
+        size = len(response.encode("utf-8"))
+        with self._lock, self.conn:
+            self.conn.execute(
+                "INSERT OR REPLACE INTO responses (key, model, response, size, created, accessed) "
+                "VALUES (?, ?, ?, ?, ?, ?)",
+                (key, model, response, size, now, now),
+            )
+            self.conn.execute("DELETE FROM responses WHERE created < ?", (now - self.ttl_seconds,))
+            total = self.conn.execute("SELECT COALESCE(SUM(size), 0) FROM responses").fetchone()[0]
+            if total > self.max_bytes:
+                freed = 0
+                evict = []
+                for old_key, old_size in self.conn.execute(
+                    "SELECT key, size FROM responses ORDER BY accessed"
+                ):
+                    if total - freed <= self.max_bytes:
+                        break
+                    evict.append((old_key,))
+                    freed += old_size
+                self.conn.executemany("DELETE FROM responses WHERE key = ?", evict)
+
+    def clear(self) -> None:
+        """Remove every entry."""
+        with self._lock, self.conn:
+            self.conn.execute("DELETE FROM responses")
+
+    def stats(self) -> Dict[str, int]:
+        """Return entry count, total bytes, and hits/misses for this process."""
+        with self._lock:
+            entries, total = self.conn.execute("SELECT COUNT(*), COALESCE(SUM(size), 0) FROM responses").fetchone()
+        return {"entries": entries, "bytes": total, "hits": self.hits, "misses": self.misses}
+
+    def close(self) -> None:
+        with self._lock:
+            self.conn.close()
+
+
+# Global cache instance
+_cache = None
+_cache_lock = Lock()
+
+
+def get_llm_cache() -> LLMCache:
+    """Get the global LLM response cache"""
+    global _cache
+    if _cache is None:
+        with _cache_lock:
+            if _cache is None:
+                _cache = LLMCache()
+    return _cache
@@ -1,51 +1,228 @@
 import requests
-from typing import Optional, Dict, Any, List
-from abc import ABC, abstractmethod
-import fitz  # PyMuPDF
-from PIL import Image
-import pytesseract
-from PyPDF2 import PdfReader
+from requests.adapters import HTTPAdapter
+from typing import Optional, Dict, Any, List, Callable, Iterator
 import os
+import sys
+import hashlib
 import json
+import random
+import time
+from collections import OrderedDict
 from datetime import datetime
+from concurrent.futures import ThreadPoolExecutor, as_completed, TimeoutError as FuturesTimeout
+from threading import BoundedSemaphore, Event, Lock
+
+if __package__:
+    from .llm_cache import LLMCache, cache_key, get_llm_cache
+else:
+    # Run as a script (or imported as a top-level module) from this
+    # directory: the sibling module is on the path, the repo root is not
+    from llm_cache import LLMCache, cache_key, get_llm_cache
+    _repo_root = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+    if _repo_root not in sys.path:
+        sys.path.insert(0, _repo_root)
+
+from core.pdf_tools import HybridPDFTool, PyMuPDFTool, TesseractTool
+
+
+def first_line_complete(text: str) -> bool:
+    """Stop predicate: a non-empty line (other than a code fence) has ended."""
+    lines = text.split("\n")
+    return any(line.strip() and not line.strip().startswith("```") for line in lines[:-1])
+
+
+def json_array_complete(text: str) -> bool:
+    """Stop predicate: the first JSON array in the text has been closed."""
+    start = text.find("[")
+    if start < 0:
+        return False
+    depth = 0
+    for ch in text[start:]:
+        if ch == "[":
+            depth += 1
+        elif ch == "]":
+            depth -= 1
+            if depth == 0:
+                return True
+    return False
+
+
+def first_meaningful_line(text: str) -> str:
+    """Return the first non-empty line that is not a code fence."""
+    for line in text.splitlines():
+        if line.strip() and not line.strip().startswith("```"):
+            return line.strip()
+    return text.strip()
+
+
+# Options for extraction and selector prompts: deterministic, so cacheable
+DETERMINISTIC = {"temperature": 0}
+
+
+# Extracted PDF texts memoized per client, by file hash
+TEXT_CACHE_SIZE = 16
+
+# Status codes worth retrying: rate limited, or the server/proxy is busy
+RETRY_STATUSES = (429, 502, 503, 504)
+
+# Seconds to wait for the selector quorum before ranking what has arrived
+SELECTOR_TOTAL_TIMEOUT = 120.0
 
-class AbstractPDFTool(ABC):
-    @abstractmethod
-    def parse(self, file_path: str) -> dict:
-        pass
-
-class PyMuPDFTool(AbstractPDFTool):
-    def parse(self, file_path):
-        doc = fitz.open(file_path)
-        text = "\n".join([page.get_text() for page in doc])
-        return {"text": text}
-
-class TesseractTool(AbstractPDFTool):
-    def parse(self, file_path):
-        doc = fitz.open(file_path)
-        images = [
-            Image.frombytes("RGB", page.get_pixmap().size, page.get_pixmap().samples)
-            for page in doc
-        ]
-        ocr_text = "\n".join([pytesseract.image_to_string(img) for img in images])
-        return {"text": ocr_text}
 
 class OllamaClient:
-    def __init__(self, base_url: str = "http://100.120.49.120:11434", timeout: float = 60.0):
+    _server_semaphores: Dict[str, BoundedSemaphore] = {}
+    _semaphores_lock = Lock()
+
+    def __init__(
+        self,
+        base_url: str = "http://100.120.49.120:11434",
+        timeout: float = 60.0,
+        connect_timeout: float = 5.0,
+        max_retries: int = 2,
+        backoff: float = 0.5,
+        pool_size: int = 10,
+        max_concurrency: int = 2,
+        cache: Optional[LLMCache] = None,
+        connection_check_ttl: float = 300.0,
+    ):
+        """Initialize the client.
+
+        Requests go through one pooled keep-alive ``requests.Session``, so
+        back-to-back calls reuse the connection to the server.
+
+        Args:
+            base_url: Ollama server URL
+            timeout: Default read timeout in seconds; override per call
+            connect_timeout: Connect timeout in seconds
+            max_retries: Retries for connection errors and 429/502/503/504
+            backoff: Base delay in seconds; doubles each retry, with full jitter
+            pool_size: Maximum pooled connections to the server
+            max_concurrency: Concurrent generate calls allowed per server by
+                the fan-out methods, shared by every client of the server
+            cache: Response cache (defaults to the shared on-disk cache)
+            connection_check_ttl: Seconds a passed ``test_model_connection``
+                is trusted
+        """
         self.base_url = base_url.rstrip("/")
         self.timeout = timeout
+        self.connect_timeout = connect_timeout
+        self.max_retries = max_retries
+        self.backoff = backoff
+        self.max_concurrency = max_concurrency
+        self.cache = cache if cache is not None else (get_llm_cache() if LLMCache.enabled() else None)
+        self.connection_check_ttl = connection_check_ttl
+        self._connection_checked: Dict[str, float] = {}
+        self._text_cache: "OrderedDict[tuple, tuple]" = OrderedDict()
+        self._text_cache_lock = Lock()
+        self.last_pdf_timings: Dict[str, float] = {}
+        self.last_page_methods: List[Dict[str, Any]] = []
         self.default_model = "llama3:70b"
+
+        self.session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=1, pool_maxsize=pool_size, max_retries=0)
+        self.session.mount("http://", adapter)
+        self.session.mount("https://", adapter)
+
+        self._metrics_lock = Lock()
+        self._metrics: Dict[str, Dict[str, Any]] = {}
+        self._retries = 0
         
         # Initialize PDF tools
         self.pdf_tools = {
             "fast": PyMuPDFTool(),
             "ocr": TesseractTool(),
+            "hybrid": HybridPDFTool(),
         }
 
+    def close(self) -> None:
+        """Close pooled connections."""
+        self.session.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+        return False
+
+    def _request(self, method: str, path: str, timeout: Optional[float] = None, **kwargs) -> requests.Response:
+        """Send a request with bounded retries.
+
+        Connection errors and ``RETRY_STATUSES`` are retried up to
+        ``max_retries`` times with exponential backoff and full jitter. Read
+        timeouts are not retried, since the model may still be working.
+        """
+        url = f"{self.base_url}{path}"
+        timeouts = (self.connect_timeout, timeout or self.timeout)
+        attempt = 0
+        while True:
+            try:
+                response = self.session.request(method, url, timeout=timeouts, **kwargs)
+                if response.status_code not in RETRY_STATUSES or attempt >= self.max_retries:
+                    response.raise_for_status()
+                    return response
+                response.close()
+            except requests.exceptions.ConnectionError:
+                if attempt >= self.max_retries:
+                    raise
+            attempt += 1
+            with self._metrics_lock:
+                self._retries += 1
+            time.sleep(random.uniform(0, self.backoff * (2 ** (attempt - 1))))
+
+    def _record(self, model: str, latency_ms: float, data: Optional[Dict[str, Any]] = None,
+                ok: bool = True, ttft_ms: Optional[float] = None, stopped: bool = False) -> None:
+        """Add one generate call to the per-model metrics."""
+        data = data or {}
+        with self._metrics_lock:
+            stats = self._metrics.setdefault(model, {})
+            stats["calls"] = stats.get("calls", 0) + 1
+            stats["latency_ms"] = stats.get("latency_ms", 0.0) + latency_ms
+            if not ok:
+                stats["failures"] = stats.get("failures", 0) + 1
+            stats["prompt_tokens"] = stats.get("prompt_tokens", 0) + data.get("prompt_eval_count", 0)
+            stats["completion_tokens"] = stats.get("completion_tokens", 0) + data.get("eval_count", 0)
+            if data.get("eval_duration"):
+                stats["eval_tokens"] = stats.get("eval_tokens", 0) + data.get("eval_count", 0)
+                stats["eval_ns"] = stats.get("eval_ns", 0) + data["eval_duration"]
+            if ttft_ms is not None:
+                stats["streams"] = stats.get("streams", 0) + 1
+                stats["ttft_ms"] = stats.get("ttft_ms", 0.0) + ttft_ms
+            if stopped:
+                stats["stopped_early"] = stats.get("stopped_early", 0) + 1
+
+    def get_metrics(self) -> Dict[str, Any]:
+        """Return per-model call counts, latency and token usage.
+
+        Returns:
+            dict of model -> calls, failures, avg_latency_ms, prompt_tokens,
+            completion_tokens, tokens_per_second and, for streamed calls,
+            avg_ttft_ms and stopped_early, and cache_hits under ``models``,
+            and the total ``retries``
+        """
+        with self._metrics_lock:
+            metrics = {name: dict(stats) for name, stats in self._metrics.items()}
+            summary: Dict[str, Any] = {"retries": self._retries, "models": {}}
+        for model, stats in metrics.items():
+            calls = stats.get("calls", 0)
+            eval_ns = stats.get("eval_ns", 0)
+            streams = stats.get("streams", 0)
+            summary["models"][model] = {
+                "calls": calls,
+                "failures": stats.get("failures", 0),
+                "avg_latency_ms": round(stats.get("latency_ms", 0.0) / calls, 1) if calls else 0.0,
+                "prompt_tokens": stats.get("prompt_tokens", 0),
+                "completion_tokens": stats.get("completion_tokens", 0),
+                "tokens_per_second": round(stats.get("eval_tokens", 0) / (eval_ns / 1e9), 1) if eval_ns else None,
+                "avg_ttft_ms": round(stats.get("ttft_ms", 0.0) / streams, 1) if streams else None,
+                "stopped_early": stats.get("stopped_early", 0),
+                "cache_hits": stats.get("cache_hits", 0),
+            }
+        return summary
+
     def get_models(self) -> Optional[list[str]]:
         try:
-            response = requests.get(f"{self.base_url}/api/tags", timeout=self.timeout)
-            response.raise_for_status()
+            response = self._request("GET", "/api/tags", timeout=min(self.timeout, 10.0))
             data = response.json()
             # Extract just the model names
             model_names = [model['name'] for model in data.get('models', [])]
@@ -55,12 +232,21 @@ class OllamaClient:
             return None
 
     def test_model_connection(self, model: Optional[str] = None) -> bool:
-        """Test if the model is responding with a simple prompt."""
+        """Test if the model is responding with a simple prompt.
+
+        A successful result is remembered for ``connection_check_ttl``
+        seconds, so back-to-back analyses don't re-test the model.
+        """
+        model_to_use = model or self.default_model
+        checked = self._connection_checked.get(model_to_use)
+        if checked is not None and time.monotonic() - checked < self.connection_check_ttl:
+            return True
         try:
             print(f"[🧪] Testing model connection...")
-            test_response = self.generate("Respond with 'OK' if you can hear me.", model=model)
+            test_response = self.generate("Respond with 'OK' if you can hear me.", model=model, use_cache=False)
             if test_response and ("OK" in test_response or len(test_response.strip()) > 0):
                 print(f"[✅] Model connection test successful")
+                self._connection_checked[model_to_use] = time.monotonic()
                 return True
             else:
                 print(f"[❌] Model connection test failed - no response received")
@@ -69,18 +255,191 @@ class OllamaClient:
             print(f"[❌] Model connection test failed: {e}")
             return False
 
-    def generate(self, prompt: str, model: Optional[str] = None, stream: bool = False) -> Optional[str]:
+    def _cache_key(self, model: str, prompt: str, options: Optional[Dict[str, Any]],
+                   use_cache: Optional[bool], stop: Optional[Callable[[str], bool]] = None) -> Optional[str]:
+        """Return the cache key for a request, or None if it shouldn't be cached.
+
+        By default only deterministic requests (``temperature`` 0) are cached.
+        Early-stopped responses depend on the stop predicate, so its name is
+        part of the key; anonymous predicates are never cached.
+        """
+        if self.cache is None or use_cache is False or not LLMCache.enabled():
+            return None
+        if use_cache is None and (options or {}).get("temperature") != 0:
+            return None
+        key_options = dict(options or {})
+        if stop is not None:
+            stop_name = getattr(stop, "__qualname__", "<lambda>")
+            if "<lambda>" in stop_name or "<locals>" in stop_name:
+                return None
+            key_options["_stop"] = stop_name
+        return cache_key(model, prompt, key_options, self.base_url)
+
+    def _cache_hit(self, model: str) -> None:
+        with self._metrics_lock:
+            stats = self._metrics.setdefault(model, {})
+            stats["cache_hits"] = stats.get("cache_hits", 0) + 1
+
+    def generate(self, prompt: str, model: Optional[str] = None, stream: bool = False,
+                 timeout: Optional[float] = None, stop: Optional[Callable[[str], bool]] = None,
+                 on_token: Optional[Callable[[str], None]] = None,
+                 options: Optional[Dict[str, Any]] = None, use_cache: Optional[bool] = None,
+                 cancel: Optional[Event] = None) -> Optional[str]:
+        """Generate a completion.
+
+        With ``stream=True`` (implied by ``stop``, ``on_token`` or ``cancel``)
+        the response is read chunk by chunk through :meth:`generate_stream`.
+
+        Args:
+            prompt: Prompt text
+            model: Model name (defaults to ``default_model``)
+            stream: Stream the response
+            timeout: Read timeout in seconds for this call
+            stop: Predicate on the text so far; generation stops once it is True
+            on_token: Called with every chunk as it arrives
+            options: Ollama generation options, e.g. ``{"temperature": 0}``
+            use_cache: ``False`` bypasses the response cache, ``True`` caches
+                even non-deterministic requests; by default only
+                ``temperature`` 0 requests are cached
+            cancel: Event that aborts a streamed call when set
+
+        Returns:
+            str: The response text, or None if the request failed
+        """
+        if stream or stop or on_token or cancel:
+            try:
+                chunks = []
+                for chunk in self.generate_stream(prompt, model, stop=stop, timeout=timeout,
+                                                  options=options, use_cache=use_cache, cancel=cancel):
+                    chunks.append(chunk)
+                    if on_token:
+                        on_token(chunk)
+                return "".join(chunks)
+            except requests.exceptions.RequestException as e:
+                print(f"[❌] POST /api/generate (stream) failed: {e}")
+                return None
+
+        # Use default model if none specified
+        model_to_use = model or self.default_model
+        key = self._cache_key(model_to_use, prompt, options, use_cache)
+        if key is not None:
+            cached = self.cache.get(key)
+            if cached is not None:
+                self._cache_hit(model_to_use)
+                return cached
+
+        start = time.perf_counter()
         try:
-            # Use default model if none specified
-            model_to_use = model or self.default_model
-            payload = {"model": model_to_use, "prompt": prompt, "stream": stream}
-            response = requests.post(f"{self.base_url}/api/generate", json=payload, timeout=self.timeout)
-            response.raise_for_status()
-            return response.json().get("response")
+            payload = {"model": model_to_use, "prompt": prompt, "stream": False}
+            if options:
+                payload["options"] = options
+            response = self._request("POST", "/api/generate", timeout=timeout, json=payload)
+            data = response.json()
+            self._record(model_to_use, (time.perf_counter() - start) * 1000, data)
+            text = data.get("response")
+            if key is not None and text:
+                self.cache.put(key, model_to_use, text)
+            return text
         except requests.exceptions.RequestException as e:
+            self._record(model_to_use, (time.perf_counter() - start) * 1000, ok=False)
             print(f"[❌] POST /api/generate failed: {e}")
             return None
 
+    def generate_stream(self, prompt: str, model: Optional[str] = None,
+                        stop: Optional[Callable[[str], bool]] = None,
+                        timeout: Optional[float] = None,
+                        options: Optional[Dict[str, Any]] = None,
+                        use_cache: Optional[bool] = None,
+                        cancel: Optional[Event] = None) -> Iterator[str]:
+        """Stream a completion, yielding text chunks as the model produces them.
+
+        The API answers with one JSON object per line (NDJSON). When ``stop``
+        returns True for the text received so far, or ``cancel`` is set, the
+        connection is closed, which also makes the server stop generating.
+        Time to first token is recorded in :meth:`get_metrics`. A cache hit
+        is yielded as a single chunk.
+
+        Args:
+            prompt: Prompt text
+            model: Model name (defaults to ``default_model``)
+            stop: Predicate on the accumulated text
+            timeout: Read timeout in seconds between chunks
+            options: Ollama generation options
+            use_cache: See :meth:`generate`
+            cancel: Event that aborts the stream when set
+
+        Raises:
+            requests.exceptions.RequestException: If the request fails or a
+                chunk is not valid JSON
+        """
+        model_to_use = model or self.default_model
+        key = self._cache_key(model_to_use, prompt, options, use_cache, stop)
+        if key is not None:
+            cached = self.cache.get(key)
+            if cached is not None:
+                self._cache_hit(model_to_use)
+                yield cached
+                return
+
+        start = time.perf_counter()
+        ttft_ms = None
+        final: Dict[str, Any] = {}
+        chunks = 0
+        stopped = False
+        cancelled = False
+        ok = False
+        text = ""
+        response = None
+        try:
+            payload = {"model": model_to_use, "prompt": prompt, "stream": True}
+            if options:
+                payload["options"] = options
+            response = self._request("POST", "/api/generate", timeout=timeout, json=payload, stream=True)
+            for line in response.iter_lines():
+                if cancel is not None and cancel.is_set():
+                    cancelled = True
+                    break
+                if not line:
+                    continue
+                try:
+                    data = json.loads(line)
+                except ValueError as e:
+                    # A garbled chunk fails the call like any other bad response
+                    raise requests.exceptions.RequestException(f"Malformed stream chunk: {line[:200]!r}") from e
+                if data.get("error"):
+                    raise requests.exceptions.RequestException(data["error"])
+                piece = data.get("response", "")
+                if piece:
+                    if ttft_ms is None:
+                        ttft_ms = (time.perf_counter() - start) * 1000
+                    chunks += 1
+                    text += piece
+                    yield piece
+                if data.get("done"):
+                    final = data
+                    break
+                if stop is not None and stop(text):
+                    stopped = True
+                    break
+            ok = True
+        except GeneratorExit:
+            # The caller stopped reading; that is an early stop, not a failure
+            cancelled = True
+            raise
+        finally:
+            if response is not None:
+                response.close()
+            self._record(
+                model_to_use,
+                (time.perf_counter() - start) * 1000,
+                final or {"eval_count": chunks},
+                ok=ok or cancelled,
+                ttft_ms=ttft_ms,
+                stopped=stopped or cancelled,
+            )
+        if key is not None and text and not cancelled:
+            self.cache.put(key, model_to_use, text)
+
     # PDF Processing Methods
     def extract_text_fast(self, file_path: str) -> Optional[str]:
         """Extract text from PDF using PyMuPDF (fast, text-based PDFs)."""
@@ -100,22 +459,91 @@ class OllamaClient:
             print(f"[❌] OCR text extraction failed: {e}")
             return None
 
-    def extract_text_auto(self, file_path: str) -> Optional[str]:
-        """Automatically choose the best extraction method."""
-        # Try fast extraction first
-        text = self.extract_text_fast(file_path)
-        if text and len(text.strip()) > 50:  # If we got substantial text
-            return text
-        
-        # Fall back to OCR if fast extraction didn't work well
-        print("[ℹ️] Fast extraction yielded little text, trying OCR...")
-        return self.extract_text_ocr(file_path)
+    @staticmethod
+    def _file_hash(file_path: str) -> str:
+        digest = hashlib.sha256()
+        with open(file_path, "rb") as f:
+            for block in iter(lambda: f.read(1024 * 1024), b""):
+                digest.update(block)
+        return digest.hexdigest()
+
+    def extract_text_hybrid(self, file_path: str) -> Optional[Dict[str, Any]]:
+        """Extract text page by page, OCR'ing only image-only pages.
 
-    def analyze_pdf_with_llm(self, file_path: str, prompt: str = None, model: Optional[str] = None) -> Optional[str]:
-        """Extract text from PDF and analyze it with the LLM."""
+        Returns:
+            dict with the merged ``text`` and ``pages``: one entry per page
+            with its ``method`` ("text" or "ocr"), ``density`` and ``images``
+        """
+        try:
+            result = self.pdf_tools["hybrid"].parse(file_path)
+            pages = [{k: v for k, v in page.items() if k != "text"} for page in result["pages"]]
+            return {"text": result["text"], "pages": pages}
+        except Exception as e:
+            print(f"[❌] Hybrid text extraction failed: {e}")
+            return None
+
+    def extract_text_auto(self, file_path: str, use_cache: bool = True, strategy: str = "hybrid") -> Optional[str]:
+        """Automatically choose the best extraction method.
+
+        With the default ``"hybrid"`` strategy each page is read from its text
+        layer or OCR'd depending on its text density, and the method used per
+        page is left in ``last_page_methods``. ``"document"`` makes one choice
+        for the whole file: PyMuPDF, or OCR if that yields little text.
+
+        The result is memoized per file content hash (the last
+        ``TEXT_CACHE_SIZE`` files), so the same PDF is only parsed or OCR'd
+        once per client.
+        """
+        file_hash = None
+        if use_cache:
+            try:
+                file_hash = self._file_hash(file_path)
+            except OSError:
+                file_hash = None
+            if file_hash is not None:
+                with self._text_cache_lock:
+                    cached = self._text_cache.get((file_hash, strategy))
+                    if cached is not None:
+                        self._text_cache.move_to_end((file_hash, strategy))
+                        text, self.last_page_methods = cached
+                        return text
+
+        pages: List[Dict[str, Any]] = []
+        text = None
+        if strategy == "hybrid":
+            result = self.extract_text_hybrid(file_path)
+            if result:
+                text, pages = result["text"], result["pages"]
+                ocr_count = sum(1 for page in pages if page["method"] == "ocr")
+                if ocr_count:
+                    print(f"[ℹ️] OCR'd {ocr_count} of {len(pages)} pages without a text layer")
+
+        if not text or not text.strip():
+            # Try fast extraction first
+            text = self.extract_text_fast(file_path)
+            pages = []
+            if not (text and len(text.strip()) > 50):  # If we didn't get substantial text
+                # Fall back to OCR if fast extraction didn't work well
+                print("[ℹ️] Fast extraction yielded little text, trying OCR...")
+                text = self.extract_text_ocr(file_path)
+        self.last_page_methods = pages
+
+        if file_hash is not None and text:
+            with self._text_cache_lock:
+                self._text_cache[(file_hash, strategy)] = (text, pages)
+                while len(self._text_cache) > TEXT_CACHE_SIZE:
+                    self._text_cache.popitem(last=False)
+        return text
+
+    def analyze_pdf_with_llm(self, file_path: str, prompt: str = None, model: Optional[str] = None,
+                             text: Optional[str] = None) -> Optional[str]:
+        """Extract text from PDF and analyze it with the LLM.
+
+        Pass ``text`` to reuse text that was already extracted.
+        """
         try:
             # Extract text from PDF
-            text = self.extract_text_auto(file_path)
+            text = text or self.extract_text_auto(file_path)
             if not text:
                 print("[❌] Could not extract text from PDF")
                 return None
@@ -125,16 +553,20 @@ class OllamaClient:
                 prompt = f"Analyze this document and provide a structured summary:\n\n{text[:2000]}..."  # Limit text length
             
             # Use LLM to analyze
-            return self.generate(prompt, model=model)
+            return self.generate(prompt, model=model, options=DETERMINISTIC)
             
         except Exception as e:
             print(f"[❌] PDF analysis failed: {e}")
             return None
 
-    def extract_structured_data(self, file_path: str, data_type: str = "benefits", model: Optional[str] = None) -> Optional[str]:
-        """Extract specific structured data from PDF (e.g., benefits, claims, etc.)."""
+    def extract_structured_data(self, file_path: str, data_type: str = "benefits", model: Optional[str] = None,
+                                text: Optional[str] = None) -> Optional[str]:
+        """Extract specific structured data from PDF (e.g., benefits, claims, etc.).
+
+        Pass ``text`` to reuse text that was already extracted.
+        """
         try:
-            text = self.extract_text_auto(file_path)
+            text = text or self.extract_text_auto(file_path)
             if not text:
                 return None
 
@@ -147,7 +579,7 @@ class OllamaClient:
             }
             
             prompt = prompts.get(data_type, prompts["summary"])
-            return self.generate(prompt, model=model)
+            return self.generate(prompt, model=model, options=DETERMINISTIC)
             
         except Exception as e:
             print(f"[❌] Structured data extraction failed: {e}")
@@ -167,7 +599,8 @@ class OllamaClient:
             model: Optional model to use for LLM analysis
             
         Returns:
-            str: Comprehensive analysis combining all three approaches
+            str: Comprehensive analysis combining all three approaches. Per-step
+            timings in ms are left in ``last_pdf_timings``.
         """
         try:
             print(f"[🔍] Starting comprehensive PDF analysis: {file_path}")
@@ -177,20 +610,38 @@ class OllamaClient:
                 print("[❌] Model connection test failed, aborting PDF analysis")
                 return None
             
-            # Eye 1: Extract raw text
+            timings = {}
+
+            # Eye 1: Extract raw text, once; Eyes 2 and 3 reuse it
             print("[👁️ Eye 1] Extracting raw text...")
+            start = time.perf_counter()
             raw_text = self.extract_text_auto(file_path)
+            timings["eye1_extract_ms"] = round((time.perf_counter() - start) * 1000, 1)
             if not raw_text:
                 print("[❌] Could not extract any text from PDF")
                 return None
-            
-            # Eye 2: Extract structured data
+
+            def timed(key, func, *args, **kwargs):
+                eye_start = time.perf_counter()
+                try:
+                    return func(*args, **kwargs)
+                finally:
+                    timings[key] = round((time.perf_counter() - eye_start) * 1000, 1)
+
+            # Eyes 2 and 3 are independent LLM calls; run them side by side
             print(f"[👁️ Eye 2] Extracting structured {data_type} data...")
-            structured_data = self.extract_structured_data(file_path, data_type, model)
-            
-            # Eye 3: General LLM analysis
             print("[👁️ Eye 3] Performing general LLM analysis...")
-            llm_analysis = self.analyze_pdf_with_llm(file_path, model=model)
+            with ThreadPoolExecutor(max_workers=2, thread_name_prefix="pdf-eye") as executor:
+                structured_future = executor.submit(
+                    timed, "eye2_structured_ms", self.extract_structured_data,
+                    file_path, data_type, model, text=raw_text,
+                )
+                analysis_future = executor.submit(
+                    timed, "eye3_analysis_ms", self.analyze_pdf_with_llm,
+                    file_path, model=model, text=raw_text,
+                )
+                structured_data = structured_future.result()
+                llm_analysis = analysis_future.result()
             
             # Combine all three analyses into a comprehensive prompt
             print("[🧠] Combining all analyses...")
@@ -219,8 +670,12 @@ Format your response in a clear, structured manner.
 """
             
             # Get final comprehensive analysis
+            start = time.perf_counter()
             final_analysis = self.generate(combined_prompt, model=model)
+            timings["synthesis_ms"] = round((time.perf_counter() - start) * 1000, 1)
+            self.last_pdf_timings = timings
             
+            print("[⏱️] " + ", ".join(f"{key}: {value:.0f}" for key, value in timings.items()))
             print("[✅] Comprehensive analysis complete!")
             return final_analysis
             
@@ -228,14 +683,85 @@ Format your response in a clear, structured manner.
             print(f"[❌] Comprehensive PDF analysis failed: {e}")
             return None
 
-    def analyze_playwright_selector(self, default_selector: str, html_snippet: str, ranking_model: Optional[str] = None) -> Dict[str, Any]:
+    def _ask_for_selector(self, model: str, prompt: str, cancel: Optional[Event] = None,
+                          timeout: Optional[float] = None) -> Dict[str, Any]:
+        """Ask one model for a selector and return its ``model_results`` entry.
+
+        Runs under the server's concurrency semaphore. Setting ``cancel``
+        makes a queued call give up and a running one stop streaming.
+        """
+        start = time.perf_counter()
+        semaphore = self._server_semaphore()
+        while not semaphore.acquire(timeout=0.1):
+            if cancel is not None and cancel.is_set():
+                return {"selector": None, "status": "cancelled", "error": "Quorum reached before start",
+                        "timestamp": datetime.now().isoformat()}
+        try:
+            if cancel is not None and cancel.is_set():
+                return {"selector": None, "status": "cancelled", "error": "Quorum reached before start",
+                        "timestamp": datetime.now().isoformat()}
+            print(f"[🧪] Testing model: {model}")
+            # Generate selector with this model
+            selector = self.generate(prompt, model=model, stop=first_line_complete, timeout=timeout,
+                                     options=DETERMINISTIC, cancel=cancel)
+            duration_ms = round((time.perf_counter() - start) * 1000, 1)
+
+            if cancel is not None and cancel.is_set() and not (selector and first_line_complete(selector)):
+                return {"selector": None, "status": "cancelled", "error": "Quorum reached",
+                        "duration_ms": duration_ms, "timestamp": datetime.now().isoformat()}
+            if selector and selector.strip():
+                # Clean up the response (remove extra whitespace, quotes, etc.)
+                selector = first_meaningful_line(selector).strip('`').strip('"').strip("'")
+                print(f"[✅] {model}: {selector}")
+                return {"selector": selector, "status": "success", "duration_ms": duration_ms,
+                        "timestamp": datetime.now().isoformat()}
+            print(f"[❌] {model}: No response")
+            return {"selector": None, "status": "failed", "error": "No response generated",
+                    "duration_ms": duration_ms, "timestamp": datetime.now().isoformat()}
+        except Exception as e:
+            print(f"[❌] {model}: Error - {str(e)}")
+            return {"selector": None, "status": "error", "error": str(e),
+                    "timestamp": datetime.now().isoformat()}
+        finally:
+            semaphore.release()
+
+    def _server_semaphore(self) -> BoundedSemaphore:
+        """Semaphore limiting concurrent generate calls to this client's server."""
+        with OllamaClient._semaphores_lock:
+            semaphore = OllamaClient._server_semaphores.get(self.base_url)
+            if semaphore is None:
+                semaphore = BoundedSemaphore(self.max_concurrency)
+                OllamaClient._server_semaphores[self.base_url] = semaphore
+            return semaphore
+
+    def analyze_playwright_selector(
+        self,
+        default_selector: str,
+        html_snippet: str,
+        ranking_model: Optional[str] = None,
+        concurrent: bool = True,
+        quorum: Optional[int] = None,
+        model_timeout: Optional[float] = None,
+        total_timeout: Optional[float] = SELECTOR_TOTAL_TIMEOUT,
+    ) -> Dict[str, Any]:
         """
         Analyze HTML snippet to find Playwright selectors using multiple models.
+
+        In concurrent mode the models are asked in parallel, at most
+        ``max_concurrency`` at a time per server. Once ``quorum`` selectors
+        are in (or ``total_timeout`` passes with at least one), the remaining
+        models are cancelled and ranking starts with what has arrived.
         
         Args:
             default_selector: The default selector that was already set
             html_snippet: HTML code snippet containing the target element
             ranking_model: Model to use for ranking (defaults to self.default_model)
+            concurrent: Ask the models in parallel instead of one by one
+            quorum: Number of selectors to wait for (defaults to a majority
+                of the models)
+            model_timeout: Read timeout in seconds for each model's call
+            total_timeout: Seconds to wait for the quorum before ranking
+                (``None`` waits indefinitely)
             
         Returns:
             Dict containing analysis results, rankings, and logs
@@ -279,45 +805,54 @@ Return ONLY the selector string, nothing else.
 Do not include any other text or comments in your response
 """
             
-            # Test each model and collect results
+            # Ask each model and collect results
             model_results = {}
             successful_models = []
-            
-            for model in models:
-                try:
-                    print(f"[🧪] Testing model: {model}")
-                    
-                    # Generate selector with this model
-                    selector = self.generate(analysis_prompt, model=model)
-                    
-                    if selector:
-                        # Clean up the response (remove extra whitespace, quotes, etc.)
-                        selector = selector.strip().strip('"').strip("'")
-                        
-                        model_results[model] = {
-                            "selector": selector,
-                            "status": "success",
-                            "timestamp": datetime.now().isoformat()
-                        }
+            needed = min(quorum or len(models) // 2 + 1, len(models))
+
+            if not concurrent:
+                for model in models:
+                    model_results[model] = self._ask_for_selector(model, analysis_prompt, timeout=model_timeout)
+                    if model_results[model]["status"] == "success":
                         successful_models.append(model)
-                        print(f"[✅] {model}: {selector}")
-                    else:
-                        model_results[model] = {
-                            "selector": None,
-                            "status": "failed",
-                            "error": "No response generated",
-                            "timestamp": datetime.now().isoformat()
-                        }
-                        print(f"[❌] {model}: No response")
-                        
-                except Exception as e:
-                    model_results[model] = {
+            else:
+                cancel = Event()
+                executor = ThreadPoolExecutor(
+                    max_workers=min(len(models), self.max_concurrency), thread_name_prefix="selector"
+                )
+                futures = {
+                    executor.submit(self._ask_for_selector, model, analysis_prompt, cancel, model_timeout): model
+                    for model in models
+                }
+                try:
+                    for future in as_completed(futures, timeout=total_timeout):
+                        model = futures[future]
+                        model_results[model] = future.result()
+                        if model_results[model]["status"] == "success":
+                            successful_models.append(model)
+                            if len(successful_models) >= needed:
+                                break
+                except FuturesTimeout:
+                    print(f"[⏱️] {len(successful_models)} of {needed} selectors in after {total_timeout}s")
+                finally:
+                    # Cancel stragglers; running calls stop at their next chunk
+                    cancel.set()
+                    executor.shutdown(wait=False, cancel_futures=True)
+                for model in models:
+                    model_results.setdefault(model, {
                         "selector": None,
-                        "status": "error",
-                        "error": str(e),
+                        "status": "cancelled",
+                        "error": "Quorum reached" if len(successful_models) >= needed else "Timed out",
                         "timestamp": datetime.now().isoformat()
-                    }
-                    print(f"[❌] {model}: Error - {str(e)}")
+                    })
+                if len(successful_models) < needed:
+                    print(f"[⚠️] Ranking {len(successful_models)} selectors, quorum was {needed}")
+                # Number the candidates in model order so the ranking prompt is repeatable
+                successful_models.sort(key=models.index)
+
+            if not successful_models:
+                print("[❌] No model produced a selector")
+                return {"error": "No selectors generated", "model_results": model_results}
             
             # Create ranking prompt
             ranking_model_to_use = ranking_model or self.default_model
@@ -349,15 +884,18 @@ Return ONLY a JSON array with the ranking, like: [3, 1, 2, 4] where the numbers
 """
             
             # Get ranking from the ranking model
-            ranking_response = self.generate(ranking_prompt, model=ranking_model_to_use)
+            ranking_response = self.generate(ranking_prompt, model=ranking_model_to_use,
+                                             stop=json_array_complete, options=DETERMINISTIC)
             ranking = None
             
             if ranking_response:
                 try:
                     # Try to parse the ranking response
                     ranking_text = ranking_response.strip()
-                    if ranking_text.startswith('[') and ranking_text.endswith(']'):
-                        ranking = json.loads(ranking_text)
+                    # Streaming stops at the closing bracket, so slice out the array
+                    array_start, array_end = ranking_text.find('['), ranking_text.rfind(']')
+                    if 0 <= array_start < array_end:
+                        ranking = json.loads(ranking_text[array_start:array_end + 1])
                     else:
                         # Try to extract numbers from the response
                         import re
@@ -375,6 +913,8 @@ Return ONLY a JSON array with the ranking, like: [3, 1, 2, 4] where the numbers
                 "default_selector": default_selector,
                 "models_tested": len(models),
                 "successful_models": len(successful_models),
+                "concurrent": concurrent,
+                "quorum": needed,
                 "model_results": model_results,
                 "ranking_model": ranking_model_to_use,
                 "ranking": ranking,
@@ -0,0 +1,95 @@
+#!/usr/bin/env python3
+"""
+Regression checks for parse_claim_to_json.
+
+Runs the parser over the text of the bundled era.pdf and over layouts the
+synthetic benchmark cannot produce, and compares it with the old
+line-by-line parser kept in benchmark_era_parser.py. Exits with status 1 on
+any failure.
+
+    python core/ai_tools/test_era_parser.py
+"""
+
+import os
+import sys
+
+# Add the current directory to the Python path
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from gateway_eob_scraper import extract_all_data, separate_claims, parse_claim_to_json
+from benchmark_era_parser import compare_parsers, parse_claim_to_json_legacy
+
+SERVICE_LINE = ("12/13/2024 12/13/2024 1639335516 1 S0620 $115.00 $98.00 $0.00 $0.00 "
+                "$0.00 $0.00 $17.00 CO-45 $98.00 N381")
+TOTALS_LINE = "SERVICE LINE TOTALS: $115.00 $98.00 $0.00 $0.00 $0.00 $0.00 $17.00 $98.00"
+
+# A column header naming a header label, and a header label after the totals
+LAYOUT_CLAIM = "\n".join([
+    "Patient Name: JANE DOE Member Identification #: 123",
+    "Claim ID: 2412161576096 Patient Account Number: 42",
+    "Service Line Information",
+    "Begin Date End Date Rendering NPI Units Proc Code Billed Allowed",
+    SERVICE_LINE,
+    TOTALS_LINE,
+    "Payer Claim Control # / ICN#: 20241217047R",
+    "",
+])
+
+# A service block with no totals line, followed by a header label
+NO_TOTALS_CLAIM = "\n".join([
+    "Patient Name: JANE DOE Member Identification #: 123",
+    "Claim ID: 2412161576096 Patient Account Number: 42",
+    "Service Line Information",
+    SERVICE_LINE,
+    "Payer Claim Control # / ICN#: 20241217047R",
+    "",
+])
+
+
+def check_layout_cases():
+    """Service lines survive label-like column headers; labels after the service block are read."""
+    print("\n🧪 Checking layout cases...")
+    claim = parse_claim_to_json(LAYOUT_CLAIM)
+    legacy = parse_claim_to_json_legacy(LAYOUT_CLAIM)
+    failures = []
+    if len(claim["service_lines"]) != 1 or claim["service_lines"] != legacy["service_lines"]:
+        failures.append(f"service lines: {claim['service_lines']} (legacy: {legacy['service_lines']})")
+    if claim["totals"] != legacy["totals"]:
+        failures.append(f"totals: {claim['totals']} (legacy: {legacy['totals']})")
+    if claim["claim_info"].get("payer_claim_control") != "20241217047R":
+        failures.append(f"payer_claim_control after totals: {claim['claim_info'].get('payer_claim_control')}")
+    claim = parse_claim_to_json(NO_TOTALS_CLAIM)
+    if len(claim["service_lines"]) != 1:
+        failures.append(f"service lines without totals: {claim['service_lines']}")
+    if claim["claim_info"].get("payer_claim_control") != "20241217047R":
+        failures.append(f"payer_claim_control without totals: {claim['claim_info'].get('payer_claim_control')}")
+    for failure in failures:
+        print(f"❌ {failure}")
+    if not failures:
+        print("✅ Layout cases parsed like the old parser")
+    return not failures
+
+
+def check_era_pdf(pdf_path):
+    """Every field the old parser reads from era.pdf comes out the same."""
+    print(f"\n🧪 Checking {os.path.basename(pdf_path)}...")
+    claims = [c for c in separate_claims(extract_all_data(pdf_path)) if c.strip()]
+    identical, superset, different = compare_parsers(claims)
+    parsed = [parse_claim_to_json(c) for c in claims]
+    service_lines = sum(len(c["service_lines"]) for c in parsed if c)
+    print(f"📄 {len(claims)} claim blocks, {sum(1 for c in parsed if c)} claims, {service_lines} service lines")
+    if different:
+        print(f"❌ {different} claims parsed differently from the old parser")
+        return False
+    print(f"✅ identical: {identical}, extra fields only: {superset}")
+    return True
+
+
+if __name__ == "__main__":
+    print("🚀 ERA Parser Regression Checks")
+    print("=" * 40)
+
+    ok = check_layout_cases()
+    ok = check_era_pdf(os.path.join(os.path.dirname(os.path.abspath(__file__)), "era.pdf")) and ok
+
+    sys.exit(0 if ok else 1)
@@ -0,0 +1,103 @@
+"""asyncio-native counterpart of ``BasePage``.
+
+Page objects built on ``AsyncBasePage`` use ``playwright.async_api`` so one
+event loop can drive many pages at once. Independent waits on separate tabs
+can be fanned out with :meth:`AsyncBasePage.gather`::
+
+    demographics_tab = await rev.new_tab()
+    insurance_tab = await rev.new_tab()
+    await rev.gather(
+        scrape_demographics(demographics_tab, patient),
+        scrape_insurance(insurance_tab, patient),
+    )
+"""
+
+from typing import Any, Awaitable, List, Optional
+import asyncio
+
+from playwright.async_api import Page
+from bs4 import BeautifulSoup
+
+from core.base import PatientContext
+from core.logger import Logger
+
+
+class AsyncBasePage:
+    def __init__(self, page: Page, logger: Logger, context: Optional[PatientContext] = None):
+        self.page = page
+        self.logger = logger
+        self.context = context
+
+    async def set_context(self, context: PatientContext):
+        self.context = context
+        if self.context and self.context.cookies:
+            await self.page.context.add_cookies(self.context.cookies)
+
+    def _validate_patient_required(self):
+        """Warns if no patient context is available but allows execution to continue"""
+        if not self.context or not getattr(self.context, 'patient', None):
+            self.logger.log("WARNING: Running without patient context.")
+
+    async def get_page_soup(self) -> BeautifulSoup:
+        """Get the current page's DOM as a BeautifulSoup object."""
+        return BeautifulSoup(await self.page.content(), 'html.parser')
+
+    async def take_screenshot(self, error_message: Optional[str] = None) -> None:
+        """Take a screenshot and save it to a file.
+
+        Args:
+            error_message: Optional message describing the error. If not provided,
+                          the screenshot will be saved with just a timestamp.
+        """
+        try:
+            screenshot_path = self.logger.get_screenshot_path()
+            await self.page.screenshot(path=str(screenshot_path))
+            if error_message:
+                self.logger.log(f"Screenshot saved as {screenshot_path} for error: {error_message}")
+            else:
+                self.logger.log(f"Screenshot saved as {screenshot_path}")
+        except Exception as e:
+            self.logger.log(f"Failed to take screenshot: {str(e)}")
+
+    async def wait_for_network_idle(self, timeout: int = 30000) -> bool:
+        """Wait until the page's network activity has settled."""
+        try:
+            await self.page.wait_for_load_state("networkidle", timeout=timeout)
+            return True
+        except Exception as e:
+            self.logger.log_error(f"Network idle wait failed: {str(e)}")
+            return False
+
+    async def new_tab(self, url: Optional[str] = None) -> Page:
+        """Open another tab in this page's browser context.
+
+        Tabs share cookies with the session page, so they are already logged
+        in and can be driven concurrently with it.
+        """
+        tab = await self.page.context.new_page()
+        if url:
+            await tab.goto(url)
+        return tab
+
+    @staticmethod
+    async def gather(*aws: Awaitable[Any], limit: Optional[int] = None,
+                     return_exceptions: bool = False) -> List[Any]:
+        """Run awaitables concurrently, optionally at most ``limit`` at a time.
+
+        Args:
+            *aws: Coroutines or tasks to run
+            limit: Maximum number running at once. ``None`` runs them all.
+            return_exceptions: Passed through to ``asyncio.gather``
+
+        Returns:
+            List of results in the order the awaitables were given
+        """
+        if limit:
+            semaphore = asyncio.Semaphore(limit)
+
+            async def bounded(aw):
+                async with semaphore:
+                    return await aw
+
+            aws = tuple(bounded(aw) for aw in aws)
+        return await asyncio.gather(*aws, return_exceptions=return_exceptions)
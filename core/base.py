@@ -4,6 +4,7 @@ from datetime import datetime
 from threading import Lock
 from playwright.sync_api import Page
 from core.logger import Logger
+from core.snapshots import SnapshotRecorder, get_snapshot_recorder
 import os
 import time
 from bs4 import BeautifulSoup
@@ -215,10 +216,17 @@ class PatientContext:
         self.cookies = new_cookies
 
 class BasePage:
+    # Set AGENT_FIXED_DELAYS=1 to fall back to the old fixed sleeps in settle().
+    # None reads the variable on every call, so a value loaded from .env after
+    # import still applies; True/False overrides it.
+    use_fixed_delays: Optional[bool] = None
+
     def __init__(self, page: Page, logger: Logger, context: Optional[PatientContext] = None):
         self.page = page
         self.logger = logger
         self.context = context
+        # Total milliseconds spent in the wait helpers below
+        self.wait_time_ms = 0.0
     
     def set_context(self, context: PatientContext):
         self.context = context
@@ -235,8 +243,12 @@ class BasePage:
         return BeautifulSoup(self.page.content(), 'html.parser')
 
     def take_screenshot(self, error_message: Optional[str] = None) -> None:
-        """Take a screenshot and save it to a file.
-        
+        """Record a failure snapshot of the current page.
+
+        The first failure with a given signature (page + error message) gets a
+        full-page screenshot; repeats only add a DOM snapshot to the ring
+        buffer. Files are written in the background by ``core.snapshots``.
+
         Args:
             error_message: Optional message describing the error. If not provided,
                           the screenshot will be saved with just a timestamp.
@@ -244,102 +256,206 @@ class BasePage:
         try:
             # Get screenshot path from logger
             screenshot_path = self.logger.get_screenshot_path()
-            # Take screenshot
-            self.page.screenshot(path=str(screenshot_path))
-            if error_message:
-                self.logger.log(f"Screenshot saved as {screenshot_path} for error: {error_message}")
+            if not SnapshotRecorder.enabled():
+                self.page.screenshot(path=str(screenshot_path))
+                result = {"screenshot_path": screenshot_path, "duplicate": False}
             else:
-                self.logger.log(f"Screenshot saved as {screenshot_path}")
+                result = get_snapshot_recorder().capture(self.page, error_message, screenshot_path)
+
+            if result["duplicate"]:
+                self.logger.log(f"Failure {result['signature']} seen {result['count']} times, "
+                                f"skipping screenshot for error: {error_message}")
+            elif not result.get("screenshot_path"):
+                self.logger.log_error(f"Failed to capture screenshot for error: {error_message}")
+            elif error_message:
+                self.logger.log(f"Screenshot saved as {result.get('screenshot_path')} for error: {error_message}")
+            else:
+                self.logger.log(f"Screenshot saved as {result.get('screenshot_path')}")
         except Exception as e:
             self.logger.log(f"Failed to take screenshot: {str(e)}")
 
     def save_page_state(self, name: str) -> None:
-        """Save both a screenshot and HTML soup of the current page state.
-        
+        """Save a full-page screenshot and the page HTML.
+
+        ``config/debug/<name>.html`` is written before this returns;
+        ``config/debug/<name>.png`` is written in the background.
+
         Args:
             name: Base name for the saved files (without extension)
         """
         try:
-            self.logger.log(f"[DEBUG] Starting save_page_state for {name}")
-            
-            # Create rev_map/debug folder if it doesn't exist
             debug_dir = os.path.join('config', 'debug')
-            self.logger.log(f"[DEBUG] Creating debug directory: {debug_dir}")
-            os.makedirs(debug_dir, exist_ok=True)
-            
-            # Scroll to capture full page content
-            self.logger.log("[DEBUG] Scrolling to capture full page content")
-            try:
-                # Get page height
-                page_height = self.page.evaluate("document.documentElement.scrollHeight")
-                viewport_height = self.page.evaluate("window.innerHeight")
-                
-                # Scroll to bottom
-                self.page.evaluate("window.scrollTo(0, document.documentElement.scrollHeight)")
-                # Wait for any lazy-loaded content
-                self.page.wait_for_timeout(1000)
-                # Scroll back to top
-                self.page.evaluate("window.scrollTo(0, 0)")
-                self.page.wait_for_timeout(500)
-            except Exception as e:
-                self.logger.log_error(f"[DEBUG] Scrolling failed: {str(e)}")
-            
-            # Save screenshot with timeout and error handling
-            screenshot_path = os.path.join(debug_dir, f"{name}.png")
-            self.logger.log(f"[DEBUG] Saving screenshot to: {screenshot_path}")
-            try:
-                # Try to take screenshot immediately with a short timeout
-                self.logger.log("[DEBUG] Attempting immediate screenshot")
-                self.page.screenshot(path=screenshot_path, timeout=3000, full_page=True)
-                self.logger.log("[DEBUG] Screenshot saved successfully")
-            except Exception as e:
-                self.logger.log_error(f"[DEBUG] Immediate screenshot failed: {str(e)}")
-                # Try alternative screenshot method
-                try:
-                    self.logger.log("[DEBUG] Attempting alternative screenshot method")
-                    self.page.screenshot(path=screenshot_path, full_page=True, timeout=3000)
-                    self.logger.log("[DEBUG] Alternative screenshot saved successfully")
-                except Exception as e2:
-                    self.logger.log_error(f"[DEBUG] Alternative screenshot also failed: {str(e2)}")
-                    # Try one last time with a different approach
-                    try:
-                        self.logger.log("[DEBUG] Attempting final screenshot method")
-                        # Force a small wait to let any animations settle
-                        self.page.wait_for_timeout(1000)
-                        self.page.screenshot(path=screenshot_path, timeout=3000)
-                        self.logger.log("[DEBUG] Final screenshot attempt successful")
-                    except Exception as e3:
-                        self.logger.log_error(f"[DEBUG] All screenshot attempts failed: {str(e3)}")
-                        self.logger.log("[DEBUG] Continuing without screenshot")
-            
-            # Save HTML soup
-            self.logger.log("[DEBUG] Getting page soup")
-            # Get the full HTML content after scrolling
-            html_content = self.page.evaluate("document.documentElement.outerHTML")
-            soup = BeautifulSoup(html_content, 'html.parser')
-            html_path = os.path.join(debug_dir, f"{name}.html")
-            self.logger.log(f"[DEBUG] Saving HTML to: {html_path}")
-            with open(html_path, 'w', encoding='utf-8') as f:
-                f.write(str(soup.prettify()))
-            
-            self.logger.log(f"Saved page state to {debug_dir}/{name}.*")
-            
+            paths = get_snapshot_recorder().save_state(self.page, name, debug_dir)
+            self.logger.log(f"Saved page state to {debug_dir}/{name}.* ({', '.join(paths) or 'nothing captured'})")
         except Exception as e:
             self.logger.log_error(f"Failed to save page state: {str(e)}")
             self.logger.log_error(f"Error type: {type(e).__name__}")
             self.take_screenshot("Failed to save page state")
             raise
 
-    def save_element_context(self, selector: str, name: str = None, context_lines: int = 5) -> Dict[str, Any]:
+    # Finds the element and its context. In scoped mode the search for similar
+    # elements walks at most maxScan nodes under the closest existing ancestor
+    # (the longest prefix of the selector that still matches) and HTML is
+    # clipped to maxChars; unscoped it scans the whole document.
+    _ELEMENT_CONTEXT_JS = """
+    ({selector, scoped, maxScan, maxCandidates, maxChars}) => {
+        const clip = (html) => (html || '').length > maxChars
+            ? html.slice(0, maxChars) + '<!-- truncated -->' : (html || '');
+        const query = (sel) => { try { return document.querySelector(sel); } catch (e) { return null; } };
+        const describe = (el) => ({
+            tag: el.tagName,
+            id: el.id,
+            className: typeof el.className === 'string' ? el.className : '',
+            textContent: (el.textContent || '').trim().substring(0, 100),
+            outerHTML: clip(el.outerHTML)
+        });
+
+        // Split into compound selectors, ignoring combinators inside [] () and quotes
+        const parts = [];
+        let cur = '', depth = 0, quote = null;
+        for (const ch of selector) {
+            if (quote) { cur += ch; if (ch === quote) quote = null; continue; }
+            if (ch === '"' || ch === "'") { quote = ch; cur += ch; continue; }
+            if (ch === '[' || ch === '(') depth++;
+            if (ch === ']' || ch === ')') depth--;
+            if (depth === 0 && (/\\s/.test(ch) || ch === '>' || ch === '+' || ch === '~')) {
+                if (cur) parts.push(cur);
+                cur = '';
+                continue;
+            }
+            cur += ch;
+        }
+        if (cur) parts.push(cur);
+
+        const findSimilar = (scope, hints, exclude) => {
+            const walker = document.createTreeWalker(scope, NodeFilter.SHOW_ELEMENT);
+            const scored = [];
+            let scanned = 0;
+            for (let el = walker.nextNode(); el && scanned < maxScan; el = walker.nextNode()) {
+                scanned++;
+                if (el === exclude) continue;
+                let score = 0;
+                if (hints.tag && el.tagName.toLowerCase() === hints.tag) score += 1;
+                if (hints.id && el.id === hints.id) score += 3;
+                for (const c of hints.classes) if (el.classList.contains(c)) score += 1;
+                for (const a of hints.attrs) if (el.hasAttribute(a)) score += 1;
+                if (hints.text && (el.textContent || '').includes(hints.text)) score += 2;
+                if (score > 0) scored.push([score, el]);
+            }
+            scored.sort((a, b) => b[0] - a[0]);
+            return {scanned, elements: scored.slice(0, maxCandidates).map(([, el]) => describe(el))};
+        };
+
+        try {
+            const element = query(selector);
+            if (!element) {
+                let ancestor = null, ancestorSelector = null;
+                for (let i = parts.length - 1; i > 0 && !ancestor; i--) {
+                    ancestorSelector = parts.slice(0, i).join(' ');
+                    ancestor = query(ancestorSelector);
+                }
+                const last = parts[parts.length - 1] || '';
+                const hints = {
+                    tag: (last.match(/^[a-zA-Z][\\w-]*/) || [null])[0],
+                    id: (last.match(/#([\\w-]+)/) || [])[1],
+                    classes: (last.match(/\\.[\\w-]+/g) || []).map(c => c.slice(1)),
+                    attrs: Array.from(last.matchAll(/\\[([\\w:-]+)/g)).map(m => m[1]),
+                    text: (selector.match(/(?:has-text\\(|text=)\\s*["']?([^"')]+)/) || [])[1]
+                };
+                const scope = (scoped && ancestor) || document.body;
+                const similar = findSimilar(scope, hints, null);
+                return {
+                    found: false,
+                    error: 'Element not found',
+                    ancestorSelector: ancestor ? ancestorSelector : null,
+                    nearbyHTML: ancestor ? clip(ancestor.outerHTML) : '',
+                    scanned: similar.scanned,
+                    similar_elements: similar.elements
+                };
+            }
+
+            let parentContext = '';
+            let current = element.parentElement;
+            for (let level = 0; current && level < (scoped ? 1 : 3); level++) {
+                parentContext = clip(current.outerHTML) + '\\n' + parentContext;
+                current = current.parentElement;
+            }
+            const siblings = Array.from(element.parentElement?.children || []);
+            const siblingContext = (scoped ? siblings.slice(0, 20) : siblings)
+                .map(sibling => clip(sibling.outerHTML)).join('\\n');
+
+            const hints = {
+                tag: element.tagName.toLowerCase(),
+                id: element.id,
+                classes: Array.from(element.classList),
+                attrs: [],
+                text: null
+            };
+            const scope = scoped
+                ? (element.parentElement?.parentElement || element.parentElement || document.body)
+                : document.body;
+            const similar = findSimilar(scope, hints, element);
+
+            return {
+                found: true,
+                elementHTML: clip(element.outerHTML),
+                parentContext: parentContext,
+                siblingContext: siblingContext,
+                scanned: similar.scanned,
+                similar_elements: similar.elements,
+                elementInfo: {
+                    tag: element.tagName,
+                    id: element.id,
+                    className: typeof element.className === 'string' ? element.className : '',
+                    attributes: Array.from(element.attributes).map(attr => {
+                        return { name: attr.name, value: attr.value };
+                    })
+                }
+            };
+        } catch (error) {
+            return {
+                found: false,
+                error: error.message,
+                similar_elements: []
+            };
+        }
+    }
+    """
+
+    def _full_page_html(self, limit: int = 10000) -> str:
+        """Return the first ``limit`` characters of the prettified page HTML"""
+        soup = BeautifulSoup(self.page.content(), 'html.parser')
+        return str(soup.prettify())[:limit]
+
+    def save_element_context(
+        self,
+        selector: str,
+        name: str = None,
+        context_lines: int = 5,
+        scoped: bool = True,
+        include_full_page: bool = False,
+        max_scan: int = 2000,
+        max_chars: int = 20000,
+    ) -> Dict[str, Any]:
         """Save HTML context around a specific element when a selector fails.
         
         This function captures the HTML snippet around the target element, including
         parent and sibling elements, to help debug selector issues.
+
+        By default the capture is scoped: similar elements are looked for near
+        the closest ancestor the selector still matches (by tag, id, class,
+        attribute and text), at most ``max_scan`` nodes are visited and no
+        full-page HTML is included. Pass ``scoped=False`` to scan the whole
+        document and ``include_full_page=True`` to add the prettified page.
         
         Args:
             selector: The Playwright selector that failed
             name: Base name for the saved files (defaults to 'element_context')
             context_lines: Number of lines of context to capture around the element
+            scoped: Limit the search to the element's neighbourhood
+            include_full_page: Add the first 10k characters of the prettified page
+            max_scan: Maximum nodes visited when looking for similar elements
+            max_chars: Maximum characters kept per captured HTML fragment
             
         Returns:
             Dict containing the captured HTML snippet and metadata
@@ -354,85 +470,14 @@ class BasePage:
             debug_dir = os.path.join('config', 'debug')
             os.makedirs(debug_dir, exist_ok=True)
             
-            # Get the full page HTML
-            html_content = self.page.evaluate("document.documentElement.outerHTML")
-            soup = BeautifulSoup(html_content, 'html.parser')
-            
-            # Try to find the element using the selector
             try:
-                # Use JavaScript to find the element and get its context
-                js_code = f"""
-                (() => {{
-                    try {{
-                        const element = document.querySelector('{selector}');
-                        if (!element) {{
-                            return {{
-                                found: false,
-                                error: 'Element not found',
-                                similar_elements: []
-                            }};
-                        }}
-                        
-                        // Get the element's outer HTML
-                        const elementHTML = element.outerHTML;
-                        
-                        // Get parent context (up to 3 levels)
-                        let parentContext = '';
-                        let current = element.parentElement;
-                        let level = 0;
-                        while (current && level < 3) {{
-                            parentContext = current.outerHTML + '\\n' + parentContext;
-                            current = current.parentElement;
-                            level++;
-                        }}
-                        
-                        // Get sibling context
-                        const siblings = Array.from(element.parentElement?.children || []);
-                        const siblingContext = siblings.map(sibling => sibling.outerHTML).join('\\n');
-                        
-                        // Find similar elements (same tag name or similar attributes)
-                        const similarElements = Array.from(document.querySelectorAll('*')).filter(el => {{
-                            if (el === element) return false;
-                            if (el.tagName === element.tagName) return true;
-                            if (el.className && element.className && el.className === element.className) return true;
-                            if (el.id && element.id && el.id === element.id) return true;
-                            return false;
-                        }}).slice(0, 5).map(el => {{
-                            return {{
-                                tag: el.tagName,
-                                id: el.id,
-                                className: el.className,
-                                textContent: el.textContent?.substring(0, 100),
-                                outerHTML: el.outerHTML
-                            }};
-                        }});
-                        
-                        return {{
-                            found: true,
-                            elementHTML: elementHTML,
-                            parentContext: parentContext,
-                            siblingContext: siblingContext,
-                            similar_elements: similarElements,
-                            elementInfo: {{
-                                tag: element.tagName,
-                                id: element.id,
-                                className: element.className,
-                                attributes: Array.from(element.attributes).map(attr => {{
-                                    return {{ name: attr.name, value: attr.value }};
-                                }})
-                            }}
-                        }};
-                    }} catch (error) {{
-                        return {{
-                            found: false,
-                            error: error.message,
-                            similar_elements: []
-                        }};
-                    }}
-                }})();
-                """
-                
-                result = self.page.evaluate(js_code)
+                result = self.page.evaluate(self._ELEMENT_CONTEXT_JS, {
+                    "selector": selector,
+                    "scoped": scoped,
+                    "maxScan": max_scan if scoped else 10 ** 9,
+                    "maxCandidates": 5,
+                    "maxChars": max_chars if scoped else 10 ** 9,
+                })
                 
                 if not result.get('found', False):
                     # Element not found, try to find similar elements
@@ -443,9 +488,13 @@ class BasePage:
                         "timestamp": datetime.now().isoformat(),
                         "selector": selector,
                         "error": result.get('error', 'Element not found'),
-                        "similar_elements": result.get('similar_elements', []),
-                        "full_page_html": str(soup.prettify())[:10000]  # First 10k chars for context
+                        "ancestor_selector": result.get('ancestorSelector'),
+                        "nearby_html": result.get('nearbyHTML', ''),
+                        "nodes_scanned": result.get('scanned', 0),
+                        "similar_elements": result.get('similar_elements', [])
                     }
+                    if include_full_page:
+                        context_data["full_page_html"] = self._full_page_html()
                     
                     context_path = os.path.join(debug_dir, f"{name}_context.json")
                     with open(context_path, 'w', encoding='utf-8') as f:
@@ -463,8 +512,11 @@ class BasePage:
                     "element_html": result.get('elementHTML', ''),
                     "parent_context": result.get('parentContext', ''),
                     "sibling_context": result.get('siblingContext', ''),
+                    "nodes_scanned": result.get('scanned', 0),
                     "similar_elements": result.get('similar_elements', [])
                 }
+                if include_full_page:
+                    context_data["full_page_html"] = self._full_page_html()
                 
                 # Save context data
                 context_path = os.path.join(debug_dir, f"{name}_context.json")
@@ -494,14 +546,13 @@ class BasePage:
                 try:
                     screenshot_path = os.path.join(debug_dir, f"{name}_screenshot.png")
                     # Try to take a screenshot of the element if it's visible
-                    element = self.page.locator(selector)
-                    if element.is_visible(timeout=1000):
-                        element.screenshot(path=screenshot_path)
-                        context_data["screenshot_path"] = screenshot_path
+                    element = self.page.locator(selector).first
+                    if element.is_visible():
+                        element.screenshot(path=screenshot_path, timeout=3000)
                     else:
-                        # Take full page screenshot if element not visible
-                        self.page.screenshot(path=screenshot_path, full_page=True)
-                        context_data["screenshot_path"] = screenshot_path
+                        # Fall back to the page; full height only when asked for
+                        self.page.screenshot(path=screenshot_path, full_page=include_full_page, timeout=3000)
+                    context_data["screenshot_path"] = screenshot_path
                 except Exception as e:
                     self.logger.log_error(f"[DEBUG] Screenshot failed: {str(e)}")
                 
@@ -517,9 +568,13 @@ class BasePage:
                 error_data = {
                     "timestamp": datetime.now().isoformat(),
                     "selector": selector,
-                    "error": str(e),
-                    "full_page_html": str(soup.prettify())[:10000]
+                    "error": str(e)
                 }
+                if include_full_page:
+                    try:
+                        error_data["full_page_html"] = self._full_page_html()
+                    except Exception:
+                        pass
                 
                 error_path = os.path.join(debug_dir, f"{name}_error.json")
                 with open(error_path, 'w', encoding='utf-8') as f:
@@ -547,6 +602,123 @@ class BasePage:
             self.logger.log_error(f"Network idle wait failed: {str(e)}")
             return False
 
+    # ------------------------------------------------------------------
+    # Condition based waits
+    #
+    # Each helper waits for a condition with a maximum budget in milliseconds
+    # and returns False instead of raising when the budget runs out, so they
+    # can replace fixed sleeps without changing the caller's error handling.
+    # ------------------------------------------------------------------
+
+    _DOM_STABLE_JS = """
+    ([selector, quietMs, budgetMs]) => new Promise(resolve => {
+        const root = document.querySelector(selector) || document.body;
+        let quiet;
+        const finish = (stable) => {
+            observer.disconnect();
+            clearTimeout(quiet);
+            clearTimeout(cap);
+            resolve(stable);
+        };
+        const observer = new MutationObserver(() => {
+            clearTimeout(quiet);
+            quiet = setTimeout(() => finish(true), quietMs);
+        });
+        observer.observe(root, {childList: true, subtree: true, attributes: true, characterData: true});
+        quiet = setTimeout(() => finish(true), quietMs);
+        const cap = setTimeout(() => finish(false), budgetMs);
+    })
+    """
+
+    def _timed_wait(self, wait) -> bool:
+        start = time.perf_counter()
+        try:
+            return bool(wait())
+        except Exception:
+            return False
+        finally:
+            self.wait_time_ms += (time.perf_counter() - start) * 1000
+
+    def wait_for_element(self, selector: str, state: str = "visible", budget_ms: int = 5000) -> bool:
+        """Wait for ``selector`` to reach ``state`` ('attached', 'visible', 'hidden', 'detached')."""
+        return self._timed_wait(
+            lambda: self.page.wait_for_selector(selector, state=state, timeout=budget_ms) or True
+        )
+
+    def wait_for_network_settled(self, budget_ms: int = 5000) -> bool:
+        """Wait for the ``networkidle`` load state without logging a failure."""
+        return self._timed_wait(
+            lambda: self.page.wait_for_load_state("networkidle", timeout=budget_ms) or True
+        )
+
+    def wait_for_dom_stable(self, selector: str = "body", quiet_ms: int = 250, budget_ms: int = 5000) -> bool:
+        """Wait until the subtree under ``selector`` has not mutated for ``quiet_ms``."""
+        return self._timed_wait(
+            lambda: self.page.evaluate(self._DOM_STABLE_JS, [selector, quiet_ms, budget_ms])
+        )
+
+    def wait_until(self, predicate_js: str, arg: Any = None, budget_ms: int = 5000) -> bool:
+        """Wait until the JavaScript predicate ``predicate_js`` returns a truthy value."""
+        return self._timed_wait(
+            lambda: self.page.wait_for_function(predicate_js, arg=arg, timeout=budget_ms) or True
+        )
+
+    def settle(
+        self,
+        fallback_seconds: float,
+        selector: Optional[str] = None,
+        state: str = "visible",
+        network_idle: bool = False,
+        dom_stable: bool = False,
+        predicate: Optional[tuple] = None,
+        budget_ms: Optional[int] = None,
+    ) -> bool:
+        """Replacement for a fixed ``sleep(fallback_seconds)``.
+
+        Waits for each requested condition in turn, sharing one budget, and
+        returns as soon as they are all met. With no condition given it waits
+        for the DOM to stop changing. When ``use_fixed_delays`` is set it just
+        sleeps ``fallback_seconds`` as the old code did.
+
+        Args:
+            fallback_seconds: The fixed delay this call replaces
+            selector: Wait for this selector to reach ``state``
+            state: Element state for ``selector``
+            network_idle: Wait for the network to go idle
+            dom_stable: Wait for DOM mutations to stop
+            predicate: ``(js, arg)`` tuple passed to :meth:`wait_until`
+            budget_ms: Maximum total wait. Defaults to the fixed delay, so a
+                missing condition costs no more than the sleep it replaced.
+
+        Returns:
+            bool: True if every condition was met within the budget
+        """
+        fixed = self.use_fixed_delays
+        if fixed is None:
+            fixed = os.getenv("AGENT_FIXED_DELAYS", "").lower() in ("1", "true", "yes")
+        if fixed:
+            time.sleep(fallback_seconds)
+            self.wait_time_ms += fallback_seconds * 1000
+            return True
+
+        if budget_ms is None:
+            budget_ms = int(fallback_seconds * 1000)
+        if not (selector or network_idle or dom_stable or predicate):
+            dom_stable = True
+
+        deadline = time.perf_counter() + budget_ms / 1000
+        remaining = lambda: max(1, int((deadline - time.perf_counter()) * 1000))
+        met = True
+        if selector:
+            met = self.wait_for_element(selector, state, remaining()) and met
+        if predicate:
+            met = self.wait_until(predicate[0], predicate[1], remaining()) and met
+        if network_idle:
+            met = self.wait_for_network_settled(remaining()) and met
+        if dom_stable:
+            met = self.wait_for_dom_stable(budget_ms=remaining()) and met
+        return met
+
 class PatientManager:
     def __init__(self):
         self._patients: Dict[str, Patient] = {}
@@ -580,14 +752,21 @@ class PatientManager:
             ))
             return self._patients.get(key)
     
-    def remove_patient(self, first_name: str, last_name: str) -> None:
-        """Remove a patient from the manager by name"""
+    def remove_patient(self, first_name: str, last_name: str, patient: Optional[Patient] = None) -> None:
+        """Remove a patient from the manager by name.
+
+        If ``patient`` is given, the entry is only removed when it is that exact
+        object, so a worker cannot drop a same-named patient another worker
+        created in the meantime.
+        """
         with self._lock:
             key = self._generate_patient_key(Patient(
                 first_name=first_name,
                 last_name=last_name,
                 dob="01/01/2000"  # Temporary DOB for key generation
             ))
+            if patient is not None and self._patients.get(key) is not patient:
+                return
             self._patients.pop(key, None)
     
     def get_all_patients(self) -> List[Patient]:
@@ -0,0 +1,80 @@
+"""Browser launch helpers.
+
+Playwright's sync API is bound to the thread that started it, so every lane or
+worker that drives pages concurrently needs its own ``BrowserHandle``. The
+async API has no such restriction: one ``AsyncBrowserHandle`` can serve many
+pages from a single event loop.
+"""
+
+from typing import Optional
+from playwright.sync_api import sync_playwright, Browser, BrowserContext, Playwright
+from playwright.async_api import async_playwright
+from core.network_profile import NetworkProfile
+
+DEFAULT_VIEWPORT = {"width": 1920, "height": 1080}
+
+
+class BrowserHandle:
+    """Owns one Playwright instance, browser and context."""
+
+    def __init__(self, playwright: Playwright, browser: Browser, context: BrowserContext,
+                 network_profile: Optional[NetworkProfile] = None):
+        self.playwright = playwright
+        self.browser = browser
+        self.context = context
+        self.network_profile = network_profile
+
+    def close(self) -> None:
+        """Close the browser and stop Playwright, ignoring teardown errors."""
+        for step in (self.context.close, self.browser.close, self.playwright.stop):
+            try:
+                step()
+            except Exception:
+                pass
+
+
+def launch_context(headless: bool = False, viewport: Optional[dict] = None,
+                   network_profile: Optional[NetworkProfile] = None) -> BrowserHandle:
+    """Start Playwright and open a Chromium browser context.
+
+    Must be called from the thread that will drive the returned pages.
+
+    Args:
+        headless: Run the browser without a window
+        viewport: Viewport size, defaults to ``DEFAULT_VIEWPORT``
+        network_profile: Request routing profile to attach to the context.
+            Skipped when ``AGENT_NETWORK_PROFILE=off``.
+    """
+    p = sync_playwright().start()
+    browser = p.chromium.launch(headless=headless)
+    context = browser.new_context(viewport=viewport or DEFAULT_VIEWPORT)
+    if network_profile and NetworkProfile.enabled():
+        network_profile.attach(context)
+    else:
+        network_profile = None
+    return BrowserHandle(p, browser, context, network_profile)
+
+
+class AsyncBrowserHandle:
+    """Owns one async Playwright instance, browser and context."""
+
+    def __init__(self, playwright, browser, context):
+        self.playwright = playwright
+        self.browser = browser
+        self.context = context
+
+    async def close(self) -> None:
+        """Close the browser and stop Playwright, ignoring teardown errors."""
+        for step in (self.context.close, self.browser.close, self.playwright.stop):
+            try:
+                await step()
+            except Exception:
+                pass
+
+
+async def launch_async_context(headless: bool = False, viewport: Optional[dict] = None) -> AsyncBrowserHandle:
+    """Start async Playwright and open a Chromium browser context."""
+    p = await async_playwright().start()
+    browser = await p.chromium.launch(headless=headless)
+    context = await browser.new_context(viewport=viewport or DEFAULT_VIEWPORT)
+    return AsyncBrowserHandle(p, browser, context)
@@ -1,64 +1,238 @@
 import logging
+import logging.handlers
 from datetime import datetime
+import atexit
+import copy
+import json
 import os
+import queue
 from pathlib import Path
+from threading import Lock
+
+
+def _env_flag(name, default):
+    return os.getenv(name, default).lower() in ("1", "true", "yes")
+
+
+class DailySizeRotatingFileHandler(logging.handlers.RotatingFileHandler):
+    """Writes to ``<prefix>_<date><suffix>`` and rotates by size and by day.
+
+    A new file is started when the date changes, and within a day the file is
+    rotated to ``.1``, ``.2``, ... once it exceeds ``max_bytes``.
+    """
+
+    def __init__(self, logs_dir, prefix, suffix=".log", max_bytes=20 * 1024 * 1024, backup_count=5):
+        self.logs_dir = Path(logs_dir)
+        self.file_prefix = prefix
+        self.file_suffix = suffix
+        self.day = datetime.now().strftime('%Y-%m-%d')
+        super().__init__(self._path_for(self.day), maxBytes=max_bytes, backupCount=backup_count,
+                         encoding="utf-8", delay=True)
+
+    def _path_for(self, day):
+        return str(self.logs_dir / f"{self.file_prefix}_{day}{self.file_suffix}")
+
+    def shouldRollover(self, record):
+        day = datetime.now().strftime('%Y-%m-%d')
+        if day != self.day:
+            self.day = day
+            if self.stream:
+                self.stream.close()
+                self.stream = None
+            self.baseFilename = os.path.abspath(self._path_for(day))
+            return False
+        return super().shouldRollover(record)
+
+
+class JsonLinesFormatter(logging.Formatter):
+    """One JSON object per record, with invoice and worker correlation IDs."""
+
+    def format(self, record):
+        entry = {
+            "ts": datetime.fromtimestamp(record.created).isoformat(),
+            "level": record.levelname,
+            "message": record.getMessage(),
+            "invoice_id": getattr(record, "invoice_id", None),
+            "worker": getattr(record, "worker", None),
+            "thread": record.threadName,
+        }
+        if record.exc_info:
+            entry["exc_info"] = self.formatException(record.exc_info)
+        return json.dumps(entry, default=str)
+
+
+class _CorrelationFilter(logging.Filter):
+    """Stamps records with the caller thread's invoice and worker IDs.
+
+    Runs in the logging thread, before the record is handed to the queue.
+    """
+
+    def filter(self, record):
+        try:
+            from core.tracing import get_trace_context
+            invoice_id, worker = get_trace_context()
+        except Exception:
+            invoice_id, worker = None, None
+        if not hasattr(record, "invoice_id"):
+            record.invoice_id = invoice_id
+        if getattr(record, "worker", None) is None:
+            record.worker = worker
+        return True
+
 
 class Logger:
-    def __init__(self):
+    """File logger for the automation.
+
+    By default records go through a ``QueueHandler`` and are written by a
+    ``QueueListener`` thread, so ``log()`` never blocks on disk I/O. Log
+    files rotate by day and by size, and ``json_lines`` adds a
+    ``playwright_<date>.jsonl`` file carrying invoice and worker IDs.
+
+    Environment overrides: ``AGENT_LOG_QUEUE=0`` writes synchronously,
+    ``AGENT_LOG_JSON=1`` enables JSON lines, ``AGENT_LOG_LEVEL`` sets the level
+    and ``AGENT_LOG_MAX_BYTES`` the rotation size.
+    """
+
+    _listener = None
+    _configured = False
+    _setup_lock = Lock()
+
+    def __init__(self, use_queue=None, json_lines=None, level=None, max_bytes=None, backup_count=5):
+        self.prefix = None
         self.logs_dir = Path("logs")
         self.logs_dir.mkdir(exist_ok=True)
         self.screenshots_dir = self.logs_dir / "screenshots"
         self.screenshots_dir.mkdir(exist_ok=True)
-        
+
+        self.use_queue = _env_flag("AGENT_LOG_QUEUE", "1") if use_queue is None else use_queue
+        self.json_lines = _env_flag("AGENT_LOG_JSON", "0") if json_lines is None else json_lines
+        self.level = getattr(logging, (level or os.getenv("AGENT_LOG_LEVEL", "INFO")).upper(), logging.INFO)
+        self.max_bytes = int(os.getenv("AGENT_LOG_MAX_BYTES", 20 * 1024 * 1024)) if max_bytes is None else max_bytes
+        self.backup_count = backup_count
+
         # Set up logger
         self.logger = logging.getLogger('playwright')
-        self.logger.setLevel(logging.INFO)
-        
+        self.logger.setLevel(self.level)
+        self.logger.propagate = False
+
         # Create today's log file
         self.setup_log_file()
-    
+
     def setup_log_file(self):
-        """Create a new log file for today's date"""
-        today = datetime.now().strftime('%Y-%m-%d')
-        log_file = self.logs_dir / f"playwright_{today}.log"
-        
-        # Remove existing handlers
+        """Attach the log file handlers, once per process.
+
+        Every ``Logger`` writes through the shared ``playwright`` logger, so
+        later instances reuse the first one's handlers and queue listener
+        rather than replacing them, which could drop records still queued.
+        """
+        with Logger._setup_lock:
+            if Logger._configured:
+                return
+            self._attach_handlers()
+            Logger._configured = True
+
+    def _attach_handlers(self):
         for handler in self.logger.handlers[:]:
             self.logger.removeHandler(handler)
-        
-        # Add file handler
-        file_handler = logging.FileHandler(log_file)
-        file_handler.setLevel(logging.INFO)
-        
-        # Create formatter
-        formatter = logging.Formatter('%(asctime)s - %(levelname)s - %(message)s')
-        file_handler.setFormatter(formatter)
-        
-        # Add handler to logger
-        self.logger.addHandler(file_handler)
-    
-    def log(self, message, level='info'):
-        """Log a message with the specified level"""
-        log_func = getattr(self.logger, level.lower())
-        log_func(message)
-    
+            handler.close()
+
+        file_handler = DailySizeRotatingFileHandler(
+            self.logs_dir, "playwright", ".log", self.max_bytes, self.backup_count
+        )
+        file_handler.setLevel(self.level)
+        file_handler.setFormatter(logging.Formatter('%(asctime)s - %(levelname)s - %(message)s'))
+        handlers = [file_handler]
+
+        if self.json_lines:
+            json_handler = DailySizeRotatingFileHandler(
+                self.logs_dir, "playwright", ".jsonl", self.max_bytes, self.backup_count
+            )
+            json_handler.setLevel(self.level)
+            json_handler.setFormatter(JsonLinesFormatter())
+            handlers.append(json_handler)
+
+        if self.use_queue:
+            queue_handler = logging.handlers.QueueHandler(queue.SimpleQueue())
+            queue_handler.addFilter(_CorrelationFilter())
+            self.logger.addHandler(queue_handler)
+            Logger._listener = logging.handlers.QueueListener(
+                queue_handler.queue, *handlers, respect_handler_level=True
+            )
+            Logger._listener.start()
+        else:
+            for handler in handlers:
+                handler.addFilter(_CorrelationFilter())
+                self.logger.addHandler(handler)
+
+    @staticmethod
+    def stop():
+        """Flush queued records and stop the writer thread"""
+        with Logger._setup_lock:
+            if Logger._listener is not None:
+                Logger._listener.stop()
+                Logger._listener = None
+                # The queue has no reader now; the next Logger sets up again
+                Logger._configured = False
+
+    def with_prefix(self, prefix):
+        """Return a logger sharing this logger's handlers that tags every message.
+
+        Used to give each concurrent worker its own log prefix without
+        re-creating the file handlers.
+        """
+        prefixed = copy.copy(self)
+        prefixed.prefix = prefix
+        return prefixed
+
+    def _format(self, message):
+        return f"[{self.prefix}] {message}" if self.prefix else message
+
+    def _emit(self, levelno, message, args):
+        # Level check first so disabled messages cost nothing to format
+        if not self.logger.isEnabledFor(levelno):
+            return
+        if callable(message):
+            message = message()
+        if args:
+            message = message % args
+        self.logger.log(levelno, self._format(message), extra={"worker": self.prefix})
+
+    def log(self, message, *args, level='info'):
+        """Log a message with the specified level.
+
+        ``message`` may be a ``%``-format string with ``args`` or a callable
+        returning the message; either is only formatted if the level is
+        enabled.
+        """
+        self._emit(getattr(logging, level.upper(), logging.INFO), message, args)
+
+    def debug(self, message, *args):
+        """Log a debug message, formatted lazily"""
+        self._emit(logging.DEBUG, message, args)
+
     def log_error(self, message, screenshot_path=None):
         """Log an error with optional screenshot reference"""
         if screenshot_path:
-            self.logger.error(f"{message} [Screenshot: {screenshot_path}]")
+            self._emit(logging.ERROR, f"{message} [Screenshot: {screenshot_path}]", ())
         else:
-            self.logger.error(message)
-    
+            self._emit(logging.ERROR, message, ())
+
     def get_screenshot_path(self):
         """Generate a unique screenshot path"""
-        timestamp = datetime.now().strftime('%Y%m%d_%H%M%S')
-        return self.screenshots_dir / f"error_{timestamp}.png"
+        timestamp = datetime.now().strftime('%Y%m%d_%H%M%S_%f')
+        tag = f"{self.prefix}_" if self.prefix else ""
+        return self.screenshots_dir / f"error_{tag}{timestamp}.png"
+
+atexit.register(Logger.stop)
 
 # Global logger instance
 _logger = None
+_logger_lock = Lock()
 
 def get_logger():
     global _logger
     if _logger is None:
-        _logger = Logger()
-    return _logger 
\ No newline at end of file
+        with _logger_lock:
+            if _logger is None:
+                _logger = Logger()
+    return _logger
@@ -0,0 +1,218 @@
+"""Request routing profile for automation browser contexts.
+
+The portals pull in images, fonts, analytics and marketing assets that the
+automation never looks at. A ``NetworkProfile`` attached to a browser context
+aborts or stubs those requests and counts what it saved::
+
+    profile = NetworkProfile.for_portals("rev", "vsp")
+    handle = launch_context(network_profile=profile)
+    ...
+    print(profile.stats())
+
+Requests to a portal's own domains are only filtered by resource type.
+Requests to other domains are blocked when they are non-essential or go to a
+known tracker; essential third-party requests (documents, styles, scripts,
+XHR) are let through unless the profile is ``strict``, since the portals load
+some of their app code and styles from CDNs.
+"""
+
+from typing import Dict, Iterable, Optional, Tuple
+from urllib.parse import urlparse
+import os
+
+# Domains each portal needs (subdomains included); the same list scopes the
+# saved login sessions
+from core.session_cache import PORTAL_DOMAINS
+
+# Analytics, tag managers, chat widgets and session recorders
+TRACKER_DOMAINS = (
+    "google-analytics.com",
+    "googletagmanager.com",
+    "doubleclick.net",
+    "googleadservices.com",
+    "facebook.net",
+    "facebook.com",
+    "hotjar.com",
+    "newrelic.com",
+    "nr-data.net",
+    "segment.io",
+    "segment.com",
+    "optimizely.com",
+    "hubspot.com",
+    "hs-scripts.com",
+    "linkedin.com",
+    "bing.com",
+    "clarity.ms",
+    "fullstory.com",
+    "intercom.io",
+    "zendesk.com",
+)
+
+# Resource types blocked even on portal domains
+DEFAULT_BLOCKED_TYPES = ("image", "media", "font")
+
+# Resource types the pages need to work. Stylesheets count because layout
+# decides what Playwright considers visible and clickable.
+ESSENTIAL_TYPES = ("document", "stylesheet", "script", "xhr", "fetch", "websocket", "eventsource")
+
+# Rough transfer size per blocked request, used to estimate bytes saved
+ESTIMATED_BYTES = {
+    "image": 35_000,
+    "media": 500_000,
+    "font": 50_000,
+    "stylesheet": 25_000,
+    "script": 60_000,
+    "xhr": 2_000,
+    "fetch": 2_000,
+    "other": 5_000,
+}
+
+# Third-party scripts are answered with an empty script instead of aborted so
+# page code that waits on their load event keeps going.
+_STUB_BODIES = {
+    "script": ("application/javascript", ""),
+    "stylesheet": ("text/css", ""),
+}
+
+
+def _host_matches(host: str, domains: Iterable[str]) -> bool:
+    return any(host == d or host.endswith("." + d) for d in domains)
+
+
+class NetworkProfile:
+    """Blocks or stubs non-essential requests and counts the savings."""
+
+    def __init__(
+        self,
+        allow_domains: Iterable[str] = (),
+        blocked_types: Iterable[str] = DEFAULT_BLOCKED_TYPES,
+        block_trackers: bool = True,
+        strict: bool = False,
+    ):
+        """Initialize the profile.
+
+        Args:
+            allow_domains: First-party domains (subdomains included)
+            blocked_types: Playwright resource types blocked on every domain
+            block_trackers: Block requests to ``TRACKER_DOMAINS``
+            strict: Also block essential requests to domains outside
+                ``allow_domains``
+        """
+        self.allow_domains = tuple(d.lower() for d in allow_domains)
+        self.blocked_types = frozenset(blocked_types)
+        self.block_trackers = block_trackers
+        self.strict = strict
+        self.allowed_requests = 0
+        self.blocked_requests: Dict[str, int] = {}
+        self.stubbed_requests: Dict[str, int] = {}
+        self.blocked_hosts: Dict[str, int] = {}
+        self.bytes_saved = 0
+
+    @classmethod
+    def for_portals(cls, *portals: str, **kwargs) -> "NetworkProfile":
+        """Build a profile that allows the given portals' domains.
+
+        ``AGENT_NETWORK_PROFILE=strict`` turns on strict mode unless ``strict``
+        is passed explicitly.
+        """
+        domains = []
+        for portal in portals:
+            domains.extend(PORTAL_DOMAINS.get(portal, ()))
+        kwargs.setdefault("strict", os.getenv("AGENT_NETWORK_PROFILE", "").lower() == "strict")
+        return cls(allow_domains=domains, **kwargs)
+
+    @classmethod
+    def merged(cls, profiles: Iterable["NetworkProfile"]) -> "NetworkProfile":
+        """Return an unattached profile whose counters sum those of ``profiles``.
+
+        Used to report one total over every browser context of a run.
+        """
+        total = cls()
+        for profile in profiles:
+            total.allowed_requests += profile.allowed_requests
+            total.bytes_saved += profile.bytes_saved
+            for mine, theirs in (
+                (total.blocked_requests, profile.blocked_requests),
+                (total.stubbed_requests, profile.stubbed_requests),
+                (total.blocked_hosts, profile.blocked_hosts),
+            ):
+                for key, count in theirs.items():
+                    mine[key] = mine.get(key, 0) + count
+        return total
+
+    @staticmethod
+    def enabled() -> bool:
+        """``AGENT_NETWORK_PROFILE=off`` disables request routing."""
+        return os.getenv("AGENT_NETWORK_PROFILE", "").lower() not in ("off", "0", "false", "no")
+
+    def decide(self, url: str, resource_type: str) -> Optional[str]:
+        """Return ``"block"``, ``"stub"`` or ``None`` (let through) for a request."""
+        host = (urlparse(url).hostname or "").lower()
+        if not host:
+            return None
+        first_party = _host_matches(host, self.allow_domains)
+
+        if self.block_trackers and not first_party and _host_matches(host, TRACKER_DOMAINS):
+            return "stub" if resource_type in _STUB_BODIES else "block"
+        if resource_type in self.blocked_types:
+            return "block"
+        if first_party:
+            return None
+        if resource_type not in ESSENTIAL_TYPES:
+            return "stub" if resource_type in _STUB_BODIES else "block"
+        if self.strict and resource_type != "document":
+            return "stub" if resource_type in _STUB_BODIES else "block"
+        return None
+
+    def _handle(self, route) -> None:
+        request = route.request
+        resource_type = request.resource_type
+        try:
+            action = self.decide(request.url, resource_type)
+        except Exception:
+            action = None
+
+        if action is None:
+            self.allowed_requests += 1
+            route.continue_()
+            return
+
+        host = (urlparse(request.url).hostname or "").lower()
+        self.blocked_hosts[host] = self.blocked_hosts.get(host, 0) + 1
+        self.bytes_saved += ESTIMATED_BYTES.get(resource_type, ESTIMATED_BYTES["other"])
+        if action == "stub":
+            self.stubbed_requests[resource_type] = self.stubbed_requests.get(resource_type, 0) + 1
+            content_type, body = _STUB_BODIES[resource_type]
+            route.fulfill(status=200, content_type=content_type, body=body)
+        else:
+            self.blocked_requests[resource_type] = self.blocked_requests.get(resource_type, 0) + 1
+            route.abort("blockedbyclient")
+
+    def attach(self, context) -> None:
+        """Route every request made by ``context`` through this profile."""
+        context.route("**/*", self._handle)
+
+    def stats(self) -> Dict[str, object]:
+        """Return request counters and the estimated bytes saved."""
+        blocked = sum(self.blocked_requests.values())
+        stubbed = sum(self.stubbed_requests.values())
+        return {
+            "allowed_requests": self.allowed_requests,
+            "blocked_requests": blocked,
+            "stubbed_requests": stubbed,
+            "blocked_by_type": dict(self.blocked_requests),
+            "stubbed_by_type": dict(self.stubbed_requests),
+            "top_blocked_hosts": self._top_hosts(),
+            "estimated_bytes_saved": self.bytes_saved,
+        }
+
+    def _top_hosts(self, limit: int = 10) -> Tuple[Tuple[str, int], ...]:
+        return tuple(sorted(self.blocked_hosts.items(), key=lambda kv: kv[1], reverse=True)[:limit])
+
+    def summary_line(self) -> str:
+        """One line summary for logs."""
+        s = self.stats()
+        return (
+            f"Network profile: {s['allowed_requests']} allowed, {s['blocked_requests']} blocked, "
+            f"{s['stubbed_requests']} stubbed, ~{s['estimated_bytes_saved'] / 1_000_000:.1f} MB saved"
+        )
@@ -1,6 +1,8 @@
 # pdf_tools.py
 
 from abc import ABC, abstractmethod
+from concurrent.futures import ProcessPoolExecutor
+import os
 
 # --- Abstract Base Tool ---
 
@@ -22,19 +24,179 @@ class PyMuPDFTool(AbstractPDFTool):
 
 # --- Tool 2: OCR Scan Reader with Tesseract ---
 
+# Pages with at least this many characters in their text layer are not OCR'd
+MIN_TEXT_LAYER_CHARS = 50
+
+# Open documents, per OCR worker process, keyed by path with the file's
+# (mtime, size) so a file changed on disk is reopened
+_worker_docs = {}
+
+
+def _close_worker_docs():
+    for _, doc in _worker_docs.values():
+        try:
+            doc.close()
+        except Exception:
+            pass
+    _worker_docs.clear()
+
+
+def _init_ocr_worker():
+    from multiprocessing.util import Finalize
+
+    # One Tesseract thread per process; the pool provides the parallelism
+    os.environ.setdefault("OMP_THREAD_LIMIT", "1")
+    # Pool workers skip atexit; multiprocessing finalizers run on shutdown
+    Finalize(None, _close_worker_docs, exitpriority=10)
+
+
+def _render_ocr(doc, page_number, dpi, lang):
+    from PIL import Image
+    import pytesseract
+
+    # Render once and reuse the pixmap for both size and samples
+    pix = doc[page_number].get_pixmap(dpi=dpi)
+    mode = "RGBA" if pix.alpha else "RGB"
+    image = Image.frombytes(mode, (pix.width, pix.height), pix.samples)
+    return pytesseract.image_to_string(image, lang=lang)
+
+
+def _ocr_page(file_path, page_number, dpi, lang):
+    """OCR one page. Runs in a worker process; the document is opened once per process."""
+    import fitz
+
+    stat = os.stat(file_path)
+    version = (stat.st_mtime_ns, stat.st_size)
+    cached = _worker_docs.get(file_path)
+    if cached is None or cached[0] != version:
+        if cached is not None:
+            cached[1].close()
+        _worker_docs[file_path] = cached = (version, fitz.open(file_path))
+    return _render_ocr(cached[1], page_number, dpi, lang)
+
+
 class TesseractTool(AbstractPDFTool):
-    def parse(self, file_path):
+    """OCR reader that renders each page once and OCRs pages in parallel.
+
+    Pages whose text layer already has ``min_text_chars`` characters use that
+    text instead of OCR. The remaining pages are OCR'd across a process pool
+    and :meth:`iter_pages` yields every page in order as soon as it and the
+    pages before it are done.
+    """
+
+    def __init__(self, dpi=None, max_workers=None, skip_text_layer=True,
+                 min_text_chars=MIN_TEXT_LAYER_CHARS, lang="eng"):
+        """Initialize the tool.
+
+        Args:
+            dpi: Render resolution for OCR (``AGENT_OCR_DPI``, default 200)
+            max_workers: OCR processes (defaults to the CPU count)
+            skip_text_layer: Use the page's own text when it has enough
+            min_text_chars: Text layer size that counts as "has text"
+            lang: Tesseract language
+        """
+        self.dpi = dpi or int(os.getenv("AGENT_OCR_DPI", 200))
+        self.max_workers = max_workers
+        self.skip_text_layer = skip_text_layer
+        self.min_text_chars = min_text_chars
+        self.lang = lang
+
+    def iter_pages(self, file_path, pages=None):
+        """Yield ``{"page", "text", "method"}`` for each page, in page order.
+
+        ``method`` is ``"text"`` for pages read from the text layer and
+        ``"ocr"`` for OCR'd pages. ``pages`` limits the run to the given
+        0-based page numbers.
+        """
         import fitz
-        from PIL import Image
-        import pytesseract
 
-        doc = fitz.open(file_path)
-        images = [
-            Image.frombytes("RGB", page.get_pixmap().size, page.get_pixmap().samples)
-            for page in doc
-        ]
-        ocr_text = "\n".join([pytesseract.image_to_string(img) for img in images])
-        return {"text": ocr_text}
+        with fitz.open(file_path) as doc:
+            page_numbers = list(range(doc.page_count)) if pages is None else list(pages)
+            layer_text = {}
+            info = {}
+            for number in page_numbers:
+                page = doc[number]
+                text = page.get_text()
+                use_text, info[number] = self._classify(page, text)
+                if use_text:
+                    layer_text[number] = text
+        ocr_pages = [number for number in page_numbers if number not in layer_text]
+
+        def result(number, text, method):
+            return dict({"page": number, "text": text, "method": method}, **info[number])
+
+        if len(ocr_pages) <= 1:
+            # Not worth starting a pool for one page
+            doc = fitz.open(file_path) if ocr_pages else None
+            try:
+                for number in page_numbers:
+                    if number in layer_text:
+                        yield result(number, layer_text[number], "text")
+                    else:
+                        yield result(number, _render_ocr(doc, number, self.dpi, self.lang), "ocr")
+            finally:
+                if doc is not None:
+                    doc.close()
+            return
+
+        workers = min(self.max_workers or os.cpu_count() or 1, len(ocr_pages))
+        with ProcessPoolExecutor(max_workers=workers, initializer=_init_ocr_worker) as executor:
+            futures = {
+                number: executor.submit(_ocr_page, file_path, number, self.dpi, self.lang)
+                for number in ocr_pages
+            }
+            for number in page_numbers:
+                if number in layer_text:
+                    yield result(number, layer_text[number], "text")
+                else:
+                    yield result(number, futures.pop(number).result(), "ocr")
+
+    def _classify(self, page, text):
+        """Return ``(use_text_layer, extra_fields)`` for a page."""
+        chars = len(text.strip())
+        return self.skip_text_layer and chars >= self.min_text_chars, {"chars": chars}
+
+    def parse(self, file_path):
+        pages = list(self.iter_pages(file_path))
+        ocr_text = "\n".join(page["text"] for page in pages)
+        return {"text": ocr_text, "pages": pages}
+
+
+# --- Tool 2b: Per-page Text Layer / OCR Hybrid ---
+
+# Non-whitespace characters per 1000 square points (a letter page is ~484)
+# below which a page counts as image-only
+MIN_TEXT_DENSITY = 0.5
+
+
+def page_text_density(page, text):
+    """Non-whitespace characters of ``text`` per 1000 square points of ``page``."""
+    area = page.rect.width * page.rect.height
+    if not area:
+        return 0.0
+    chars = sum(1 for ch in text if not ch.isspace())
+    return chars * 1000 / area
+
+
+class HybridPDFTool(TesseractTool):
+    """Reads each page from its text layer or OCR, whichever the page needs.
+
+    A page is OCR'd only when its text density is below ``min_density`` and
+    it has images to read. Dense pages and pages without images use the text
+    layer. Every page result records its ``method``, ``density`` and
+    ``images``.
+    """
+
+    def __init__(self, min_density=MIN_TEXT_DENSITY, **kwargs):
+        kwargs.setdefault("skip_text_layer", True)
+        super().__init__(**kwargs)
+        self.min_density = min_density
+
+    def _classify(self, page, text):
+        density = page_text_density(page, text)
+        images = len(page.get_images())
+        use_text = density >= self.min_density or images == 0
+        return use_text, {"density": round(density, 2), "images": images}
 
 
 # --- Tool 3: LLM-Assisted Reasoner (Ollama, Local Model) ---
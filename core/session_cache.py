@@ -0,0 +1,214 @@
+"""Persistent login sessions for the Rev and VSP portals.
+
+Logging in costs several seconds per portal (and VSP prompts again in the
+claim report popup). ``SessionCache`` saves a browser context's Playwright
+storage state (cookies and localStorage) per portal and location, restores it
+into new contexts and checks it with a single navigation, so the full login
+only runs when the saved session has expired::
+
+    cache = get_session_cache()
+    if cache.restore(context, "vsp", "ama") and cache.validate(page, url, logged_in, login_form):
+        ...  # already logged in
+    else:
+        ...  # log in, then cache.save(context, "vsp", "ama")
+"""
+
+from typing import Optional, Dict, Any
+from datetime import datetime
+from pathlib import Path
+from threading import Lock
+import json
+import os
+import time
+
+from core.logger import Logger, get_logger
+
+# Cookies and localStorage saved for a portal are limited to these domains so
+# restoring one portal never overwrites another portal's cookies in a shared
+# browser context.
+PORTAL_DOMAINS = {
+    "rev": ("revolutionehr.com",),
+    "vsp": ("eyefinity.com", "vsp.com"),
+}
+
+DEFAULT_TTL_SECONDS = 8 * 60 * 60
+
+
+def _matches_domain(host: str, domains) -> bool:
+    host = host.lstrip(".").lower()
+    return any(host == d or host.endswith("." + d) for d in domains)
+
+
+class SessionCache:
+    """Save and restore authenticated storage state per portal and location."""
+
+    def __init__(self, cache_dir: str = "logs/sessions", ttl_seconds: Optional[int] = None):
+        """Initialize the session cache.
+
+        Args:
+            cache_dir: Directory for the saved sessions
+            ttl_seconds: Age after which a saved session is ignored. Defaults to
+                ``AGENT_SESSION_TTL`` from the environment, or 8 hours.
+        """
+        self.cache_dir = Path(cache_dir)
+        self.cache_dir.mkdir(parents=True, exist_ok=True)
+        if ttl_seconds is None:
+            ttl_seconds = int(os.getenv("AGENT_SESSION_TTL", DEFAULT_TTL_SECONDS))
+        self.ttl_seconds = ttl_seconds
+        self.enabled = os.getenv("AGENT_SESSION_CACHE", "1").lower() not in ("0", "false", "no")
+        self._lock = Lock()
+
+    def path(self, portal: str, location: Optional[str] = None) -> Path:
+        """Return the file a portal/location session is saved to."""
+        name = f"{portal}_{location.lower()}" if location else portal
+        return self.cache_dir / f"{name}.json"
+
+    def _filter_state(self, state: Dict[str, Any], portal: str) -> Dict[str, Any]:
+        domains = PORTAL_DOMAINS.get(portal)
+        if not domains:
+            return state
+        cookies = [c for c in state.get("cookies", []) if _matches_domain(c.get("domain", ""), domains)]
+        origins = [
+            o for o in state.get("origins", [])
+            if _matches_domain(o.get("origin", "").split("://")[-1].split(":")[0], domains)
+        ]
+        return {"cookies": cookies, "origins": origins}
+
+    def load(self, portal: str, location: Optional[str] = None) -> Optional[Dict[str, Any]]:
+        """Load a saved storage state if it is still fresh.
+
+        Returns:
+            The storage state with expired cookies removed, or ``None`` if there
+            is no usable saved session.
+        """
+        if not self.enabled:
+            return None
+        path = self.path(portal, location)
+        try:
+            with open(path, "r") as f:
+                saved = json.load(f)
+        except (OSError, ValueError):
+            return None
+
+        if time.time() - saved.get("saved_at", 0) > self.ttl_seconds:
+            return None
+
+        state = saved.get("storage_state") or {}
+        now = time.time()
+        cookies = [c for c in state.get("cookies", []) if c.get("expires", -1) in (-1, None) or c["expires"] > now]
+        if not cookies:
+            return None
+        return {"cookies": cookies, "origins": state.get("origins", [])}
+
+    def save(self, context, portal: str, location: Optional[str] = None,
+             logger: Optional[Logger] = None) -> bool:
+        """Save the portal's cookies and localStorage from ``context``.
+
+        Args:
+            context: Playwright ``BrowserContext`` that is logged in
+            portal: Portal key, e.g. ``"rev"`` or ``"vsp"``
+            location: Optional location the login belongs to (``"ama"``/``"bgr"``)
+            logger: Logger for failures (defaults to the global logger)
+
+        Returns:
+            bool: True if the session was written
+        """
+        if not self.enabled:
+            return False
+        try:
+            state = self._filter_state(context.storage_state(), portal)
+            payload = {
+                "portal": portal,
+                "location": location,
+                "saved_at": time.time(),
+                "saved_at_iso": datetime.now().isoformat(),
+                "storage_state": state,
+            }
+            path = self.path(portal, location)
+            tmp = path.with_suffix(".tmp")
+            with self._lock:
+                # Session cookies are credentials; keep them private to the user
+                fd = os.open(tmp, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o600)
+                with os.fdopen(fd, "w") as f:
+                    json.dump(payload, f)
+                os.replace(tmp, path)
+            return True
+        except Exception as e:
+            (logger or get_logger()).log_error(f"Failed to save {portal} session: {str(e)}")
+            return False
+
+    def restore(self, context, portal: str, location: Optional[str] = None,
+                logger: Optional[Logger] = None) -> bool:
+        """Load a saved session into ``context``.
+
+        Cookies are added directly. localStorage is restored by an init script
+        that fills in missing keys when a page of the matching origin loads.
+        Failures are logged to ``logger`` (defaults to the global logger).
+
+        Returns:
+            bool: True if a saved session was applied
+        """
+        state = self.load(portal, location)
+        if not state:
+            return False
+        try:
+            context.add_cookies(state["cookies"])
+            storage: Dict[str, Dict[str, str]] = {}
+            for origin in state.get("origins", []):
+                items = {i["name"]: i["value"] for i in origin.get("localStorage", [])}
+                if items:
+                    storage[origin["origin"]] = items
+            if storage:
+                context.add_init_script(
+                    "(() => {"
+                    f" const items = ({json.dumps(storage)})[window.location.origin];"
+                    " if (!items) return;"
+                    " for (const [key, value] of Object.entries(items)) {"
+                    "  try { if (window.localStorage.getItem(key) === null) window.localStorage.setItem(key, value); }"
+                    "  catch (e) {}"
+                    " }"
+                    "})();"
+                )
+            return True
+        except Exception as e:
+            (logger or get_logger()).log_error(f"Failed to restore {portal} session: {str(e)}")
+            return False
+
+    def validate(self, page, url: str, logged_in_selector: str, login_selector: str,
+                 timeout: int = 15000) -> bool:
+        """Check a restored session with one navigation.
+
+        Opens ``url`` and waits for whichever shows up first: an element only
+        present when logged in, or the login form.
+
+        Returns:
+            bool: True if ``logged_in_selector`` appeared
+        """
+        try:
+            page.goto(url)
+            page.wait_for_selector(f"{logged_in_selector}, {login_selector}", state="visible", timeout=timeout)
+            return page.locator(logged_in_selector).first.is_visible()
+        except Exception:
+            return False
+
+    def invalidate(self, portal: str, location: Optional[str] = None) -> None:
+        """Delete a saved session, e.g. after it failed validation."""
+        try:
+            self.path(portal, location).unlink()
+        except OSError:
+            pass
+
+
+# Global session cache instance
+_session_cache = None
+_session_cache_lock = Lock()
+
+
+def get_session_cache() -> SessionCache:
+    """Get the global session cache instance"""
+    global _session_cache
+    if _session_cache is None:
+        with _session_cache_lock:
+            if _session_cache is None:
+                _session_cache = SessionCache()
+    return _session_cache
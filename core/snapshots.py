@@ -0,0 +1,281 @@
+"""Failure snapshots for page objects.
+
+``BasePage.take_screenshot`` runs on every caught exception, and a single bad
+claim can raise the same error a dozen times while the retries and the
+callers up the stack each log it. The ``SnapshotRecorder`` keeps that cheap:
+
+- every capture adds a lightweight DOM snapshot (URL, title, truncated HTML)
+  to a per-thread ring buffer of the last ``capacity`` captures;
+- failures are grouped by a signature (page URL without query plus the error
+  message with numbers masked). Only the first failure of a signature within
+  an invoice (see ``core.tracing.trace_context``) gets a full-page screenshot
+  and a dump of the ring; repeats are only counted;
+- screenshots are taken as bytes on the calling thread (Playwright requires
+  it) and everything is compressed and written by a background thread.
+
+Artifacts go to ``logs/snapshots/<date>/`` and every failure, repeat or not,
+gets a line in ``index.jsonl`` there.
+
+Set ``AGENT_SNAPSHOTS=0`` to fall back to a plain screenshot per failure and
+``AGENT_SNAPSHOT_RING`` to change the ring size (default 5).
+"""
+
+from typing import Any, Dict, List, Optional, Tuple
+from collections import deque
+from datetime import datetime
+from pathlib import Path
+from threading import Lock, Thread, local
+from urllib.parse import urlsplit
+import atexit
+import gzip
+import hashlib
+import json
+import os
+import queue
+import re
+
+# Cap on the HTML kept per ring entry, in characters
+MAX_SNAPSHOT_CHARS = 500_000
+
+_DIGITS = re.compile(r"\d+")
+
+_STOP = object()
+
+
+def failure_signature(url: Optional[str], message: Optional[str]) -> str:
+    """Return a short hash identifying a failure.
+
+    The query string and fragment are dropped from the URL and runs of digits
+    in the message are masked, so the same timeout on another invoice or with
+    another elapsed time gets the same signature.
+    """
+    parts = urlsplit(url or "")
+    location = f"{parts.netloc}{parts.path}"
+    normalized = _DIGITS.sub("#", (message or "").strip())
+    return hashlib.sha1(f"{location}|{normalized}".encode("utf-8")).hexdigest()[:12]
+
+
+class SnapshotRecorder:
+    """Ring-buffered, deduplicated failure capture with a background writer."""
+
+    def __init__(self, snapshot_dir: str = "logs/snapshots", capacity: Optional[int] = None,
+                 screenshot_timeout: int = 3000):
+        """Initialize the recorder.
+
+        Args:
+            snapshot_dir: Directory for the per-day artifact folders
+            capacity: DOM snapshots kept per thread (``AGENT_SNAPSHOT_RING``)
+            screenshot_timeout: Timeout in ms for the full-page screenshot
+        """
+        self.snapshot_dir = Path(snapshot_dir)
+        self.capacity = capacity if capacity is not None else int(os.getenv("AGENT_SNAPSHOT_RING", 5))
+        self.screenshot_timeout = screenshot_timeout
+        self._local = local()
+        self._lock = Lock()
+        self._seen: Dict[Tuple[Optional[str], str], int] = {}
+        self._counts: Dict[str, int] = {}
+        self._queue: "queue.SimpleQueue" = queue.SimpleQueue()
+        self._thread: Optional[Thread] = None
+
+    @staticmethod
+    def enabled() -> bool:
+        return os.getenv("AGENT_SNAPSHOTS", "1").lower() not in ("0", "false", "no")
+
+    def _ring(self) -> deque:
+        ring = getattr(self._local, "ring", None)
+        if ring is None:
+            ring = self._local.ring = deque(maxlen=self.capacity)
+        return ring
+
+    def recent(self) -> List[Dict[str, Any]]:
+        """Return this thread's ring buffer, oldest first."""
+        return list(self._ring())
+
+    def snapshot(self, page, label: Optional[str] = None,
+                 max_chars: Optional[int] = MAX_SNAPSHOT_CHARS) -> Dict[str, Any]:
+        """Add a DOM snapshot of ``page`` to this thread's ring.
+
+        The HTML is cut at ``max_chars`` (``None`` keeps all of it).
+        """
+        entry: Dict[str, Any] = {"ts": datetime.now().isoformat(), "label": label}
+        try:
+            entry["url"] = page.url
+        except Exception:
+            entry["url"] = None
+        try:
+            html = page.evaluate("document.documentElement.outerHTML")
+            entry["truncated"] = max_chars is not None and len(html) > max_chars
+            entry["html"] = html[:max_chars] if entry["truncated"] else html
+        except Exception as e:
+            entry["html"] = None
+            entry["error"] = str(e)
+        try:
+            entry["title"] = page.title()
+        except Exception:
+            entry["title"] = None
+        try:
+            from core.tracing import get_trace_context
+            entry["invoice_id"], entry["worker"] = get_trace_context()
+        except Exception:
+            pass
+        self._ring().append(entry)
+        return entry
+
+    def _screenshot(self, page) -> Optional[bytes]:
+        try:
+            return page.screenshot(full_page=True, timeout=self.screenshot_timeout)
+        except Exception:
+            try:
+                return page.screenshot(timeout=self.screenshot_timeout)
+            except Exception:
+                return None
+
+    def capture(self, page, message: Optional[str] = None,
+                screenshot_path: Optional[Path] = None) -> Dict[str, Any]:
+        """Record a failure.
+
+        Args:
+            page: Playwright page the failure happened on
+            message: Error message, part of the signature
+            screenshot_path: Where to write the screenshot of a first failure;
+                defaults to the day's snapshot folder
+
+        Returns:
+            dict with ``signature``, ``count`` (occurrences so far for the
+            current invoice), ``duplicate`` and, for a first failure,
+            ``screenshot_path``
+        """
+        entry = self.snapshot(page, label=message)
+        signature = failure_signature(entry.get("url"), message)
+        key = (entry.get("invoice_id"), signature)
+        with self._lock:
+            count = self._seen.get(key, 0) + 1
+            self._seen[key] = count
+            self._counts[signature] = self._counts.get(signature, 0) + 1
+
+        result: Dict[str, Any] = {"signature": signature, "count": count, "duplicate": count > 1}
+        day_dir = self.snapshot_dir / datetime.now().strftime('%Y-%m-%d')
+        stamp = datetime.now().strftime('%H%M%S_%f')
+        index = {
+            "ts": entry["ts"],
+            "signature": signature,
+            "count": count,
+            "message": message,
+            "url": entry.get("url"),
+            "invoice_id": entry.get("invoice_id"),
+            "worker": entry.get("worker"),
+        }
+
+        if count == 1:
+            png = self._screenshot(page)
+            base = day_dir / f"{stamp}_{signature}"
+            if png is not None:
+                path = Path(screenshot_path) if screenshot_path else base.with_suffix(".png")
+                self._submit(path, png)
+                result["screenshot_path"] = str(path)
+                index["screenshot"] = str(path)
+            ring_path = base.with_name(base.name + "_ring.jsonl.gz")
+            self._submit(ring_path, self.recent(), compress=True)
+            index["ring"] = str(ring_path)
+
+        self._submit(day_dir / "index.jsonl", index, append=True)
+        return result
+
+    def save_state(self, page, name: str, directory: str) -> Dict[str, str]:
+        """Save the HTML of ``page`` and queue a full-page screenshot.
+
+        Writes ``<directory>/<name>.html`` before returning, since debug tools
+        such as ``config/debug/slugger.py`` read it right away, and
+        ``<directory>/<name>.png`` in the background.
+        """
+        entry = self.snapshot(page, label=name, max_chars=None)
+        paths: Dict[str, str] = {}
+        png = self._screenshot(page)
+        if png is not None:
+            paths["screenshot"] = os.path.join(directory, f"{name}.png")
+            self._submit(Path(paths["screenshot"]), png)
+        if entry.get("html") is not None:
+            paths["html"] = os.path.join(directory, f"{name}.html")
+            self._write(Path(paths["html"]), entry["html"], compress=False, append=False)
+        return paths
+
+    def _submit(self, path: Path, data: Any, compress: bool = False, append: bool = False) -> None:
+        self._ensure_writer()
+        self._queue.put((path, data, compress, append))
+
+    def _ensure_writer(self) -> None:
+        if self._thread is None or not self._thread.is_alive():
+            with self._lock:
+                if self._thread is None or not self._thread.is_alive():
+                    self._thread = Thread(target=self._run, name="snapshot-writer", daemon=True)
+                    self._thread.start()
+
+    def _run(self) -> None:
+        while True:
+            item = self._queue.get()
+            if item is _STOP:
+                # Write whatever was queued behind the stop before exiting
+                while True:
+                    try:
+                        item = self._queue.get_nowait()
+                    except queue.Empty:
+                        return
+                    if item is not _STOP:
+                        self._write_item(item)
+            self._write_item(item)
+
+    def _write_item(self, item) -> None:
+        try:
+            self._write(*item)
+        except Exception as e:
+            print(f"⚠️ Failed to write snapshot {item[0]}: {str(e)}")
+
+    @staticmethod
+    def _write(path: Path, data: Any, compress: bool, append: bool) -> None:
+        path.parent.mkdir(parents=True, exist_ok=True)
+        if isinstance(data, list):
+            data = "".join(json.dumps(row, default=str) + "\n" for row in data)
+        elif isinstance(data, dict):
+            data = json.dumps(data, default=str) + "\n"
+        if isinstance(data, str):
+            data = data.encode("utf-8")
+        if compress:
+            data = gzip.compress(data, compresslevel=6)
+        with open(path, "ab" if append else "wb") as f:
+            f.write(data)
+
+    def flush(self, timeout: float = 10.0) -> None:
+        """Wait until everything queued so far is written."""
+        if self._queue.empty() and (self._thread is None or not self._thread.is_alive()):
+            return
+        self._ensure_writer()
+        thread = self._thread
+        self._queue.put(_STOP)
+        thread.join(timeout)
+        # A writer still busy after the timeout keeps running and exits at the
+        # stop; only forget it once it has, so no second writer is started.
+        if not thread.is_alive():
+            with self._lock:
+                if self._thread is thread:
+                    self._thread = None
+
+    def stats(self) -> Dict[str, int]:
+        """Return ``{signature: occurrences}`` for this run."""
+        with self._lock:
+            return dict(self._counts)
+
+
+# Global snapshot recorder instance
+_recorder = None
+_recorder_lock = Lock()
+
+
+def get_snapshot_recorder() -> SnapshotRecorder:
+    """Get the global snapshot recorder instance"""
+    global _recorder
+    if _recorder is None:
+        with _recorder_lock:
+            if _recorder is None:
+                _recorder = SnapshotRecorder()
+                atexit.register(_recorder.flush)
+    return _recorder
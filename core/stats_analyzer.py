@@ -1,52 +1,41 @@
 from pathlib import Path
-import json
 from datetime import datetime, timedelta
 import pandas as pd
-import matplotlib.pyplot as plt
-import seaborn as sns
+
+from core.stats_store import StatsStore
 
 class StatsAnalyzer:
     def __init__(self, days_to_analyze=30):
         self.stats_dir = Path("logs/stats")
         self.days_to_analyze = days_to_analyze
         self.aggregated_data = None
+        self.store = StatsStore(self.stats_dir)
         
     def load_stats(self):
-        """Load and aggregate stats from multiple days"""
-        all_stats = []
-        
-        # Get all stat files from the last N days
-        end_date = datetime.now()
-        start_date = end_date - timedelta(days=self.days_to_analyze)
-        
-        for date in pd.date_range(start_date, end_date):
-            stat_file = self.stats_dir / f"stats_{date.strftime('%Y-%m-%d')}.json"
-            if stat_file.exists():
-                with open(stat_file, 'r') as f:
-                    stats = json.load(f)
-                    stats['date'] = date.strftime('%Y-%m-%d')
-                    all_stats.append(stats)
-        
-        if not all_stats:
+        """Load one row per (date, function) for the last N days.
+
+        New or changed daily stats files are ingested into the SQLite store
+        first, so repeated loads only read what changed.
+        """
+        self.store.ingest()
+        start_date = (datetime.now() - timedelta(days=self.days_to_analyze)).strftime('%Y-%m-%d')
+        self.aggregated_data = pd.read_sql_query(
+            "SELECT * FROM function_stats WHERE date >= ? ORDER BY date",
+            self.store.conn,
+            params=(start_date,),
+        )
+        if self.aggregated_data.empty:
             print("No stats files found for analysis")
-            return
-        
-        # Convert to DataFrame for analysis
-        self.aggregated_data = pd.DataFrame(all_stats)
-        
-    def get_function_trends(self, function_name):
-        """Get trend data for a specific function"""
+
+    def _data(self):
         if self.aggregated_data is None:
             self.load_stats()
-            
-        function_data = []
-        for _, row in self.aggregated_data.iterrows():
-            if function_name in row['functions']:
-                func_stats = row['functions'][function_name]
-                func_stats['date'] = row['date']
-                function_data.append(func_stats)
+        return self.aggregated_data
         
-        return pd.DataFrame(function_data)
+    def get_function_trends(self, function_name):
+        """Get trend data for a specific function, one row per day"""
+        df = self._data()
+        return df[df['function'] == function_name].reset_index(drop=True)
     
     def plot_function_trend(self, function_name):
         """Plot success rate trend for a specific function"""
@@ -55,6 +44,9 @@ class StatsAnalyzer:
             print(f"No data found for function: {function_name}")
             return
             
+        import matplotlib.pyplot as plt
+        import seaborn as sns
+
         plt.figure(figsize=(12, 6))
         sns.set_style("whitegrid")
         
@@ -84,56 +76,30 @@ class StatsAnalyzer:
     
     def get_most_improved_functions(self, min_calls=10):
         """Get functions that have shown the most improvement"""
-        if self.aggregated_data is None:
-            self.load_stats()
-            
-        improvements = []
-        for _, row in self.aggregated_data.iterrows():
-            for func_name, stats in row['functions'].items():
-                if stats['calls'] >= min_calls:
-                    improvements.append({
-                        'function': func_name,
-                        'success_rate': stats['success_rate'],
-                        'calls': stats['calls'],
-                        'date': row['date']
-                    })
-        
-        df = pd.DataFrame(improvements)
+        df = self._data()
+        df = df[df['calls'] >= min_calls]
         if df.empty:
             return []
-            
-        # Calculate improvement (difference between first and last success rate)
-        improvements = []
-        for func in df['function'].unique():
-            func_data = df[df['function'] == func].sort_values('date')
-            if len(func_data) > 1:
-                improvement = func_data['success_rate'].iloc[-1] - func_data['success_rate'].iloc[0]
-                improvements.append({
-                    'function': func,
-                    'improvement': improvement,
-                    'current_rate': func_data['success_rate'].iloc[-1],
-                    'total_calls': func_data['calls'].sum()
-                })
-        
-        return sorted(improvements, key=lambda x: x['improvement'], reverse=True)
+
+        # Improvement is the difference between the first and last success rate
+        grouped = df.sort_values('date').groupby('function').agg(
+            first_rate=('success_rate', 'first'),
+            current_rate=('success_rate', 'last'),
+            days=('date', 'count'),
+            total_calls=('calls', 'sum'),
+        )
+        grouped = grouped[grouped['days'] > 1]
+        grouped['improvement'] = grouped['current_rate'] - grouped['first_rate']
+        return (
+            grouped.sort_values('improvement', ascending=False)
+            .reset_index()[['function', 'improvement', 'current_rate', 'total_calls']]
+            .to_dict('records')
+        )
     
     def get_most_reliable_functions(self, min_calls=10):
         """Get the most reliable functions based on success rate"""
-        if self.aggregated_data is None:
-            self.load_stats()
-            
-        reliability = []
-        for _, row in self.aggregated_data.iterrows():
-            for func_name, stats in row['functions'].items():
-                if stats['calls'] >= min_calls:
-                    reliability.append({
-                        'function': func_name,
-                        'success_rate': stats['success_rate'],
-                        'calls': stats['calls'],
-                        'date': row['date']
-                    })
-        
-        df = pd.DataFrame(reliability)
+        df = self._data()
+        df = df[df['calls'] >= min_calls]
         if df.empty:
             return []
             
@@ -144,6 +110,62 @@ class StatsAnalyzer:
         }).reset_index()
         
         return avg_rates.sort_values('success_rate', ascending=False).to_dict('records')
+
+    def get_latency_trends(self, function_name=None):
+        """Get daily call-weighted mean and worst p50/p95 latency (ms).
+
+        Args:
+            function_name: Limit to one function; all functions otherwise
+
+        Returns:
+            DataFrame with one row per (function, date)
+        """
+        df = self._data()
+        df = df[df['latency_count'] > 0]
+        if function_name:
+            df = df[df['function'] == function_name]
+        return df[[
+            'function', 'date', 'latency_count', 'latency_mean_ms',
+            'latency_p50_ms', 'latency_p95_ms', 'latency_max_ms',
+        ]].sort_values(['function', 'date']).reset_index(drop=True)
+
+    def get_slowest_functions(self, limit=5, min_calls=10):
+        """Get the functions with the highest call-weighted mean latency"""
+        df = self._data()
+        df = df[df['latency_count'] >= min_calls]
+        if df.empty:
+            return []
+        df = df.assign(total_ms=df['latency_mean_ms'] * df['latency_count'])
+        grouped = df.groupby('function').agg(
+            total_ms=('total_ms', 'sum'),
+            samples=('latency_count', 'sum'),
+            p95_ms=('latency_p95_ms', 'max'),
+        )
+        grouped['mean_ms'] = grouped['total_ms'] / grouped['samples']
+        return (
+            grouped.sort_values('mean_ms', ascending=False).head(limit)
+            .reset_index()[['function', 'mean_ms', 'p95_ms', 'samples']]
+            .to_dict('records')
+        )
+
+    def get_latency_changes(self, min_calls=10):
+        """Get each function's change in mean latency from its first to its latest day"""
+        df = self._data()
+        df = df[df['latency_count'] >= min_calls]
+        if df.empty:
+            return []
+        grouped = df.sort_values('date').groupby('function').agg(
+            first_ms=('latency_mean_ms', 'first'),
+            current_ms=('latency_mean_ms', 'last'),
+            days=('date', 'count'),
+        )
+        grouped = grouped[grouped['days'] > 1]
+        grouped['change_ms'] = grouped['current_ms'] - grouped['first_ms']
+        return (
+            grouped.sort_values('change_ms', ascending=False)
+            .reset_index()[['function', 'change_ms', 'current_ms', 'first_ms']]
+            .to_dict('records')
+        )
     
     def print_analysis(self):
         """Print comprehensive analysis of all tracked functions"""
@@ -172,6 +194,21 @@ class StatsAnalyzer:
                 print(f"  Current Success Rate: {func['current_rate']:.2f}%")
                 print(f"  Total Calls: {func['total_calls']}")
         
+        slowest = self.get_slowest_functions()
+        if slowest:
+            print("\n🐢 Slowest Functions:")
+            for func in slowest:
+                print(f"\n{func['function']}:")
+                print(f"  Mean Latency: {func['mean_ms']:.0f} ms")
+                print(f"  Worst Daily p95: {func['p95_ms']:.0f} ms")
+                print(f"  Samples: {func['samples']}")
+
+        changes = [c for c in self.get_latency_changes() if c['change_ms'] > 0]
+        if changes:
+            print("\n⚠️ Latency Regressions:")
+            for func in changes[:5]:
+                print(f"  {func['function']}: {func['first_ms']:.0f} ms -> {func['current_ms']:.0f} ms")
+
         # Generate trend plots for top functions
         print("\n📊 Generating trend plots for top functions...")
         for func in reliable[:5]:
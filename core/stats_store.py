@@ -0,0 +1,125 @@
+"""Long-format SQLite store for the daily stats files.
+
+``StatsTracker`` writes one nested JSON summary per day. ``StatsStore``
+flattens them into one row per (date, function) in ``logs/stats/stats.db`` so
+the analyses can run as single queries/groupbys over any date range. Files
+are ingested incrementally: a day is only re-read when its file's mtime or
+size changed since the last ingest.
+"""
+
+from pathlib import Path
+from threading import Lock
+import json
+import sqlite3
+
+from core.stats_tracker import summarize_latency
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS function_stats (
+    date TEXT NOT NULL,
+    function TEXT NOT NULL,
+    calls INTEGER NOT NULL,
+    success INTEGER NOT NULL,
+    failures INTEGER NOT NULL,
+    success_rate REAL NOT NULL,
+    latency_count INTEGER NOT NULL DEFAULT 0,
+    latency_mean_ms REAL,
+    latency_min_ms REAL,
+    latency_max_ms REAL,
+    latency_p50_ms REAL,
+    latency_p95_ms REAL,
+    PRIMARY KEY (date, function)
+);
+CREATE INDEX IF NOT EXISTS idx_function_stats_function ON function_stats (function, date);
+CREATE TABLE IF NOT EXISTS ingested_files (
+    path TEXT PRIMARY KEY,
+    mtime REAL NOT NULL,
+    size INTEGER NOT NULL
+);
+"""
+
+COLUMNS = (
+    "date", "function", "calls", "success", "failures", "success_rate",
+    "latency_count", "latency_mean_ms", "latency_min_ms", "latency_max_ms",
+    "latency_p50_ms", "latency_p95_ms",
+)
+
+
+class StatsStore:
+    """Incrementally ingested (date, function) table of daily stats."""
+
+    def __init__(self, stats_dir="logs/stats", db_path=None):
+        self.stats_dir = Path(stats_dir)
+        self.stats_dir.mkdir(exist_ok=True, parents=True)
+        self.db_path = Path(db_path) if db_path else self.stats_dir / "stats.db"
+        self._lock = Lock()
+        self.conn = sqlite3.connect(str(self.db_path), check_same_thread=False)
+        self.conn.executescript(_SCHEMA)
+
+    @staticmethod
+    def _rows_for_day(date, stats):
+        rows = []
+        for name, func in stats.get("functions", {}).items():
+            latency = summarize_latency(func.get("latency"))
+            rows.append((
+                date,
+                name,
+                func.get("calls", 0),
+                func.get("success", 0),
+                func.get("failures", 0),
+                func.get("success_rate", 0.0),
+                latency["count"],
+                latency.get("mean_ms"),
+                latency.get("min_ms"),
+                latency.get("max_ms"),
+                latency.get("p50_ms"),
+                latency.get("p95_ms"),
+            ))
+        return rows
+
+    def ingest(self):
+        """Load new or changed ``stats_<date>.json`` files.
+
+        Returns:
+            int: Number of files (re)ingested
+        """
+        with self._lock:
+            seen = dict(
+                (path, (mtime, size))
+                for path, mtime, size in self.conn.execute("SELECT path, mtime, size FROM ingested_files")
+            )
+            ingested = 0
+            with self.conn:
+                for stat_file in sorted(self.stats_dir.glob("stats_*.json")):
+                    st = stat_file.stat()
+                    key = str(stat_file)
+                    if seen.get(key) == (st.st_mtime, st.st_size):
+                        continue
+                    try:
+                        with open(stat_file, "r") as f:
+                            stats = json.load(f)
+                    except (OSError, ValueError) as e:
+                        print(f"⚠️ Skipping unreadable stats file {stat_file}: {str(e)}")
+                        continue
+                    date = stat_file.stem[len("stats_"):]
+                    self.conn.execute("DELETE FROM function_stats WHERE date = ?", (date,))
+                    self.conn.executemany(
+                        f"INSERT INTO function_stats ({', '.join(COLUMNS)}) "
+                        f"VALUES ({', '.join('?' for _ in COLUMNS)})",
+                        self._rows_for_day(date, stats),
+                    )
+                    self.conn.execute(
+                        "INSERT OR REPLACE INTO ingested_files (path, mtime, size) VALUES (?, ?, ?)",
+                        (key, st.st_mtime, st.st_size),
+                    )
+                    ingested += 1
+            return ingested
+
+    def query(self, sql, params=()):
+        """Run a read query and return the rows"""
+        with self._lock:
+            return self.conn.execute(sql, params).fetchall()
+
+    def close(self):
+        with self._lock:
+            self.conn.close()
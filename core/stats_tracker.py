@@ -1,36 +1,147 @@
 from datetime import datetime
+import atexit
 import json
+import os
+import time
 from pathlib import Path
+from threading import Lock
+
+# Upper bounds (ms) of the latency histogram buckets; the last bucket is open
+LATENCY_BUCKETS_MS = [50, 100, 250, 500, 1000, 2500, 5000, 10000, 30000, 60000]
+
+
+def summarize_latency(latency):
+    """Summarize a function's latency aggregate from a stats file.
+
+    Percentiles are the upper bound of the histogram bucket they fall in.
+
+    Returns:
+        dict with count, mean_ms, min_ms, max_ms, p50_ms, p95_ms and the
+        histogram, or just ``{"count": 0}`` when there are no samples
+    """
+    if not latency or not latency.get("count"):
+        return {"count": 0}
+    result = {
+        "count": latency["count"],
+        "mean_ms": latency["total_ms"] / latency["count"],
+        "min_ms": latency["min_ms"],
+        "max_ms": latency["max_ms"],
+        "buckets_ms": LATENCY_BUCKETS_MS,
+        "buckets": list(latency["buckets"]),
+    }
+    for name, pct in (("p50_ms", 0.5), ("p95_ms", 0.95)):
+        target = pct * latency["count"]
+        seen = 0
+        for i, count in enumerate(latency["buckets"]):
+            seen += count
+            if seen >= target:
+                result[name] = LATENCY_BUCKETS_MS[i] if i < len(LATENCY_BUCKETS_MS) else latency["max_ms"]
+                break
+    return result
+
 
 class StatsTracker:
-    def __init__(self):
-        self.stats_dir = Path("logs/stats")
+    """Function call statistics backed by an append-only event log.
+
+    Every tracked call is aggregated in memory and buffered as one line for
+    ``logs/stats/events_<date>.jsonl``. The buffer is flushed (and fsynced)
+    every ``flush_every`` events or ``flush_interval`` seconds, and at exit.
+    After each flush the aggregate is written atomically to
+    ``stats_<date>.json`` (the format ``StatsAnalyzer`` reads) together with
+    the event log offset it covers, so after a crash only the tail of the
+    log has to be replayed.
+    """
+
+    def __init__(self, stats_dir="logs/stats", flush_every=50, flush_interval=5.0):
+        self._lock = Lock()
+        self.stats_dir = Path(stats_dir)
         self.stats_dir.mkdir(exist_ok=True, parents=True)
         self.today = datetime.now().strftime('%Y-%m-%d')
         self.stats_file = self.stats_dir / f"stats_{self.today}.json"
+        self.events_file = self.stats_dir / f"events_{self.today}.jsonl"
+        self.flush_every = flush_every
+        self.flush_interval = flush_interval
+        self._pending = []
+        self._last_flush = time.monotonic()
         self.stats = self._load_stats()
-    
-    def _load_stats(self):
-        """Load existing stats or create new stats structure"""
-        if self.stats_file.exists():
-            with open(self.stats_file, 'r') as f:
-                return json.load(f)
+
+    def _empty_stats(self):
         return {
             "functions": {},
             "total_calls": 0,
             "total_success": 0,
             "total_failures": 0,
-            "last_updated": datetime.now().isoformat()
+            "last_updated": datetime.now().isoformat(),
+            "events_offset": 0,
         }
-    
+
+    def _load_stats(self):
+        """Load the last summary and replay any events logged after it"""
+        stats = self._empty_stats()
+        if self.stats_file.exists():
+            try:
+                with open(self.stats_file, 'r') as f:
+                    stats.update(json.load(f))
+            except ValueError:
+                # A torn summary; rebuild everything from the event log
+                stats = self._empty_stats()
+        self.stats = stats
+
+        if self.events_file.exists():
+            offset = stats.get("events_offset", 0)
+            if offset > self.events_file.stat().st_size:
+                # The log was rotated or truncated since the summary was
+                # written; the summary no longer matches it, so replay it all
+                stats = self.stats = self._empty_stats()
+                offset = 0
+            with open(self.events_file, 'rb') as f:
+                f.seek(offset)
+                for raw in f:
+                    if not raw.endswith(b"\n"):
+                        break  # partially written last line
+                    offset += len(raw)
+                    try:
+                        event = json.loads(raw)
+                    except ValueError:
+                        continue
+                    self._apply(event["f"], event["ok"], event.get("ms"))
+            if self.events_file.stat().st_size > offset:
+                # Drop a line torn by a crash so new events start on a fresh line
+                with open(self.events_file, 'r+b') as f:
+                    f.truncate(offset)
+            stats["events_offset"] = offset
+        else:
+            # New events start a fresh log
+            stats["events_offset"] = 0
+        return stats
+
     def _save_stats(self):
-        """Save current stats to file"""
+        """Write the summary atomically"""
         self.stats["last_updated"] = datetime.now().isoformat()
-        with open(self.stats_file, 'w') as f:
+        tmp = self.stats_file.with_suffix(".tmp")
+        with open(tmp, 'w') as f:
             json.dump(self.stats, f, indent=2)
-    
-    def track_function_call(self, function_name, success):
-        """Track a function call and its outcome"""
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp, self.stats_file)
+
+    def track_function_call(self, function_name, success, duration_ms=None):
+        """Track a function call, its outcome and optionally its latency"""
+        with self._lock:
+            self._track(function_name, success, duration_ms)
+            if (len(self._pending) >= self.flush_every
+                    or time.monotonic() - self._last_flush >= self.flush_interval):
+                self._flush()
+
+    def _track(self, function_name, success, duration_ms=None):
+        event = {"t": round(time.time(), 3), "f": function_name, "ok": bool(success)}
+        if duration_ms is not None:
+            event["ms"] = round(float(duration_ms), 1)
+        self._pending.append(json.dumps(event) + "\n")
+        self._apply(function_name, success, event.get("ms"))
+
+    def _apply(self, function_name, success, duration_ms=None):
+        """Add one call to the in-memory aggregate"""
         if function_name not in self.stats["functions"]:
             self.stats["functions"][function_name] = {
                 "calls": 0,
@@ -38,44 +149,89 @@ class StatsTracker:
                 "failures": 0,
                 "success_rate": 0.0
             }
-        
+
         func_stats = self.stats["functions"][function_name]
         func_stats["calls"] += 1
         self.stats["total_calls"] += 1
-        
+
         if success:
             func_stats["success"] += 1
             self.stats["total_success"] += 1
         else:
             func_stats["failures"] += 1
             self.stats["total_failures"] += 1
-        
+
         # Calculate success rate
         func_stats["success_rate"] = (func_stats["success"] / func_stats["calls"]) * 100
-        
+
+        if duration_ms is not None:
+            latency = func_stats.setdefault("latency", {
+                "count": 0,
+                "total_ms": 0.0,
+                "min_ms": None,
+                "max_ms": None,
+                "buckets": [0] * (len(LATENCY_BUCKETS_MS) + 1),
+            })
+            latency["count"] += 1
+            latency["total_ms"] += duration_ms
+            latency["min_ms"] = duration_ms if latency["min_ms"] is None else min(latency["min_ms"], duration_ms)
+            latency["max_ms"] = duration_ms if latency["max_ms"] is None else max(latency["max_ms"], duration_ms)
+            bucket = len(LATENCY_BUCKETS_MS)
+            for i, bound in enumerate(LATENCY_BUCKETS_MS):
+                if duration_ms <= bound:
+                    bucket = i
+                    break
+            latency["buckets"][bucket] += 1
+
+    def _flush(self):
+        """Append buffered events, fsync them, then rewrite the summary"""
+        self._last_flush = time.monotonic()
+        if not self._pending:
+            return
+        data = "".join(self._pending).encode("utf-8")
+        with open(self.events_file, 'ab') as f:
+            f.write(data)
+            f.flush()
+            os.fsync(f.fileno())
+        self._pending = []
+        self.stats["events_offset"] = self.stats.get("events_offset", 0) + len(data)
         self._save_stats()
-    
+
+    def flush(self):
+        """Write any buffered events now"""
+        with self._lock:
+            self._flush()
+
     def get_function_stats(self, function_name):
         """Get statistics for a specific function"""
-        return self.stats["functions"].get(function_name, {
-            "calls": 0,
-            "success": 0,
-            "failures": 0,
-            "success_rate": 0.0
-        })
-    
+        with self._lock:
+            return self.stats["functions"].get(function_name, {
+                "calls": 0,
+                "success": 0,
+                "failures": 0,
+                "success_rate": 0.0
+            })
+
+    def get_latency_stats(self, function_name):
+        """Get latency count, mean, min, max and approximate p50/p95 in ms"""
+        with self._lock:
+            latency = self.stats["functions"].get(function_name, {}).get("latency")
+            return summarize_latency(latency)
+
     def get_overall_stats(self):
         """Get overall statistics"""
-        return {
-            "total_calls": self.stats["total_calls"],
-            "total_success": self.stats["total_success"],
-            "total_failures": self.stats["total_failures"],
-            "overall_success_rate": (self.stats["total_success"] / self.stats["total_calls"] * 100) if self.stats["total_calls"] > 0 else 0.0
-        }
-    
+        with self._lock:
+            return {
+                "total_calls": self.stats["total_calls"],
+                "total_success": self.stats["total_success"],
+                "total_failures": self.stats["total_failures"],
+                "overall_success_rate": (self.stats["total_success"] / self.stats["total_calls"] * 100) if self.stats["total_calls"] > 0 else 0.0
+            }
+
     def get_most_failed_functions(self, limit=5):
         """Get the functions with the highest failure rates"""
-        functions = self.stats["functions"].items()
+        with self._lock:
+            functions = list(self.stats["functions"].items())
         sorted_functions = sorted(
             functions,
             key=lambda x: (x[1]["failures"] / x[1]["calls"]) if x[1]["calls"] > 0 else 0,
@@ -85,9 +241,13 @@ class StatsTracker:
 
 # Global stats tracker instance
 _stats_tracker = None
+_stats_tracker_lock = Lock()
 
 def get_stats_tracker():
     global _stats_tracker
     if _stats_tracker is None:
-        _stats_tracker = StatsTracker()
-    return _stats_tracker 
\ No newline at end of file
+        with _stats_tracker_lock:
+            if _stats_tracker is None:
+                _stats_tracker = StatsTracker()
+                atexit.register(_stats_tracker.flush)
+    return _stats_tracker
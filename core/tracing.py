@@ -0,0 +1,209 @@
+"""Per-step latency tracing for the claim pipeline.
+
+Wrap a step in :func:`trace_span` or decorate it with :func:`traced` and one
+JSON record per call is appended to ``logs/traces/trace_<date>.jsonl``::
+
+    {"ts": "...", "span": "ClaimPage.set_doctor", "stage": "claim",
+     "invoice_id": "12345", "worker": "worker-2", "duration_ms": 2310.4,
+     "wait_ms": 1480.0, "retries": 1, "outcome": "ok", "parent": "claim"}
+
+``wait_ms`` is the time spent in the ``BasePage`` wait helpers (``settle`` and
+friends) while the step ran. The invoice ID and worker come from the
+thread-local :func:`trace_context` the runners in ``core.workflow`` open around
+every invoice. Each span is also counted in ``StatsTracker``.
+
+Set ``AGENT_TRACE=0`` to turn tracing off.
+"""
+
+from typing import Any, Callable, Dict, List, Optional
+from contextlib import contextmanager
+from datetime import datetime
+from functools import wraps
+from pathlib import Path
+from threading import Lock, local
+import json
+import os
+import time
+
+from core.logger import get_logger
+from core.stats_tracker import get_stats_tracker
+
+_state = local()
+
+
+def _stack() -> List["Span"]:
+    if not hasattr(_state, "spans"):
+        _state.spans = []
+    return _state.spans
+
+
+@contextmanager
+def trace_context(invoice_id: Optional[str] = None, worker: Optional[str] = None):
+    """Tag every span opened by this thread inside the block."""
+    previous = (getattr(_state, "invoice_id", None), getattr(_state, "worker", None))
+    _state.invoice_id = str(invoice_id) if invoice_id is not None else previous[0]
+    _state.worker = worker if worker is not None else previous[1]
+    try:
+        yield
+    finally:
+        _state.invoice_id, _state.worker = previous
+
+
+def get_trace_context():
+    """Return the ``(invoice_id, worker)`` set by :func:`trace_context` on this thread."""
+    return getattr(_state, "invoice_id", None), getattr(_state, "worker", None)
+
+
+class TraceWriter:
+    """Appends span records to the day's trace file. Safe across threads."""
+
+    def __init__(self, trace_dir: str = "logs/traces"):
+        self.trace_dir = Path(trace_dir)
+        self.trace_dir.mkdir(parents=True, exist_ok=True)
+        self._lock = Lock()
+
+    @property
+    def trace_file(self) -> Path:
+        """The current day's trace file, so a run past midnight rolls over."""
+        return self.trace_dir / f"trace_{datetime.now().strftime('%Y-%m-%d')}.jsonl"
+
+    def write(self, record: Dict[str, Any]) -> None:
+        line = json.dumps(record, default=str) + "\n"
+        with self._lock:
+            with open(self.trace_file, "a") as f:
+                f.write(line)
+
+
+class Span:
+    """One traced step. Use :meth:`retry` to count retries inside the step."""
+
+    def __init__(self, name: str, stage: Optional[str] = None, page: Any = None):
+        parent = current_span()
+        self.name = name
+        self.stage = stage or (parent.stage if parent else None)
+        self.parent = parent.name if parent else None
+        self.page = page
+        self.retries = 0
+        self.child_wait_ms = 0.0
+        self.outcome = "ok"
+        self.error: Optional[str] = None
+
+    def retry(self) -> None:
+        self.retries += 1
+
+    def __enter__(self):
+        self.start = time.perf_counter()
+        self.wait_start = getattr(self.page, "wait_time_ms", None)
+        _stack().append(self)
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        duration_ms = (time.perf_counter() - self.start) * 1000
+        stack = _stack()
+        if stack and stack[-1] is self:
+            stack.pop()
+
+        if self.wait_start is not None:
+            wait_ms = getattr(self.page, "wait_time_ms", self.wait_start) - self.wait_start
+        else:
+            wait_ms = self.child_wait_ms
+        parent = current_span()
+        if parent is not None and parent.page is None:
+            parent.child_wait_ms += wait_ms
+
+        if exc_type is not None:
+            self.outcome = "error"
+            self.error = str(exc)
+
+        record = {
+            "ts": datetime.now().isoformat(),
+            "span": self.name,
+            "stage": self.stage,
+            "invoice_id": getattr(_state, "invoice_id", None),
+            "worker": getattr(_state, "worker", None),
+            "duration_ms": round(duration_ms, 1),
+            "wait_ms": round(wait_ms, 1),
+            "retries": self.retries,
+            "outcome": self.outcome,
+            "parent": self.parent,
+        }
+        if self.error:
+            record["error"] = self.error
+        _emit(record)
+        return False
+
+
+def current_span() -> Optional[Span]:
+    """Return the innermost open span on this thread."""
+    stack = _stack()
+    return stack[-1] if stack else None
+
+
+def note_retry() -> None:
+    """Count a retry against the innermost open span, if any."""
+    span = current_span()
+    if span is not None:
+        span.retry()
+
+
+def trace_span(name: str, stage: Optional[str] = None, page: Any = None) -> Span:
+    """Context manager that times a step and writes its span record.
+
+    Args:
+        name: Span name, e.g. ``"ClaimPage.fill_pricing"``
+        stage: Pipeline stage; inherited from the enclosing span if omitted
+        page: Page object whose ``wait_time_ms`` is used for ``wait_ms``
+    """
+    return Span(name, stage, page)
+
+
+def traced(name: Optional[str] = None, stage: Optional[str] = None) -> Callable:
+    """Decorator form of :func:`trace_span`.
+
+    On methods of ``BasePage`` subclasses the span name defaults to
+    ``Class.method`` and the page's wait time is recorded. A ``False`` return
+    value is recorded with outcome ``"failed"``.
+    """
+    def decorator(func):
+        @wraps(func)
+        def wrapper(*args, **kwargs):
+            if not tracing_enabled():
+                return func(*args, **kwargs)
+            owner = args[0] if args and hasattr(args[0], "wait_time_ms") else None
+            span_name = name or (f"{type(owner).__name__}.{func.__name__}" if owner else func.__name__)
+            with trace_span(span_name, stage, owner) as span:
+                result = func(*args, **kwargs)
+                if result is False:
+                    span.outcome = "failed"
+                return result
+        return wrapper
+    return decorator
+
+
+# Global trace writer instance
+_writer = None
+_writer_lock = Lock()
+
+
+def tracing_enabled() -> bool:
+    return os.getenv("AGENT_TRACE", "1").lower() not in ("0", "false", "no")
+
+
+def get_trace_writer() -> TraceWriter:
+    """Get the global trace writer instance"""
+    global _writer
+    if _writer is None:
+        with _writer_lock:
+            if _writer is None:
+                _writer = TraceWriter()
+    return _writer
+
+
+def _emit(record: Dict[str, Any]) -> None:
+    if not tracing_enabled():
+        return
+    try:
+        get_trace_writer().write(record)
+        get_stats_tracker().track_function_call(record["span"], record["outcome"] == "ok", record["duration_ms"])
+    except Exception as e:
+        get_logger().log_error(f"Failed to write trace record: {str(e)}")
@@ -0,0 +1,742 @@
+"""Claim submission workflow shared by ``main.py`` and the batch runner.
+
+The single-invoice flow that used to live inline in ``main.py`` is split into
+stage functions so it can be driven once per invoice from a queue:
+
+``rev_scrape`` -> ``member_search`` -> ``authorization`` -> ``claim``
+
+``BatchRunner`` runs the stages back to back, ``PipelineRunner`` overlaps the
+Rev and VSP halves on separate browsers and ``WorkerPool`` runs several
+independent browser workers against one queue.
+"""
+
+from typing import Any, Callable, Dict, Iterable, List, Optional, Tuple, Union
+from datetime import datetime
+from pathlib import Path
+from queue import Empty, Full, Queue
+from threading import Event, Lock, Thread
+import json
+import math
+import os
+import time
+from urllib.parse import urlparse
+
+from core.base import Patient, PatientManager
+from core.logger import Logger
+from core.session_cache import PORTAL_DOMAINS
+from core.tracing import trace_context, trace_span
+from core.utils import get_claim_service_flags
+
+STAGES = ("rev_scrape", "member_search", "authorization", "claim")
+
+
+# ----------------------------------------------------------------------
+# Pipeline stages
+# ----------------------------------------------------------------------
+
+def open_invoice_by_id(rev, invoice_id: str) -> None:
+    """Search for a single invoice in Rev and open it.
+
+    Filtering by invoice number keeps the results grid to one row, so the
+    lookup cost does not grow with the size of the queue.
+    """
+    rev.invoice_page.navigate_to_invoices_page()
+    rev.invoice_page.search_invoice(invoice_number=invoice_id)
+    rev.invoice_page.settle(2, selector='.ag-center-cols-container [col-id="id"]', network_idle=True)
+    if not rev.invoice_page.open_invoice(invoice_id):
+        raise Exception(f"Invoice {invoice_id} not found in search results")
+
+
+def scrape_invoice(rev, invoice_id: str) -> Patient:
+    """Open ``invoice_id`` in Rev and scrape everything VSP submission needs.
+
+    Args:
+        rev: Logged in ``RevSession``
+        invoice_id: Invoice number to open
+
+    Returns:
+        Patient: Fully populated patient for the invoice
+    """
+    open_invoice_by_id(rev, invoice_id)
+    patient = rev.invoice_page.create_patient_from_invoice()
+    patient.medical_data['invoice_id'] = str(invoice_id)
+    rev.invoice_page.scrape_invoice_details(patient)
+    rev.invoice_page.click_patient_name_link()
+    rev.patient_page.scrape_demographics(patient)
+    rev.patient_page.scrape_family_demographics(patient)
+    rev.patient_page.expand_insurance()
+    rev.insurance_tab.select_insurance("VSP")
+    rev.insurance_tab.scrape_insurance(patient)
+    rev.patient_page.click_patient_summary_menu()
+    if patient.has_optical_order:
+        rev.patient_page.expand_optical_orders()
+        rev.patient_page.settle(2, network_idle=True, dom_stable=True)
+        rev.patient_page.open_optical_order(patient)
+        rev.optical_order.scrape_frame_data(patient)
+        rev.optical_order.scrape_lens_data(patient)
+        rev.optical_order.scrape_optical_copay(patient)
+        rev.products.navigate_to_products()
+        rev.products.get_wholesale_price(patient)
+    return patient
+
+
+def search_member(vsp, patient: Patient) -> None:
+    """Find the patient in VSP member search.
+
+    Raises:
+        Exception: If the member cannot be found
+    """
+    member_found = vsp.member_search_page.search_member(patient)
+    if not member_found:
+        raise Exception("Member not found, skipping authorization")
+    vsp.authorization_page.settle(2, network_idle=True, dom_stable=True)
+
+
+def authorize(vsp, patient: Patient, flags: Dict[str, bool]) -> Dict[str, bool]:
+    """Select the patient, then issue or reuse a VSP authorization.
+
+    Args:
+        vsp: Logged in ``VspSession`` positioned on the member search results
+        patient: Patient being submitted
+        flags: Service flags from ``get_claim_service_flags``
+
+    Returns:
+        Dict[str, bool]: The service flags, adjusted when only the exam can be
+        submitted under the patient's plan.
+
+    Raises:
+        Exception: If the plan is not one we know how to handle
+    """
+    vsp.authorization_page.select_patient(patient)
+    vsp.authorization_page.settle(1, network_idle=True, dom_stable=True)
+
+    auth_status = vsp.authorization_page.select_services_for_patient(patient)
+    vsp.authorization_page.settle(.5)
+    print(f'auth_status: {auth_status}')
+    if auth_status == "unavailable" or auth_status == "exam_authorized":
+
+        vsp.authorization_page.get_plan_name(patient)
+        #check the plan name from the insurance data
+        vsp.authorization_page.settle(.5)
+        if patient.insurance_data['plan_name'] == "VSP Exam Plus Plan":
+            #set the patient copay to 0
+            patient.insurance_data['copay'] = "0.00"
+            patient.print_data()
+            print("Plan is VSP Exam Plus Plan, submitting just exam")
+            vsp.authorization_page.get_exam_service() #THIS STILL NEEDS TO CHECK IF THE EXAM IS AVAILABLE FOR AUTHORIZATION
+            if auth_status == "unavailable":
+                vsp.authorization_page.issue_authorization(patient)
+                vsp.authorization_page.get_confirmation_number()
+                vsp.authorization_page.navigate_to_claim()
+            else:
+                print("Exam is authorized, skipping authorization")
+                vsp.authorization_page.navigate_to_authorizations()
+                vsp.authorization_page.select_authorization(patient)
+
+            #unflag frame lens and contacts
+            flags["frame"] = False
+            flags["lens"] = False
+            flags["contacts"] = False
+
+        else:
+            print("Plan name is not familiar, skipping authorization")
+            raise Exception("Plan name is not familiar, skipping authorization")
+
+    elif auth_status == "use_existing":
+        vsp.authorization_page.settle(.5)
+        print("Services already authorized for patient")
+        vsp.authorization_page.navigate_to_authorizations()
+        vsp.authorization_page.settle(.5)
+        vsp.authorization_page.select_authorization(patient)
+    elif auth_status == "delete_existing":
+        print("Services already authorized for patient")
+        vsp.authorization_page.navigate_to_authorizations()
+        vsp.authorization_page.settle(.5)
+        vsp.authorization_page.delete_authorization(patient)
+        vsp.authorization_page.settle(.5)
+        vsp.authorization_page.select_patient(patient)
+        vsp.authorization_page.settle(.5)
+        vsp.authorization_page.select_services_for_patient(patient)
+        vsp.authorization_page.settle(.5)
+        vsp.authorization_page.issue_authorization(patient)
+        vsp.authorization_page.settle(.5)
+        vsp.authorization_page.get_confirmation_number()
+        vsp.authorization_page.settle(.5)
+        vsp.authorization_page.navigate_to_claim()
+    elif auth_status == "issue":
+        print("Services not yet authorized for patient")
+        vsp.authorization_page.select_services_for_patient(patient)
+        vsp.authorization_page.issue_authorization(patient)
+        vsp.authorization_page.settle(.5)
+        vsp.authorization_page.get_confirmation_number()
+        vsp.authorization_page.settle(.5)
+        vsp.authorization_page.navigate_to_claim()
+
+    return flags
+
+
+def submit_claim(vsp, patient: Patient, flags: Dict[str, bool]) -> bool:
+    """Fill out and submit the VSP claim form.
+
+    Returns:
+        bool: True if VSP accepted the claim
+    """
+    vsp.claim_page.settle(2, selector='#date-of-service', network_idle=True)
+    vsp.claim_page.set_dos(patient)
+    vsp.claim_page.set_doctor(patient)
+
+    # Exam submission
+    if flags["exam"]:
+        vsp.claim_page.submit_exam(patient)
+
+    # Glasses related processing
+    if flags["lens"]:
+        vsp.claim_page.submit_frame(patient)
+        vsp.claim_page.submit_lens(patient)
+        vsp.claim_page.send_rx(patient)
+
+    # Contact lens materials or services
+    if flags["contacts"]:
+        vsp.claim_page.submit_cl(patient)
+    vsp.claim_page.settle(.5)
+    vsp.claim_page.disease_reporting(patient)
+    vsp.claim_page.settle(.5)
+    vsp.claim_page.calculate(patient)
+    vsp.claim_page.settle(.5)
+    vsp.claim_page.fill_pricing(patient)
+    vsp.claim_page.settle(.5)
+    vsp.claim_page.set_gender(patient)
+    vsp.claim_page.settle(.5)
+    vsp.claim_page.fill_address(patient)
+    vsp.claim_page.settle(.5)
+    return vsp.claim_page.click_submit_claim()
+
+
+def submit_to_vsp(vsp, patient: Patient, timer: Optional["StageTimer"] = None) -> bool:
+    """Run the VSP half of the pipeline for an already scraped patient.
+
+    Args:
+        vsp: Logged in ``VspSession``
+        patient: Patient returned by ``scrape_invoice``
+        timer: Optional ``StageTimer`` used to record stage durations
+
+    Returns:
+        bool: True if the claim was submitted
+    """
+    timer = timer or StageTimer()
+    flags = get_claim_service_flags(patient)
+    with timer.stage("member_search"):
+        search_member(vsp, patient)
+    with timer.stage("authorization"):
+        flags = authorize(vsp, patient, flags)
+    with timer.stage("claim"):
+        return submit_claim(vsp, patient, flags)
+
+
+def reset_rev(rev) -> None:
+    """Close the patient, order and invoice tabs left open by one invoice."""
+    for close in (
+        lambda: rev.patient_page.close_patient_tab(close_all=True),
+        lambda: rev.invoice_page.close_invoice_tabs(close_all=True),
+    ):
+        try:
+            close()
+        except Exception as e:
+            rev.logger.log_error(f"Failed to reset Rev tabs: {str(e)}")
+
+
+def reset_vsp(vsp) -> None:
+    """Return VSP to a clean member search after a failed invoice.
+
+    Closes VSP popups (e.g. the claim report window) left open in the
+    context, dismisses any open modal and navigates back to member search,
+    so the next invoice does not start from a half-filled claim form.
+    """
+    page = vsp.page
+    try:
+        for other in list(page.context.pages):
+            host = urlparse(other.url).hostname or ""
+            if other is not page and any(host == d or host.endswith("." + d) for d in PORTAL_DOMAINS["vsp"]):
+                other.close()
+    except Exception as e:
+        vsp.logger.log_error(f"Failed to close VSP popups: {str(e)}")
+    try:
+        page.keyboard.press("Escape")
+        vsp.member_search_page.navigate_to_member_search()
+    except Exception as e:
+        vsp.logger.log_error(f"Failed to reset VSP to member search: {str(e)}")
+
+
+# ----------------------------------------------------------------------
+# Timing helpers
+# ----------------------------------------------------------------------
+
+def percentile(values: List[float], pct: float) -> float:
+    """Return the ``pct`` percentile of ``values`` using the nearest-rank method."""
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    rank = max(1, math.ceil(pct / 100.0 * len(ordered)))
+    return ordered[min(rank, len(ordered)) - 1]
+
+
+class StageTimer:
+    """Collect wall-clock durations per pipeline stage."""
+
+    def __init__(self):
+        self.durations: Dict[str, List[float]] = {stage: [] for stage in STAGES}
+        self.current_stage: Optional[str] = None
+
+    def stage(self, name: str):
+        return _StageContext(self, name)
+
+    def record(self, name: str, seconds: float) -> None:
+        self.durations.setdefault(name, []).append(seconds)
+
+    def merge(self, other: "StageTimer") -> None:
+        for name, values in other.durations.items():
+            self.durations.setdefault(name, []).extend(values)
+
+    def summary(self) -> Dict[str, Dict[str, float]]:
+        """Return count, p50 and p95 (seconds) for every stage with samples."""
+        return {
+            name: {
+                "count": len(values),
+                "p50": percentile(values, 50),
+                "p95": percentile(values, 95),
+            }
+            for name, values in self.durations.items()
+            if values
+        }
+
+
+class _StageContext:
+    def __init__(self, timer: StageTimer, name: str):
+        self.timer = timer
+        self.name = name
+
+    def __enter__(self):
+        self.timer.current_stage = self.name
+        self.span = trace_span(self.name, stage=self.name).__enter__()
+        self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.timer.record(self.name, time.perf_counter() - self.start)
+        self.span.__exit__(exc_type, exc, tb)
+        # Leave current_stage pointing at the failing stage on error
+        if exc_type is None:
+            self.timer.current_stage = None
+        return False
+
+
+# ----------------------------------------------------------------------
+# Batch runner
+# ----------------------------------------------------------------------
+
+class BatchProgress:
+    """Resumable per-invoice progress stored as JSON.
+
+    The file maps invoice IDs to their last outcome so a restarted run can
+    skip invoices that were already submitted.
+    """
+
+    def __init__(self, path: Union[str, Path]):
+        self.path = Path(path)
+        self.path.parent.mkdir(exist_ok=True, parents=True)
+        self.records: Dict[str, Dict[str, Any]] = self._load()
+
+    def _load(self) -> Dict[str, Dict[str, Any]]:
+        if self.path.exists():
+            try:
+                with open(self.path, 'r') as f:
+                    return json.load(f)
+            except json.JSONDecodeError:
+                return {}
+        return {}
+
+    def save(self) -> None:
+        """Write progress atomically so a crash never leaves a torn file."""
+        tmp_path = self.path.with_suffix(self.path.suffix + ".tmp")
+        with open(tmp_path, 'w') as f:
+            json.dump(self.records, f, indent=2)
+        os.replace(tmp_path, self.path)
+
+    def is_done(self, invoice_id: str, retry_failed: bool = False) -> bool:
+        record = self.records.get(str(invoice_id))
+        if not record:
+            return False
+        if record["status"] == "submitted":
+            return True
+        return not retry_failed
+
+    def mark(self, invoice_id: str, status: str, stage: Optional[str] = None,
+             error: Optional[str] = None, seconds: Optional[float] = None) -> None:
+        self.records[str(invoice_id)] = {
+            "status": status,
+            "stage": stage,
+            "error": error,
+            "seconds": round(seconds, 2) if seconds is not None else None,
+            "finished_at": datetime.now().isoformat(),
+        }
+        self.save()
+
+
+def load_invoice_ids(source: Union[str, Path, Iterable[Any]]) -> List[str]:
+    """Normalise an invoice queue into a list of unique invoice IDs.
+
+    Args:
+        source: Either the list returned by
+            ``InvoicePage.scrape_all_search_results()``, an iterable of invoice
+            IDs, or a path to a text file with one invoice ID per line
+            (blank lines and ``#`` comments are ignored).
+
+    Returns:
+        List[str]: Invoice IDs in queue order with duplicates removed
+    """
+    if isinstance(source, (str, Path)):
+        with open(source, 'r') as f:
+            items = [line.split('#')[0].strip() for line in f]
+    else:
+        items = [
+            item.get("invoice_id", "") if isinstance(item, dict) else item
+            for item in source
+        ]
+
+    invoice_ids: List[str] = []
+    seen = set()
+    for item in items:
+        invoice_id = str(item).strip()
+        if invoice_id and invoice_id not in seen:
+            seen.add(invoice_id)
+            invoice_ids.append(invoice_id)
+    return invoice_ids
+
+
+class BatchRunner:
+    """Drive a queue of invoices through Rev scraping and VSP submission.
+
+    Each invoice runs in isolation: a failure is recorded in the progress file
+    along with the stage it happened in, the sessions are reset and the
+    runner moves on to the next invoice.
+    """
+
+    def __init__(
+        self,
+        rev,
+        vsp,
+        logger: Optional[Logger] = None,
+        progress_file: Union[str, Path, None] = None,
+        retry_failed: bool = False,
+    ):
+        self.rev = rev
+        self.vsp = vsp
+        self.logger = logger or rev.logger
+        if progress_file is None:
+            today = datetime.now().strftime('%Y-%m-%d')
+            progress_file = Path("logs/batch") / f"progress_{today}.json"
+        self.progress = BatchProgress(progress_file)
+        self.retry_failed = retry_failed
+        self.timer = StageTimer()
+        self.results: Dict[str, int] = {"submitted": 0, "failed": 0, "skipped": 0}
+        self.elapsed = 0.0
+        self._lock = Lock()
+
+    def _pending(self, source: Union[str, Path, Iterable[Any]]) -> List[str]:
+        """Return the invoice IDs from ``source`` that still need processing."""
+        invoice_ids = load_invoice_ids(source)
+        pending = [i for i in invoice_ids if not self.progress.is_done(i, self.retry_failed)]
+        self.results["skipped"] += len(invoice_ids) - len(pending)
+        self.logger.log(
+            f"[batch] {len(pending)} invoice(s) queued, {len(invoice_ids) - len(pending)} already done"
+        )
+        return pending
+
+    def _record(self, invoice_id: str, timer: StageTimer, status: str,
+                stage: Optional[str], error: Optional[str], seconds: float,
+                logger: Optional[Logger] = None) -> None:
+        """Store the outcome of one invoice. Safe to call from any lane or worker."""
+        if error:
+            (logger or self.logger).log_error(f"[batch] Invoice {invoice_id} failed in {stage}: {error}")
+        with self._lock:
+            self.timer.merge(timer)
+            self.progress.mark(invoice_id, status, stage, error, seconds)
+            self.results[status] += 1
+
+    def process_invoice(self, invoice_id: str) -> bool:
+        """Scrape and submit a single invoice, recording the outcome."""
+        return self._process(self.rev, self.vsp, invoice_id, self.logger)
+
+    def _process(self, rev, vsp, invoice_id: str, logger: Logger) -> bool:
+        timer = StageTimer()
+        start = time.perf_counter()
+        patient = None
+        status, stage, error = "failed", None, None
+        with trace_context(invoice_id, worker=getattr(logger, "prefix", None)):
+            try:
+                logger.log(f"[batch] Processing invoice {invoice_id}")
+                with timer.stage("rev_scrape"):
+                    patient = scrape_invoice(rev, invoice_id)
+                if submit_to_vsp(vsp, patient, timer):
+                    status = "submitted"
+                else:
+                    stage, error = "claim", "Claim submission was blocked"
+            except Exception as e:
+                stage, error = timer.current_stage, str(e)
+            finally:
+                reset_rev(rev)
+                if patient is not None:
+                    rev.patient_manager.remove_patient(patient.first_name, patient.last_name, patient)
+                    # The VSP stages ran; don't let a failure leak into the next invoice
+                    if status != "submitted":
+                        reset_vsp(vsp)
+
+        self._record(invoice_id, timer, status, stage, error, time.perf_counter() - start, logger)
+        return status == "submitted"
+
+    def run(self, source: Union[str, Path, Iterable[Any]]) -> Dict[str, Any]:
+        """Process every invoice in ``source`` and return the throughput summary."""
+        invoice_ids = self._pending(source)
+        start = time.perf_counter()
+        for invoice_id in invoice_ids:
+            self.process_invoice(invoice_id)
+        self.elapsed = time.perf_counter() - start
+        summary = self.summary()
+        self.logger.log(f"[batch] Summary: {json.dumps(summary)}")
+        return summary
+
+    def summary(self) -> Dict[str, Any]:
+        """Return invoice counts, invoices/hour and p50/p95 per stage."""
+        return build_summary(self.results, self.elapsed, self.timer)
+
+
+class PipelineRunner(BatchRunner):
+    """Two-lane runner that overlaps Rev scraping with VSP submission.
+
+    The Rev lane runs in a background thread with its own browser (Playwright's
+    sync API cannot share pages across threads) and fills a bounded queue with
+    fully scraped patients. The VSP lane consumes the queue on the calling
+    thread, so while VSP submits invoice N, Rev is already scraping N+1.
+    """
+
+    _DONE = object()
+
+    def __init__(
+        self,
+        vsp,
+        rev_factory: Callable[[], Tuple[Any, Callable[[], None]]],
+        logger: Optional[Logger] = None,
+        progress_file: Union[str, Path, None] = None,
+        retry_failed: bool = False,
+        queue_size: int = 2,
+    ):
+        """
+        Args:
+            vsp: Logged in ``VspSession`` owned by the calling thread
+            rev_factory: Called on the Rev lane thread; must return a logged in
+                ``RevSession`` and a callable that tears its browser down
+            logger: Logger instance, defaults to the VSP session logger
+            progress_file: Progress file used to resume interrupted runs
+            retry_failed: Retry invoices that failed in a previous run
+            queue_size: Maximum number of scraped patients waiting for VSP
+        """
+        super().__init__(None, vsp, logger or vsp.logger, progress_file, retry_failed)
+        self.rev_factory = rev_factory
+        self.queue: "Queue" = Queue(maxsize=queue_size)
+        self._stop = Event()
+
+    def _put(self, item) -> bool:
+        """Block until the VSP lane has room, unless the run is stopping."""
+        while not self._stop.is_set():
+            try:
+                self.queue.put(item, timeout=1)
+                return True
+            except Full:
+                continue
+        return False
+
+    def _rev_lane(self, invoice_ids: List[str]) -> None:
+        close = None
+        try:
+            rev, close = self.rev_factory()
+            for invoice_id in invoice_ids:
+                if self._stop.is_set():
+                    break
+                timer = StageTimer()
+                start = time.perf_counter()
+                try:
+                    self.logger.log(f"[rev lane] Scraping invoice {invoice_id}")
+                    with trace_context(invoice_id, worker="rev-lane"), timer.stage("rev_scrape"):
+                        patient = scrape_invoice(rev, invoice_id)
+                except Exception as e:
+                    self._record(invoice_id, timer, "failed", "rev_scrape", str(e),
+                                 time.perf_counter() - start)
+                    continue
+                finally:
+                    reset_rev(rev)
+                rev.patient_manager.remove_patient(patient.first_name, patient.last_name, patient)
+                if not self._put((invoice_id, patient, timer, time.perf_counter() - start)):
+                    break
+        except Exception as e:
+            self.logger.log_error(f"[rev lane] Stopped: {str(e)}")
+        finally:
+            if close:
+                close()
+            self._put(self._DONE)
+
+    def _vsp_lane(self) -> None:
+        while True:
+            wait_start = time.perf_counter()
+            item = self.queue.get()
+            if item is self._DONE:
+                break
+            invoice_id, patient, timer, scrape_seconds = item
+            timer.record("vsp_queue_wait", time.perf_counter() - wait_start)
+            start = time.perf_counter()
+            status, stage, error = "failed", None, None
+            try:
+                self.logger.log(f"[vsp lane] Submitting invoice {invoice_id}")
+                with trace_context(invoice_id, worker="vsp-lane"):
+                    submitted = submit_to_vsp(self.vsp, patient, timer)
+                if submitted:
+                    status = "submitted"
+                else:
+                    stage, error = "claim", "Claim submission was blocked"
+            except Exception as e:
+                stage, error = timer.current_stage, str(e)
+            finally:
+                if status != "submitted":
+                    reset_vsp(self.vsp)
+            self._record(invoice_id, timer, status, stage, error,
+                         scrape_seconds + time.perf_counter() - start)
+
+    def run(self, source: Union[str, Path, Iterable[Any]]) -> Dict[str, Any]:
+        """Process every invoice in ``source`` with both lanes running."""
+        invoice_ids = self._pending(source)
+        start = time.perf_counter()
+        rev_thread = Thread(target=self._rev_lane, args=(invoice_ids,), name="rev-lane", daemon=True)
+        rev_thread.start()
+        try:
+            self._vsp_lane()
+        finally:
+            self._stop.set()
+            rev_thread.join()
+        self.elapsed = time.perf_counter() - start
+        summary = self.summary()
+        self.logger.log(f"[pipeline] Summary: {json.dumps(summary)}")
+        return summary
+
+
+class WorkerPool(BatchRunner):
+    """Process the invoice queue with N independent browser workers.
+
+    Every worker thread launches its own browser context with its own
+    ``RevSession``/``VspSession`` pair and pulls invoices from a shared queue
+    until it is empty, so slow invoices do not hold up the other workers.
+    Workers log through a prefixed logger and share one ``PatientManager``.
+    """
+
+    def __init__(
+        self,
+        session_factory: Callable[[Logger, PatientManager], Tuple[Any, Any, Callable[[], None]]],
+        logger: Logger,
+        workers: int = 2,
+        progress_file: Union[str, Path, None] = None,
+        retry_failed: bool = False,
+    ):
+        """
+        Args:
+            session_factory: Called on each worker thread with the worker's
+                logger and the shared ``PatientManager``. Must return logged
+                in ``RevSession`` and ``VspSession`` objects and a callable
+                that tears the worker's browser down.
+            logger: Base logger; each worker logs with a ``worker-N`` prefix
+            workers: Number of concurrent browser workers
+            progress_file: Progress file used to resume interrupted runs
+            retry_failed: Retry invoices that failed in a previous run
+        """
+        super().__init__(None, None, logger, progress_file, retry_failed)
+        self.session_factory = session_factory
+        self.workers = max(1, workers)
+        self.patient_manager = PatientManager()
+        self.queue: "Queue" = Queue()
+
+    def _worker(self, number: int) -> None:
+        logger = self.logger.with_prefix(f"worker-{number}")
+        close = None
+        stage, error = "worker", None
+        try:
+            stage = "login"
+            rev, vsp, close = self.session_factory(logger, self.patient_manager)
+            stage = "worker"
+            logger.log("Worker ready")
+            while True:
+                try:
+                    invoice_id = self.queue.get_nowait()
+                except Empty:
+                    break
+                self._process(rev, vsp, invoice_id, logger)
+        except Exception as e:
+            error = str(e)
+            logger.log_error(f"Worker stopped: {error}")
+        finally:
+            if close:
+                close()
+            with self._lock:
+                self._active -= 1
+                last = self._active == 0
+            if last:
+                self._fail_remaining(stage, error or "No worker left to process the invoice", logger)
+
+    def _fail_remaining(self, stage: str, error: str, logger: Logger) -> None:
+        """Record every invoice still queued as failed, so none is silently lost."""
+        while True:
+            try:
+                invoice_id = self.queue.get_nowait()
+            except Empty:
+                return
+            self._record(invoice_id, StageTimer(), "failed", stage, error, 0.0, logger)
+
+    def run(self, source: Union[str, Path, Iterable[Any]]) -> Dict[str, Any]:
+        """Shard ``source`` across the workers and return the throughput summary."""
+        for invoice_id in self._pending(source):
+            self.queue.put(invoice_id)
+        start = time.perf_counter()
+        threads = [
+            Thread(target=self._worker, args=(n,), name=f"worker-{n}", daemon=True)
+            for n in range(1, self.workers + 1)
+        ]
+        self._active = len(threads)
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        self.elapsed = time.perf_counter() - start
+        summary = self.summary()
+        summary["workers"] = self.workers
+        self.logger.log(f"[pool] Summary: {json.dumps(summary)}")
+        return summary
+
+
+def build_summary(results: Dict[str, int], elapsed: float, timer: StageTimer) -> Dict[str, Any]:
+    """Assemble the throughput summary shared by all runner modes."""
+    processed = results["submitted"] + results["failed"]
+    return {
+        **results,
+        "elapsed_seconds": round(elapsed, 1),
+        "invoices_per_hour": round(processed / elapsed * 3600, 1) if elapsed > 0 else 0.0,
+        "stages": {
+            name: {key: round(value, 2) for key, value in stats.items()}
+            for name, stats in timer.summary().items()
+        },
+    }
+
+
+def print_summary(summary: Dict[str, Any]) -> None:
+    """Print a batch summary in a human readable form."""
+    print("\n📊 Batch Summary")
+    print("----------------")
+    print(f"Submitted: {summary['submitted']}  Failed: {summary['failed']}  Skipped: {summary['skipped']}")
+    print(f"Elapsed: {summary['elapsed_seconds']}s  Throughput: {summary['invoices_per_hour']} invoices/hour")
+    for name, stats in summary["stages"].items():
+        print(f"  {name:<15} n={stats['count']:<4} p50={stats['p50']:.2f}s p95={stats['p95']:.2f}s")
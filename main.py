@@ -1,189 +1,132 @@
-from core.base import PatientManager
 from dotenv import load_dotenv
-from playwright.sync_api import sync_playwright
 from core.logger import Logger
-from time import sleep
+from core.browser import launch_context
+from core.network_profile import NetworkProfile
 from config.vsp_map.vsp_session import VspSession
 from config.rev_map.rev_session import RevSession
-from core.utils import get_claim_service_flags
+from core.workflow import BatchRunner, PipelineRunner, WorkerPool, print_summary
+import argparse
 
 
 
-def launch_browser():
-    p = sync_playwright().start()
-    browser = p.chromium.launch(headless=False)
-    context = browser.new_context(viewport={"width": 1920, "height": 1080})
+def launch_browser(network_profile=None):
+    handle = launch_context(headless=False, network_profile=network_profile)
+    context = handle.context
     logger = Logger()
     rev = RevSession(context.new_page(), logger, context)
     vsp = VspSession(context.new_page(), logger)
     #return p, browser, rev
-    return p, browser, rev, vsp
-
-
+    return handle.playwright, handle.browser, rev, vsp
+
+
+def rev_lane_factory(logger, network_profiles):
+    """Build the Rev session for the pipeline's Rev lane on its own browser.
+
+    The lane's network profile is added to ``network_profiles`` for the run summary.
+    """
+    def factory():
+        profile = NetworkProfile.for_portals("rev")
+        network_profiles.append(("rev-lane", profile))
+        handle = launch_context(headless=False, network_profile=profile)
+        rev = RevSession(handle.context.new_page(), logger, handle.context)
+        rev.login()
+        return rev, handle.close
+    return factory
+
+
+def worker_session_factory(location, network_profiles):
+    """Build a Rev/VSP session pair on a worker's own browser context.
+
+    Each worker's network profile is added to ``network_profiles`` for the run summary.
+    """
+    def factory(logger, patient_manager):
+        profile = NetworkProfile.for_portals("rev", "vsp")
+        network_profiles.append((logger.prefix or "worker", profile))
+        handle = launch_context(headless=False, network_profile=profile)
+        context = handle.context
+        rev = RevSession(context.new_page(), logger, context, patient_manager=patient_manager)
+        vsp = VspSession(context.new_page(), logger)
+        rev.login()
+        vsp.login(location)
+        return rev, vsp, handle.close
+    return factory
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(description="Submit VSP claims for Rev vision invoices")
+    parser.add_argument(
+        "--invoices",
+        help="File with one invoice ID per line. Defaults to every invoice returned by a 'vision' payor search.",
+    )
+    parser.add_argument("--progress-file", help="Progress file used to resume an interrupted run")
+    parser.add_argument("--retry-failed", action="store_true", help="Retry invoices that failed in a previous run")
+    parser.add_argument("--location", default="ama", help="VSP location to log in to ('ama' or 'bgr')")
+    parser.add_argument(
+        "--pipeline",
+        action="store_true",
+        help="Scrape the next invoice in Rev while VSP submits the current one",
+    )
+    parser.add_argument("--queue-size", type=int, default=2, help="Scraped patients buffered for the VSP lane")
+    parser.add_argument(
+        "--workers",
+        type=int,
+        default=1,
+        help="Number of parallel browser workers, each with its own Rev and VSP session",
+    )
+    return parser.parse_args()
 
 
 if __name__ == "__main__":
     load_dotenv("/home/jake/Code/.env")
+    args = parse_args()
 
-    p, browser, rev, vsp = launch_browser()
+    network_profile = NetworkProfile.for_portals("rev", "vsp")
+    network_profiles = [("main", network_profile)]
+    p, browser, rev, vsp = launch_browser(network_profile)
     #p, browser, rev = launch_browser()
-    
+
     rev.login()
 
-    vsp.login("ama")
-   
-
-    #navigate to patient page
-    rev.invoice_page.navigate_to_invoices_page()
-    rev.invoice_page.search_invoice(payor="vision")
-    sleep(2)
-    rev.invoice_page.open_invoice("287147650")
-    patient = rev.invoice_page.create_patient_from_invoice()
-    rev.invoice_page.scrape_invoice_details(patient)
-    rev.invoice_page.click_patient_name_link()
-    rev.patient_page.scrape_demographics(patient)
-    rev.patient_page.scrape_family_demographics(patient)
-    rev.patient_page.expand_insurance()
-    rev.insurance_tab.select_insurance("VSP")
-    rev.insurance_tab.scrape_insurance(patient)
-    rev.patient_page.click_patient_summary_menu()
-    if patient.has_optical_order:
-        rev.patient_page.expand_optical_orders()
-        sleep(2)
-        rev.patient_page.open_optical_order(patient)
-        rev.optical_order.scrape_frame_data(patient)
-        rev.optical_order.scrape_lens_data(patient)
-        rev.optical_order.scrape_optical_copay(patient)
-        rev.products.navigate_to_products()
-        rev.products.get_wholesale_price(patient)
-    patient.print_data()
-
-    # Determine claim flags based on invoice items
-    flags = get_claim_service_flags(patient)
-
-    member_found = vsp.member_search_page.search_member(patient)
-    if not member_found:
-        print("Member not found, skipping authorization")
-        raise Exception("Member not found, skipping authorization")
-    sleep(2)
-    write_off_materials = False
-
-    vsp.authorization_page.select_patient(patient)
-    sleep(1)
-    
-    auth_status = vsp.authorization_page.select_services_for_patient(patient)
-    sleep(.5)
-    print(f'auth_status: {auth_status}')
-    if auth_status == "unavailable" or auth_status == "exam_authorized":
-    
-        vsp.authorization_page.get_plan_name(patient)
-        #check the plan name from the insurance data
-        sleep(.5)
-        if patient.insurance_data['plan_name'] == "VSP Exam Plus Plan":
-            #set the patient copay to 0
-            patient.insurance_data['copay'] = "0.00"
-            patient.print_data()
-            print("Plan is VSP Exam Plus Plan, submitting just exam")
-            vsp.authorization_page.get_exam_service() #THIS STILL NEEDS TO CHECK IF THE EXAM IS AVAILABLE FOR AUTHORIZATION
-            if auth_status == "unavailable":               
-                vsp.authorization_page.issue_authorization(patient)
-                vsp.authorization_page.get_confirmation_number()
-                vsp.authorization_page.navigate_to_claim()
-            else:
-                print("Exam is authorized, skipping authorization")
-                vsp.authorization_page.navigate_to_authorizations()
-                vsp.authorization_page.select_authorization(patient)
-                
-                
-            #unflag frame lens and contacts
-            flags["frame"] = False
-            flags["lens"] = False
-            flags["contacts"] = False
-            write_off_materials = True
-            
-            
-        else:
-            print("Plan name is not familiar, skipping authorization")
-            raise Exception("Plan name is not familiar, skipping authorization")
-        
-  
-
-
-    elif auth_status == "use_existing":
-        sleep(.5)
-        print("Services already authorized for patient")
-        vsp.authorization_page.navigate_to_authorizations()
-        sleep(.5)
-        vsp.authorization_page.select_authorization(patient)
-    elif auth_status == "delete_existing":
-        print("Services already authorized for patient")
-        vsp.authorization_page.navigate_to_authorizations()
-        sleep(.5)
-        vsp.authorization_page.delete_authorization(patient)
-        sleep(.5)
-        vsp.authorization_page.select_patient(patient)
-        sleep(.5)
-        vsp.authorization_page.select_services_for_patient(patient)
-        sleep(.5)
-        vsp.authorization_page.issue_authorization(patient)
-        sleep(.5)
-        vsp.authorization_page.get_confirmation_number()
-        sleep(.5)
-        vsp.authorization_page.navigate_to_claim()
-    elif auth_status == "issue":
-        print("Services not yet authorized for patient")
-        vsp.authorization_page.select_services_for_patient(patient)
-        vsp.authorization_page.issue_authorization(patient)
-        sleep(.5)
-        vsp.authorization_page.get_confirmation_number()
-        sleep(.5)
-        vsp.authorization_page.navigate_to_claim()
-
-
-    sleep(2)
-    vsp.claim_page.set_dos(patient)
-    vsp.claim_page.set_doctor(patient)
-
-    # Exam submission
-    if flags["exam"]:
-        vsp.claim_page.submit_exam(patient)
-
-    # Glasses related processing
-
-       
-    if flags["lens"]:
-        vsp.claim_page.submit_frame(patient)
-        vsp.claim_page.submit_lens(patient)
-        vsp.claim_page.send_rx(patient)
-
-
-    # Contact lens materials or services
-    if flags["contacts"]:
-        vsp.claim_page.submit_cl(patient)
-    sleep(.5)
-    vsp.claim_page.disease_reporting(patient) 
-    sleep(.5)
-    vsp.claim_page.calculate(patient)
-    sleep(.5)
-    vsp.claim_page.fill_pricing(patient)
-    sleep(.5)
-    vsp.claim_page.set_gender(patient)
-    sleep(.5)
-    vsp.claim_page.fill_address(patient)
-    sleep(.5)
-    success = vsp.claim_page.click_submit_claim()
-    if not success:
-        pass
-    print("returning  to  patient  page")
+    # In --workers mode every worker logs in to VSP itself
+    if args.workers <= 1:
+        vsp.login(args.location)
+
+    if args.invoices:
+        queue = args.invoices
+    else:
+        rev.invoice_page.navigate_to_invoices_page()
+        rev.invoice_page.search_invoice(payor="vision")
+        rev.invoice_page.settle(2, selector='.ag-center-cols-container [col-id="id"]', network_idle=True)
+        queue = rev.invoice_page.scrape_all_search_results()
+
+    if args.workers > 1:
+        runner = WorkerPool(
+            worker_session_factory(args.location, network_profiles),
+            rev.logger,
+            workers=args.workers,
+            progress_file=args.progress_file,
+            retry_failed=args.retry_failed,
+        )
+    elif args.pipeline:
+        runner = PipelineRunner(
+            vsp,
+            rev_lane_factory(rev.logger, network_profiles),
+            progress_file=args.progress_file,
+            retry_failed=args.retry_failed,
+            queue_size=args.queue_size,
+        )
+    else:
+        runner = BatchRunner(
+            rev,
+            vsp,
+            progress_file=args.progress_file,
+            retry_failed=args.retry_failed,
+        )
+    summary = runner.run(queue)
+    print_summary(summary)
+    for label, profile in network_profiles:
+        rev.logger.log(f"[{label}] {profile.summary_line()}")
+    if len(network_profiles) > 1:
+        total = NetworkProfile.merged(profile for _, profile in network_profiles)
+        rev.logger.log(f"[total] {total.summary_line()}")
     print('done')
-
-    
-
-
-    
-
-
-
-    
-    
-    